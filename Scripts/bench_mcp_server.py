@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Load test for the MCP server
+
+Starts mcp_server in-process with stubbed action backends (so no email or
+browser is involved), drives /send_email and /linkedin from keep-alive client
+threads at several concurrency levels, and reports p50/p95/p99 latency and
+throughput per level.
+
+    python bench_mcp_server.py --production --concurrency 1 8 32 64
+    python bench_mcp_server.py --url http://127.0.0.1:3333   # an already-running server
+"""
+import argparse
+import http.client
+import json
+import logging
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+import mcp_server
+
+REQUESTS = [
+    ("/send_email", {"to": "client@example.com", "subject": "Benchmark", "body": "Load test"}),
+    ("/linkedin", {"text": "Benchmark post"}),
+]
+
+
+def stub_actions(delay):
+    """Replace the real action handlers with ones that just sleep"""
+    def make_stub(name):
+        def stub(params):
+            time.sleep(delay)
+            return {"status": "stubbed", "action": name}
+        return stub
+
+    for name in list(mcp_server.ACTIONS):
+        mcp_server.ACTIONS[name] = make_stub(name)
+
+
+def start_local_server(production, threads):
+    """Run mcp_server on a free port in a background thread; returns its base URL"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    # Queue-depth warnings and per-request access logs would swamp the report
+    logging.getLogger("waitress.queue").setLevel(logging.ERROR)
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+    # Keep benchmark jobs out of the real Jobs/ folder
+    mcp_server.jobs.jobs_dir = Path(tempfile.mkdtemp(prefix="mcp_bench_jobs_"))
+    mcp_server.jobs.start()
+
+    server = mcp_server.create_server("127.0.0.1", port, production=production, threads=threads)
+    target = server.run if production else server.serve_forever
+    threading.Thread(target=target, daemon=True).start()
+    return f"http://127.0.0.1:{port}"
+
+
+def client_worker(base_url, deadline, latencies, errors, offset):
+    url = urlparse(base_url)
+    conn = http.client.HTTPConnection(url.hostname, url.port, timeout=30)
+    headers = {"Content-Type": "application/json"}
+    i = offset
+    while time.perf_counter() < deadline:
+        path, body = REQUESTS[i % len(REQUESTS)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            conn.request("POST", path, body=json.dumps(body), headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            conn.close()
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_level(base_url, concurrency, duration):
+    latencies = []
+    errors = []
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=client_worker, args=(base_url, deadline, latencies, errors, n))
+        for n in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the MCP server")
+    parser.add_argument("--url", help="Benchmark an already-running server instead of starting one")
+    parser.add_argument("--production", action="store_true", help="Use the waitress server")
+    parser.add_argument("--threads", type=int, default=8, help="Server request threads (production)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per concurrency level")
+    parser.add_argument("--action-delay", type=float, default=0.5, help="Seconds each stubbed action takes")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        stub_actions(args.action_delay)
+        base_url = start_local_server(args.production, args.threads)
+
+    results = [run_level(base_url, level, args.duration) for level in args.concurrency]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    mode = "external" if args.url else ("waitress" if args.production else "dev server")
+    print(f"MCP server load test ({mode}, {args.duration:g}s per level)")
+    print(f"{'conc':>5} {'reqs':>8} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for r in results:
+        print(f"{r['concurrency']:>5} {r['requests']:>8} {r['errors']:>7} {r['throughput']:>9.1f} "
+              f"{r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent fan-out with AsyncOdooClient
+
+Runs the weekly-audit style lookups (partner details, account balances and
+open invoices) against the in-process FakeOdooServer. The simulated
+per-request latency stands in for the network and Odoo itself. The first
+row awaits calls one after another, like today's blocking client; the others
+fan out under different concurrency limits.
+
+    python Scripts/bench_odoo_async.py --partners 100 --accounts 20 --latency 20
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from Skills.odoo_async import AsyncOdooClient
+from Skills.odoo_fake_server import FakeOdooServer
+
+
+async def lookups(client, partner_ids, account_ids):
+    return [
+        *(client.get_partner_info(pid) for pid in partner_ids),
+        *(client.get_account_balance(aid) for aid in account_ids),
+        client.search_read('account.move', [('state', '=', 'posted')], ['name', 'amount_total']),
+    ]
+
+
+async def run_sequential(server, partner_ids, account_ids):
+    async with AsyncOdooClient(server.url, server.db, server.username, server.password, max_concurrency=1) as client:
+        started = time.perf_counter()
+        for coro in await lookups(client, partner_ids, account_ids):
+            await coro
+        return time.perf_counter() - started
+
+
+async def run_concurrent(server, partner_ids, account_ids, concurrency):
+    async with AsyncOdooClient(server.url, server.db, server.username, server.password,
+                               max_concurrency=concurrency) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*await lookups(client, partner_ids, account_ids))
+        return time.perf_counter() - started
+
+
+async def main_async(args):
+    server = FakeOdooServer(latency=args.latency / 1000)
+    partner_ids = server.seed('res.partner', [
+        {'name': f'Client {i}', 'email': f'client{i}@example.com'} for i in range(args.partners)
+    ])
+    account_ids = server.seed('account.account', [
+        {'name': f'Account {i}', 'current_balance': 1000.0 + i} for i in range(args.accounts)
+    ])
+    server.seed('account.move', [
+        {'name': f'INV/{i:04d}', 'state': 'posted', 'amount_total': 100.0 * i} for i in range(50)
+    ])
+
+    calls = len(partner_ids) + len(account_ids) + 1
+    async with server:
+        print(f"{calls} lookups, {args.latency:g} ms simulated latency per request")
+        print(f"{'mode':<26} {'seconds':>8} {'speedup':>8} {'peak in flight':>15}")
+
+        server.max_in_flight = 0
+        baseline = await run_sequential(server, partner_ids, account_ids)
+        print(f"{'sequential':<26} {baseline:>8.3f} {1.0:>8.1f} {server.max_in_flight:>15}")
+
+        for concurrency in args.concurrency:
+            server.max_in_flight = 0
+            elapsed = await run_concurrent(server, partner_ids, account_ids, concurrency)
+            print(f"{f'gather, limit {concurrency}':<26} {elapsed:>8.3f} {baseline / elapsed:>8.1f} "
+                  f"{server.max_in_flight:>15}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AsyncOdooClient fan-out")
+    parser.add_argument("--partners", type=int, default=100)
+    parser.add_argument("--accounts", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=20.0, help="Simulated milliseconds per request")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[4, 8, 16])
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: pooled keep-alive XML-RPC transport vs the stock transport
+
+Starts a local stub of Odoo's /xmlrpc/2/common and /xmlrpc/2/object endpoints
+and times execute_kw calls. The stock ServerProxy is not thread-safe, so
+today a worker thread needs a proxy (and a new connection) per call; the
+pooled transport shares one proxy across threads.
+
+    python Scripts/bench_odoo_transport.py --calls 2000 --threads 8 --connect-delay 5
+
+--connect-delay adds a pause to every new server-side connection to stand in
+for the TCP/TLS handshake cost of a real network hop.
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+import xmlrpc.client
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from xmlrpc.server import MultiPathXMLRPCServer, SimpleXMLRPCDispatcher, SimpleXMLRPCRequestHandler
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from Skills.odoo_transport import PooledTransport, make_server_proxy
+
+
+class StubRequestHandler(SimpleXMLRPCRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like Odoo's threaded Werkzeug server
+    rpc_paths = ("/xmlrpc/2/common", "/xmlrpc/2/object")
+    connect_delay = 0.0
+
+    def setup(self):
+        super().setup()
+        if self.connect_delay:
+            time.sleep(self.connect_delay)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubOdooServer(ThreadingMixIn, MultiPathXMLRPCServer):
+    daemon_threads = True
+
+
+def start_stub_server(connect_delay):
+    StubRequestHandler.connect_delay = connect_delay
+    server = StubOdooServer(("127.0.0.1", 0), requestHandler=StubRequestHandler, logRequests=False)
+
+    common = SimpleXMLRPCDispatcher(allow_none=True)
+    common.register_function(lambda db, login, password, ctx: 2, "authenticate")
+    obj = SimpleXMLRPCDispatcher(allow_none=True)
+    obj.register_function(
+        lambda db, uid, pwd, model, method, args, kwargs=None:
+            [{"id": 7, "name": "Client A", "current_balance": 1250.0}],
+        "execute_kw")
+    server.add_dispatcher("/xmlrpc/2/common", common)
+    server.add_dispatcher("/xmlrpc/2/object", obj)
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def call(proxy):
+    return proxy.execute_kw("db", 2, "pwd", "res.partner", "read", [[7]], {"fields": ["name"]})
+
+
+def run(label, calls, threads, make_proxy_for_call):
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(n):
+        local = []
+        for _ in range(n):
+            proxy = make_proxy_for_call()
+            start = time.perf_counter()
+            call(proxy)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    per_thread = calls // threads
+    workers = [threading.Thread(target=worker, args=(per_thread,)) for _ in range(threads)]
+    started = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+    print(f"{label:<42} {threads:>3} {len(latencies) / elapsed:>9.0f} "
+          f"{statistics.fmean(latencies) * 1000:>8.3f} {p95 * 1000:>8.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pooled Odoo XML-RPC transport")
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--connect-delay", type=float, default=0.0, help="Milliseconds added per new connection")
+    args = parser.parse_args()
+
+    base = start_stub_server(args.connect_delay / 1000)
+    object_url = f"{base}/xmlrpc/2/object"
+
+    print(f"{'transport':<42} {'thr':>3} {'calls/s':>9} {'mean ms':>8} {'p95 ms':>8}")
+
+    # Today, single thread: OdooIntegration keeps one stock ServerProxy
+    shared_stock = xmlrpc.client.ServerProxy(object_url)
+    run("stock ServerProxy, shared (1 thread)", args.calls, 1, lambda: shared_stock)
+
+    # Today, from worker threads: a stock proxy per call is the only thread-safe option
+    run("stock ServerProxy per call", args.calls, args.threads, lambda: xmlrpc.client.ServerProxy(object_url))
+
+    pooled = make_server_proxy(object_url, transport=PooledTransport(pool_size=args.threads))
+    run("PooledTransport, shared (1 thread)", args.calls, 1, lambda: pooled)
+    run("PooledTransport, shared", args.calls, args.threads, lambda: pooled)
+
+
+if __name__ == "__main__":
+    main()
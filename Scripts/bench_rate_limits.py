@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark: rate-limit-aware scheduling vs retrying after 429s
+
+Starts a local mock of POST /2/tweets that enforces a fixed-window quota and
+reports it in x-rate-limit-* headers, like Twitter/X. Worker threads post
+for a fixed time. "retry on failure" is today's behaviour: fire, and back off
+exponentially when a call fails. "scheduler" paces the same workers with
+RateLimitScheduler, which learns the quota from the headers.
+
+    python Scripts/bench_rate_limits.py --limit 20 --window 4 --duration 16 --threads 4
+"""
+import argparse
+import json
+import math
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from Skills.http_session import build_session
+from Skills.rate_limiter import RateLimitScheduler, RateLimited
+from Skills.social_media_integration import TwitterIntegration
+
+
+class QuotaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    limit = 20
+    window = 4.0
+    lock = threading.Lock()
+    window_start = 0.0
+    used = 0
+    accepted = 0
+    rejected = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        cls = type(self)
+        with cls.lock:
+            now = time.time()
+            if now >= cls.window_start + cls.window:
+                cls.window_start = now - (now % cls.window)
+                cls.used = 0
+            allowed = cls.used < cls.limit
+            if allowed:
+                cls.used += 1
+                cls.accepted += 1
+            else:
+                cls.rejected += 1
+            remaining = cls.limit - cls.used
+            reset = math.ceil(cls.window_start + cls.window)
+
+        body = json.dumps({"data": {"id": "1"}} if allowed else {"title": "Too Many Requests"}).encode()
+        self.send_response(201 if allowed else 429)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("x-rate-limit-limit", str(cls.limit))
+        self.send_header("x-rate-limit-remaining", str(remaining))
+        self.send_header("x-rate-limit-reset", str(reset))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class QuietTwitterIntegration(TwitterIntegration):
+    # Keep the benchmark from appending to Logs/
+    def log_twitter_action(self, *args, **kwargs):
+        pass
+
+
+def start_mock_server(limit, window):
+    QuotaHandler.limit = limit
+    QuotaHandler.window = window
+    server = ThreadingHTTPServer(("127.0.0.1", 0), QuotaHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/2"
+
+
+def run(label, twitter, duration, threads, backoff):
+    QuotaHandler.accepted = QuotaHandler.rejected = 0
+    deadline = time.monotonic() + duration
+
+    def worker():
+        attempt = 0
+        while time.monotonic() < deadline:
+            try:
+                twitter.post_tweet("Benchmark tweet")
+                attempt = 0
+            except RateLimited as e:
+                time.sleep(min(e.retry_after, max(deadline - time.monotonic(), 0)))
+            except Exception:
+                if backoff:
+                    time.sleep(min(backoff * 2 ** attempt, 2.0))
+                    attempt = min(attempt + 1, 5)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    sent = QuotaHandler.accepted + QuotaHandler.rejected
+    print(f"{label:<20} {QuotaHandler.accepted:>7} {QuotaHandler.rejected:>6} "
+          f"{QuotaHandler.accepted / sent if sent else 0:>9.1%} {QuotaHandler.accepted / duration:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RateLimitScheduler against a fixed-window quota")
+    parser.add_argument("--limit", type=int, default=20, help="Requests allowed per window")
+    parser.add_argument("--window", type=float, default=4.0, help="Window length in seconds")
+    parser.add_argument("--duration", type=float, default=16.0)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--backoff", type=float, default=1.0,
+                        help="First retry delay in seconds for the baseline (ErrorRecovery.with_retry uses 1)")
+    args = parser.parse_args()
+
+    base_url = start_mock_server(args.limit, args.window)
+    session = build_session(pool_maxsize=args.threads, retries=0)
+    quota = args.limit / args.window
+    print(f"quota {args.limit} per {args.window:g}s ({quota:.2f}/s), {args.threads} threads, {args.duration:g}s")
+    print(f"{'client':<20} {'posted':>7} {'429s':>6} {'success':>9} {'posts/s':>8}")
+
+    unlimited = QuietTwitterIntegration(bearer_token="token", session=session, base_url=base_url,
+                                        rate_limiter=RateLimitScheduler(enabled=False))
+    run("retry on failure", unlimited, args.duration, args.threads, args.backoff)
+
+    # Fresh window for the second run, so both start from a full quota
+    time.sleep(args.window - time.time() % args.window)
+    scheduled = QuietTwitterIntegration(bearer_token="token", session=session, base_url=base_url,
+                                        rate_limiter=RateLimitScheduler(max_wait=args.window * 2))
+    run("scheduler", scheduled, args.duration, args.threads, args.backoff)
+    print(scheduled.rate_limiter.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark: shared pooled HTTP session vs a new connection per call
+
+Starts a local mock of the Graph API and Twitter v2 endpoints and times
+post_to_facebook, post_tweet and get_tweets. "requests per call" is how the
+clients used to send (module-level requests.post/get, a new connection each
+time); "shared session" goes through Skills.http_session.
+
+    python Scripts/bench_social_http.py --calls 600 --threads 4 --connect-delay 20
+
+--connect-delay adds a pause to every new server-side connection to stand in
+for the TCP/TLS handshake cost of reaching graph.facebook.com or api.twitter.com.
+"""
+import argparse
+import itertools
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from Skills.http_session import build_session
+from Skills.rate_limiter import RateLimitScheduler
+from Skills.social_media_integration import SocialMediaIntegration, TwitterIntegration
+
+
+class MockAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+    connect_delay = 0.0
+    ids = itertools.count(1)
+
+    def setup(self):
+        super().setup()
+        if self.connect_delay:
+            time.sleep(self.connect_delay)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path.startswith("/2/tweets"):
+            self._reply(201, {"data": {"id": str(next(self.ids))}})
+        else:
+            self._reply(200, {"id": str(next(self.ids))})
+
+    def do_GET(self):
+        self._reply(200, {"data": [{"id": "1", "text": "hello"}], "meta": {"result_count": 1}})
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class QuietSocialMediaIntegration(SocialMediaIntegration):
+    # Keep the benchmark from appending to Logs/
+    def log_social_action(self, *args, **kwargs):
+        pass
+
+
+class QuietTwitterIntegration(TwitterIntegration):
+    def log_twitter_action(self, *args, **kwargs):
+        pass
+
+
+def start_mock_server(connect_delay):
+    MockAPIHandler.connect_delay = connect_delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockAPIHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def run(label, calls, threads, operations):
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(n):
+        local = []
+        for i in range(n):
+            start = time.perf_counter()
+            operations[i % len(operations)]()
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    per_thread = calls // threads
+    workers = [threading.Thread(target=worker, args=(per_thread,)) for _ in range(threads)]
+    started = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+    print(f"{label:<24} {threads:>3} {len(latencies) / elapsed:>9.0f} "
+          f"{statistics.fmean(latencies) * 1000:>8.3f} {p95 * 1000:>8.3f}")
+
+
+def operations_for(base, session):
+    # The mock has no quota, so pacing would only measure the default limits
+    unlimited = RateLimitScheduler(enabled=False)
+    social = QuietSocialMediaIntegration(session=session, graph_url=f"{base}/v18.0", rate_limiter=unlimited)
+    social.set_facebook_credentials("token")
+    twitter = QuietTwitterIntegration(bearer_token="token", session=session, base_url=f"{base}/2",
+                                      rate_limiter=unlimited)
+    return [
+        lambda: social.post_to_facebook("Benchmark post"),
+        lambda: twitter.post_tweet("Benchmark tweet"),
+        lambda: twitter.get_tweets("42"),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the shared social media HTTP session")
+    parser.add_argument("--calls", type=int, default=600)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--connect-delay", type=float, default=0.0, help="Milliseconds added per new connection")
+    args = parser.parse_args()
+
+    base = start_mock_server(args.connect_delay / 1000)
+    print(f"{'client':<24} {'thr':>3} {'calls/s':>9} {'mean ms':>8} {'p95 ms':>8}")
+
+    # The requests module has the same post/get signatures as a Session
+    run("requests per call", args.calls, args.threads, operations_for(base, requests))
+
+    session = build_session(pool_maxsize=args.threads)
+    run("shared session", args.calls, args.threads, operations_for(base, session))
+    session.close()
+
+
+if __name__ == "__main__":
+    main()
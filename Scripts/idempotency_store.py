@@ -0,0 +1,130 @@
+"""
+Idempotency Store for the MCP server
+Remembers the response sent for each Idempotency-Key so retried requests are
+answered from the store instead of running the action again.
+
+Completed entries are kept in memory in completion order (TTL and size
+bounded) and appended to a JSON-lines file, which is replayed and compacted
+on startup so the store survives restarts.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+# begin() outcomes
+NEW = "new"
+REPLAY = "replay"
+IN_PROGRESS = "in_progress"
+MISMATCH = "mismatch"
+
+
+def request_fingerprint(action, payload):
+    """Stable hash of an action and its JSON payload"""
+    canonical = json.dumps({"action": action, "payload": payload}, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class IdempotencyStore:
+    def __init__(self, path="Data/idempotency_keys.jsonl", ttl_seconds=24 * 3600, max_entries=10000):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()   # key -> {"fingerprint", "status", "body", "stored_at"}
+        self._in_progress = {}          # key -> fingerprint, never persisted
+        self._log_lines = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def begin(self, key, fingerprint):
+        """
+        Claim a key before running the action.
+
+        Returns (outcome, entry): NEW means the caller should run the action
+        and then call complete() or abandon(); REPLAY carries the stored entry.
+        """
+        with self._lock:
+            self._evict(time.time())
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry["fingerprint"] != fingerprint:
+                    return MISMATCH, None
+                return REPLAY, entry
+
+            if key in self._in_progress:
+                if self._in_progress[key] != fingerprint:
+                    return MISMATCH, None
+                return IN_PROGRESS, None
+
+            self._in_progress[key] = fingerprint
+            return NEW, None
+
+    def complete(self, key, body, status):
+        """Store the response for a key claimed with begin()"""
+        with self._lock:
+            fingerprint = self._in_progress.pop(key, None)
+            if fingerprint is None:
+                return
+            entry = {"fingerprint": fingerprint, "status": status, "body": body, "stored_at": time.time()}
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict(entry["stored_at"])
+            self._append({"key": key, **entry})
+
+    def abandon(self, key):
+        """Release a claimed key without storing anything, so it can be retried"""
+        with self._lock:
+            self._in_progress.pop(key, None)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _evict(self, now):
+        # Entries are in completion order, so expired ones are always at the front
+        cutoff = now - self.ttl_seconds
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry["stored_at"] >= cutoff and len(self._entries) <= self.max_entries:
+                break
+            self._entries.popitem(last=False)
+
+    def _append(self, record):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, default=str) + "\n")
+        self._log_lines += 1
+
+        # Evicted entries stay in the log until it is rewritten
+        if self._log_lines > 2 * self.max_entries:
+            self._compact()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    key = record.pop("key")
+                except (ValueError, KeyError):
+                    continue  # a torn final line from a crash
+                self._entries[key] = record
+                self._entries.move_to_end(key)
+
+        self._evict(time.time())
+        self._compact()
+
+    def _compact(self):
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for key, entry in self._entries.items():
+                f.write(json.dumps({"key": key, **entry}, default=str) + "\n")
+        os.replace(tmp_path, self.path)
+        self._log_lines = len(self._entries)
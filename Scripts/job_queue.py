@@ -0,0 +1,278 @@
+"""
+Durable Job Queue for the MCP server
+Accepted actions are written to Jobs/ before the request returns, run on
+background worker threads, and picked up again after a restart. Finished
+jobs are deleted once they are older than retention_seconds, checked at
+start() and then at most once per PRUNE_INTERVAL, so Jobs/ stays bounded.
+
+Each action has its own queue and worker threads, so a slow or
+one-at-a-time action (a browser post) never holds the workers another
+action needs. Handlers are looked up in `handlers` when a job runs.
+
+Callback URLs must be http(s). Unless their host is in callback_hosts, it must
+resolve to public addresses only, so a callback cannot be aimed at the server
+itself or at the private network. submit() refuses other URLs with ValueError.
+At delivery the host is resolved and checked again, and the POST goes to the
+address that was checked, so a DNS answer that changes in between is no help.
+"""
+import http.client
+import ipaddress
+import json
+import os
+import queue
+import re
+import socket
+import ssl
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+# Jobs in these states are re-run after a restart (delivery is at-least-once)
+PENDING_STATES = ("queued", "running")
+# Finished jobs are kept this long (seconds) for /jobs/<id>, then deleted
+DEFAULT_RETENTION = 7 * 24 * 3600
+# Seconds between prunes while running
+PRUNE_INTERVAL = 3600
+
+
+class JobQueue:
+    def __init__(self, handlers, jobs_dir="Jobs", workers=4, callback_timeout=10, callback_hosts=(),
+                 action_workers=None, retention_seconds=DEFAULT_RETENTION):
+        """
+        Args:
+            handlers: dict mapping action name to a callable taking the params dict
+            jobs_dir: folder holding one JSON file per job
+            workers: worker threads per action not listed in action_workers
+            callback_hosts: host names callbacks may reach even on private addresses
+            action_workers: dict mapping action name to its number of worker threads,
+                i.e. how many of its jobs may run at once
+            retention_seconds: how long a finished job's file is kept
+        """
+        self.handlers = handlers
+        self.jobs_dir = Path(jobs_dir)
+        self.workers = workers
+        self.action_workers = dict(action_workers or {})
+        self.callback_timeout = callback_timeout
+        self.callback_hosts = {host.lower() for host in callback_hosts}
+        self.retention_seconds = retention_seconds
+
+        self._queues = {action: queue.Queue() for action in handlers}
+        self._threads = []
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+
+    def start(self):
+        """Requeue unfinished jobs from disk and start the worker threads"""
+        with self._lock:
+            if self._threads:
+                return self
+            self.jobs_dir.mkdir(exist_ok=True)
+            self.prune()
+
+            pending = []
+            for job_file in self.jobs_dir.glob("*.json"):
+                try:
+                    job = json.loads(job_file.read_text())
+                except (OSError, ValueError):
+                    continue
+                if job.get("status") in PENDING_STATES:
+                    pending.append(job)
+
+            for job in sorted(pending, key=lambda j: j["created_at"]):
+                if job.get("action") not in self._queues:
+                    job.update(status="failed", error=f"Unknown action: {job.get('action')}",
+                               finished_at=datetime.now().isoformat())
+                    self._save(job)
+                    continue
+                job["status"] = "queued"
+                self._save(job)
+                self._queues[job["action"]].put(job["id"])
+
+            for action, jobs in self._queues.items():
+                for i in range(max(1, self.action_workers.get(action, self.workers))):
+                    thread = threading.Thread(target=self._worker, args=(jobs,),
+                                              name=f"mcp-job-{action}-{i}", daemon=True)
+                    thread.start()
+                    self._threads.append(thread)
+        return self
+
+    def submit(self, action, params, callback_url=None):
+        """Persist a new job and queue it; returns the job dict"""
+        if action not in self._queues:
+            raise ValueError(f"Unknown action: {action}")
+        if callback_url is not None:
+            error = self.check_callback_url(callback_url)
+            if error:
+                raise ValueError(error)
+
+        job = {
+            "id": uuid.uuid4().hex,
+            "action": action,
+            "params": params,
+            "callback_url": callback_url,
+            "status": "queued",
+            "result": None,
+            "error": None,
+            "created_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None
+        }
+        self._save(job)
+        self._queues[action].put(job["id"])
+        return job
+
+    def get(self, job_id):
+        """Return the stored job dict, or None if there is no such job"""
+        if not JOB_ID_PATTERN.match(job_id):
+            return None
+        job_file = self.jobs_dir / f"{job_id}.json"
+        try:
+            return json.loads(job_file.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _worker(self, jobs):
+        while True:
+            job_id = jobs.get()
+            job = self.get(job_id)
+            if job is None or job["status"] not in PENDING_STATES:
+                continue
+
+            job["status"] = "running"
+            job["started_at"] = datetime.now().isoformat()
+            self._save(job)
+
+            try:
+                job["result"] = self.handlers[job["action"]](job["params"])
+                job["status"] = "succeeded"
+            except Exception as e:
+                job["error"] = str(e)
+                job["status"] = "failed"
+
+            job["finished_at"] = datetime.now().isoformat()
+            self._save(job)
+
+            if job.get("callback_url"):
+                self._notify(job)
+            self._maybe_prune()
+
+    def prune(self, now=None):
+        """Delete finished jobs older than retention_seconds; returns how many were deleted"""
+        now = time.time() if now is None else now
+        self._last_prune = now
+        cutoff = now - self.retention_seconds
+        removed = 0
+        for job_file in self.jobs_dir.glob("*.json"):
+            try:
+                # A job file is last written when the job finishes
+                if job_file.stat().st_mtime >= cutoff:
+                    continue
+                job = json.loads(job_file.read_text())
+            except (OSError, ValueError):
+                continue
+            if job.get("status") not in PENDING_STATES:
+                job_file.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def _maybe_prune(self):
+        with self._lock:
+            if time.time() - self._last_prune < PRUNE_INTERVAL:
+                return
+            self._last_prune = time.time()
+        try:
+            self.prune()
+        except OSError as e:
+            print(f"⚠️ Pruning {self.jobs_dir} failed: {e}")
+
+    def check_callback_url(self, url):
+        """Return why a callback URL is not allowed, or None"""
+        try:
+            self._resolve_callback(url)
+        except ValueError as e:
+            return str(e)
+        return None
+
+    def _resolve_callback(self, url):
+        """(url parts, address to connect to) for an allowed callback URL; ValueError says why not"""
+        if not isinstance(url, str):
+            raise ValueError("callback_url must be a string")
+        try:
+            parts = urlsplit(url)
+            host = parts.hostname
+            port = parts.port
+        except ValueError:
+            raise ValueError("callback_url is not a valid URL")
+        if parts.scheme not in ("http", "https") or not host:
+            raise ValueError("callback_url must be an http(s) URL")
+
+        try:
+            addresses = [info[4][0] for info in socket.getaddrinfo(host, port or 443, proto=socket.IPPROTO_TCP)]
+        except (socket.gaierror, UnicodeError):
+            raise ValueError(f"callback_url host {host} does not resolve")
+        if host.lower() not in self.callback_hosts:
+            for address in addresses:
+                # Drop an IPv6 zone id ("fe80::1%eth0") before parsing
+                if not ipaddress.ip_address(address.split("%")[0]).is_global:
+                    raise ValueError(f"callback_url host {host} resolves to a non-public address")
+        return parts, addresses[0]
+
+    def _notify(self, job):
+        """POST the finished job to its callback URL; failures are only logged"""
+        try:
+            parts, address = self._resolve_callback(job["callback_url"])
+        except ValueError as e:
+            print(f"⚠️ Callback for job {job['id']} skipped: {e}")
+            return
+
+        connection_class = _PinnedHTTPSConnection if parts.scheme == "https" else _PinnedHTTPConnection
+        connection = connection_class(parts.hostname, parts.port, address, timeout=self.callback_timeout)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        try:
+            # Redirects are not followed, so an allowed host cannot bounce the POST elsewhere
+            connection.request("POST", path, body=json.dumps(job, default=str),
+                               headers={"Content-Type": "application/json"})
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                print(f"⚠️ Callback for job {job['id']} got HTTP {response.status}")
+        except (OSError, http.client.HTTPException) as e:
+            print(f"⚠️ Callback for job {job['id']} failed: {e}")
+        finally:
+            connection.close()
+
+    def _save(self, job):
+        # Write to a temp file and rename so /jobs/<id> never sees a half-written file
+        job_file = self.jobs_dir / f"{job['id']}.json"
+        tmp_file = job_file.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_file.write_text(json.dumps(job, indent=2, default=str))
+        os.replace(tmp_file, job_file)
+
+
+class _PinnedHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection for `host` that connects to an address resolved (and checked) beforehand"""
+
+    def __init__(self, host, port, address, **kwargs):
+        super().__init__(host, port, **kwargs)
+        self.address = address
+
+    def connect(self):
+        self.sock = socket.create_connection((self.address, self.port), self.timeout)
+
+
+class _PinnedHTTPSConnection(http.client.HTTPSConnection):
+    """HTTPSConnection to a pinned address; the certificate is still checked against `host`"""
+
+    def __init__(self, host, port, address, **kwargs):
+        super().__init__(host, port, **kwargs)
+        self.address = address
+        self.ssl_context = ssl.create_default_context()
+
+    def connect(self):
+        sock = socket.create_connection((self.address, self.port), self.timeout)
+        self.sock = self.ssl_context.wrap_socket(sock, server_hostname=self.host)
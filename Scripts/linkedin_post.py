@@ -1,25 +1,290 @@
+"""
+LinkedIn posting via Playwright
+
+A long-lived LinkedInBrowserService keeps one headless Chromium running with a
+saved storage-state session, holds a small pool of pages already sitting on the
+feed, and publishes queued posts from a single browser-owning thread.
+
+Run `python linkedin_post.py --login` once to log in manually and save the
+session; after that posts run unattended.
+"""
+import argparse
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
 from playwright.sync_api import sync_playwright # type: ignore
 
+LINKEDIN_URL = "https://www.linkedin.com"
+SESSION_STATE_FILE = Path("linkedin_state.json")
+COMPOSER_STUB_HTML = Path(__file__).parent / "linkedin_composer_stub.html"
+
+START_POST_BUTTON = "button:has-text('Start a post')"
+POST_TEXTBOX = "div[role='textbox']"
+POST_BUTTON = "button:text-is('Post')"
+
+# LinkedIn bounces expired sessions to one of these pages
+LOGGED_OUT_PATHS = ("/login", "/checkpoint", "/authwall", "/uas/login")
+
+
+class SessionExpiredError(Exception):
+    """The saved LinkedIn session is missing or no longer valid"""
+    pass
+
+
+class LinkedInBrowserService:
+    """Headless browser service that serves LinkedIn posts from a queue"""
+
+    def __init__(self, state_file=SESSION_STATE_FILE, base_url=LINKEDIN_URL,
+                 pool_size=2, headless=True, timeout_ms=30000):
+        self.state_file = Path(state_file)
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = max(1, pool_size)
+        self.headless = headless
+        self.timeout_ms = timeout_ms
+
+        self._requests = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+        # Only touched from the browser thread; Playwright's sync API is not thread-safe
+        self._browser = None
+        self._context = None
+        self._pages = deque()
+
+    @property
+    def feed_url(self):
+        return f"{self.base_url}/feed/"
+
+    def start(self):
+        """Start the browser thread if it is not already running"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="linkedin-browser", daemon=True)
+                self._thread.start()
+        return self
+
+    def submit(self, post_text):
+        """Queue a post and return a Future resolving to the result dict"""
+        self.start()
+        future = Future()
+        self._requests.put((post_text, future))
+        return future
+
+    def post(self, post_text, timeout=None):
+        """Queue a post and wait for it to be published"""
+        return self.submit(post_text).result(timeout=timeout)
+
+    def stop(self, timeout=None):
+        """Drain the queue, close the browser and stop the thread"""
+        with self._lock:
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._requests.put(None)
+            thread.join(timeout)
+
+    def _run(self):
+        try:
+            with sync_playwright() as p:
+                self._browser = p.chromium.launch(headless=self.headless)
+                try:
+                    self._serve_requests()
+                finally:
+                    self._close_context()
+                    self._browser.close()
+                    self._browser = None
+        except Exception as e:
+            # Don't leave callers waiting on a browser that will never come up
+            self._fail_pending(e)
+            raise
+
+    def _serve_requests(self):
+        while True:
+            item = self._requests.get()
+            if item is None:
+                break
+            post_text, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self._post_with_reconnect(post_text))
+            except Exception as e:
+                future.set_exception(e)
+
+    def _fail_pending(self, error):
+        while True:
+            try:
+                item = self._requests.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(error)
+
+    def _post_with_reconnect(self, post_text):
+        if self._context is None:
+            self._open_context()
+
+        try:
+            return self._publish(post_text)
+        except SessionExpiredError:
+            # The state file may have been refreshed by a manual --login since we loaded it
+            self._open_context()
+            return self._publish(post_text)
+
+    def _open_context(self):
+        self._close_context()
+        if not self.state_file.exists():
+            raise SessionExpiredError(
+                f"No saved LinkedIn session at {self.state_file}; run linkedin_post.py --login first")
+
+        self._context = self._browser.new_context(storage_state=str(self.state_file))
+        self._context.set_default_timeout(self.timeout_ms)
+        for _ in range(self.pool_size):
+            self._pages.append(self._warm_page(self._context.new_page()))
+
+    def _close_context(self):
+        self._pages.clear()
+        if self._context is not None:
+            try:
+                self._context.close()
+            except Exception:
+                pass
+            self._context = None
+
+    def _warm_page(self, page):
+        # Only wait for the navigation to commit so re-warming overlaps with the next post
+        page.goto(self.feed_url, wait_until="commit")
+        return page
+
+    def _take_page(self):
+        # A page that could not be replaced leaves the pool short; open one on demand
+        if not self._pages:
+            return self._warm_page(self._context.new_page())
+        return self._pages.popleft()
+
+    def _return_page(self, page):
+        """Re-warm a page and put it back in the pool; a page that fails is dropped"""
+        try:
+            self._pages.append(self._warm_page(page))
+        except Exception as e:
+            print(f"Error re-warming LinkedIn page: {e}")
+            try:
+                page.close()
+            except Exception:
+                pass
+
+    def _publish(self, post_text):
+        page = self._take_page()
+        try:
+            page.wait_for_load_state("domcontentloaded")
+            self._check_session(page)
+
+            page.click(START_POST_BUTTON)
+            page.fill(POST_TEXTBOX, post_text)
+            page.click(POST_BUTTON)
+            # The composer closes once LinkedIn has accepted the post
+            page.wait_for_selector(POST_TEXTBOX, state="detached")
+        except SessionExpiredError:
+            # The caller reopens the context, which refills the pool
+            page.close()
+            raise
+        except Exception:
+            page.close()
+            self._return_page(self._context.new_page())
+            raise
+
+        self._return_page(page)
+        print("✅ LinkedIn post published")
+        return {"status": "success", "message": "LinkedIn post published"}
+
+    def _check_session(self, page):
+        if any(path in page.url for path in LOGGED_OUT_PATHS):
+            raise SessionExpiredError(f"LinkedIn session expired (redirected to {page.url})")
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_linkedin_service(**kwargs):
+    """Return the process-wide LinkedInBrowserService, creating it on first use"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = LinkedInBrowserService(**kwargs).start()
+        return _service
+
+
 def post_to_linkedin(post_text="🚀 Building AI Employees that actually work."):
     """
-    Post to LinkedIn using Playwright
+    Post to LinkedIn using the shared headless browser service
+    """
+    return get_linkedin_service().post(post_text)
+
+
+def save_linkedin_session(state_file=SESSION_STATE_FILE, base_url=LINKEDIN_URL):
+    """
+    Open a headed browser for a manual login and save the session for headless use
     """
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
-        page.goto("https://www.linkedin.com/login")
+        context = browser.new_context()
+        page = context.new_page()
+        page.goto(f"{base_url.rstrip('/')}/login")
 
         input("🔐 Login manually, then press ENTER...")
 
-        page.goto("https://www.linkedin.com/feed/")
-        page.click("button:has-text('Start a post')")
-        page.fill("div[role='textbox']", post_text)
-        page.click("button:has-text('Post')")
-
-        print("✅ LinkedIn post published")
+        context.storage_state(path=str(state_file))
         browser.close()
-        return {"status": "success", "message": "LinkedIn post published"}
+        print(f"✅ LinkedIn session saved to {state_file}")
+        return str(state_file)
+
+
+class _ComposerStubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/feed") and not self.server.session_valid:
+            self.send_response(302)
+            self.send_header("Location", "/login")
+            self.end_headers()
+            return
+
+        body = COMPOSER_STUB_HTML.read_bytes() if self.path.startswith("/feed") else b"<h1>Sign in</h1>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_composer_stub(port=0):
+    """
+    Serve a local stand-in for the LinkedIn feed and post composer.
+
+    Returns the running server; point LinkedInBrowserService(base_url=...) at
+    f"http://127.0.0.1:{server.server_port}". Set server.session_valid = False
+    to make /feed/ redirect to /login like an expired session.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), _ComposerStubHandler)
+    server.session_valid = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
 
 # For backward compatibility, run the function if this file is executed directly
 if __name__ == "__main__":
-    post_to_linkedin()
+    parser = argparse.ArgumentParser(description="Post to LinkedIn")
+    parser.add_argument("text", nargs="?", default="🚀 Building AI Employees that actually work.")
+    parser.add_argument("--login", action="store_true", help="Log in manually and save the session")
+    args = parser.parse_args()
+
+    if args.login:
+        save_linkedin_session()
+    else:
+        post_to_linkedin(args.text)
+        get_linkedin_service().stop()
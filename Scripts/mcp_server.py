@@ -1,25 +1,261 @@
 """
 Silver Tier – MCP Server
 External actions handler (email, LinkedIn, etc.)
+
+Action routes only validate the request and queue a job; they answer 202 with
+a job id straight away and the action runs on a background worker. Poll
+/jobs/<id> or pass a callback_url to be notified when it finishes. Finished
+jobs are kept for MCP_JOB_RETENTION seconds (a week by default).
+
+Clients that retry should send an Idempotency-Key header: a repeated key
+with the same body gets the original response back (with an
+Idempotent-Replayed header) and the action is not queued again.
+
+/batch queues a list of actions in one request and returns one job id per
+item, in order. Each action type has ACTION_LIMITS worker threads of its
+own, so at most that many of its jobs run at once, whichever route queued
+them, and a busy action never holds up the others.
+
+callback_url must be a public http(s) URL; hosts listed in
+MCP_CALLBACK_ALLOWED_HOSTS (comma-separated) may also be private.
+
+Run `python mcp_server.py --production` to serve with waitress (threaded,
+HTTP/1.1 keep-alive, bounded request size) instead of the Flask dev server.
 """
+import argparse
+import os
 
 from flask import Flask, request, jsonify
+from idempotency_store import IdempotencyStore, request_fingerprint, REPLAY, IN_PROGRESS, MISMATCH
+from job_queue import JobQueue
 from linkedin_post import post_to_linkedin
 
+# Action payloads are small JSON bodies; anything bigger is rejected with 413
+MAX_CONTENT_LENGTH = int(os.environ.get("MCP_MAX_CONTENT_LENGTH", 1024 * 1024))
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+MAX_BATCH_SIZE = int(os.environ.get("MCP_MAX_BATCH_SIZE", 100))
+
 app = Flask(__name__)
+app.config["MAX_CONTENT_LENGTH"] = MAX_CONTENT_LENGTH
+
+
+def send_email_action(params):
+    print("📧 Email sent to:", params["to"])
+    return {"status": "sent"}
+
+
+def linkedin_action(params):
+    return post_to_linkedin(params["text"])
+
+
+# Action name -> handler(params); the job workers look handlers up here when a job runs
+ACTIONS = {
+    "send_email": send_email_action,
+    "linkedin": linkedin_action,
+}
+
+REQUIRED_FIELDS = {
+    "send_email": ["to"],
+    "linkedin": ["text"],
+}
+
+# Worker threads (so jobs running at once) per action type;
+# LinkedIn posts share one browser, so there is no point running them in parallel
+ACTION_LIMITS = {
+    "send_email": 8,
+    "linkedin": 1,
+}
+DEFAULT_ACTION_LIMIT = int(os.environ.get("MCP_JOB_WORKERS", 4))
+
+
+jobs = JobQueue(
+    ACTIONS,
+    workers=DEFAULT_ACTION_LIMIT,
+    action_workers=ACTION_LIMITS,
+    retention_seconds=int(os.environ.get("MCP_JOB_RETENTION", 7 * 24 * 3600)),
+    callback_hosts=[host.strip() for host in os.environ.get("MCP_CALLBACK_ALLOWED_HOSTS", "").split(",")
+                    if host.strip()]
+)
+idempotency = IdempotencyStore(
+    ttl_seconds=int(os.environ.get("MCP_IDEMPOTENCY_TTL", 24 * 3600)),
+    max_entries=int(os.environ.get("MCP_IDEMPOTENCY_MAX_KEYS", 10000))
+)
+
+
+def validate_action(action, data):
+    """Return an error message for a bad action payload, or None"""
+    if not isinstance(action, str):
+        return "Expected the action name as a string"
+    if action not in ACTIONS:
+        return f"Unknown action: {action}"
+    if not isinstance(data, dict):
+        return "Expected a JSON object"
+    missing = [field for field in REQUIRED_FIELDS.get(action, []) if field not in data]
+    if missing:
+        return f"Missing fields: {', '.join(missing)}"
+    return None
+
+
+def queue_action(action, data):
+    """Validate an action payload and queue it as a job; returns (body, status)"""
+    error = validate_action(action, data)
+    if error:
+        return {"status": "error", "error": error}, 400
+
+    params = {key: value for key, value in data.items() if key != "callback_url"}
+    try:
+        # submit() checks the callback_url; a refused one is the caller's error
+        job = jobs.start().submit(action, params, callback_url=data.get("callback_url"))
+    except ValueError as e:
+        return {"status": "error", "error": str(e)}, 400
+    return {"status": "queued", "job_id": job["id"], "status_url": f"/jobs/{job['id']}"}, 202
+
+
+def run_batch(data):
+    """Queue every valid item of a batch as its own job; returns (body, status) with per-item job ids"""
+    items = data.get("actions") if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        return {"status": "error", "error": "Expected a non-empty list of actions"}, 400
+    if len(items) > MAX_BATCH_SIZE:
+        return {"status": "error", "error": f"A batch may hold at most {MAX_BATCH_SIZE} actions"}, 400
+
+    results = []
+    queue = jobs.start()
+    # Items are independent: an invalid one is reported and the rest are still queued
+    for index, item in enumerate(items):
+        action = item.get("action") if isinstance(item, dict) else None
+        params = item.get("params", {}) if isinstance(item, dict) else None
+        error = validate_action(action, params)
+        if not error:
+            try:
+                job = queue.submit(action, params, callback_url=item.get("callback_url"))
+            except ValueError as e:
+                error = str(e)
+        if error:
+            results.append({"index": index, "action": action if isinstance(action, str) else None,
+                            "status": "rejected", "error": error})
+            continue
+        results.append({"index": index, "action": action, "status": "queued",
+                        "job_id": job["id"], "status_url": f"/jobs/{job['id']}"})
+
+    rejected = sum(1 for result in results if result["status"] == "rejected")
+    if rejected == len(results):
+        return {"status": "error", "error": "No valid actions in batch", "results": results}, 400
+    return {
+        "status": "queued" if not rejected else "partial_failure",
+        "queued": len(results) - rejected,
+        "rejected": rejected,
+        "results": results
+    }, 202
+
+
+def respond_idempotently(scope, data, run):
+    """Call run(data) -> (body, status), honouring an Idempotency-Key header"""
+    key = request.headers.get("Idempotency-Key")
+    if not key:
+        body, status = run(data)
+        return jsonify(body), status
+
+    if len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+        return jsonify({"status": "error", "error": "Idempotency-Key is too long"}), 400
+
+    outcome, entry = idempotency.begin(key, request_fingerprint(scope, data))
+    if outcome == REPLAY:
+        response = jsonify(entry["body"])
+        response.status_code = entry["status"]
+        response.headers["Idempotent-Replayed"] = "true"
+        return response
+    if outcome == IN_PROGRESS:
+        return jsonify({"status": "error", "error": "A request with this Idempotency-Key is in progress"}), 409
+    if outcome == MISMATCH:
+        return jsonify({"status": "error", "error": "Idempotency-Key was already used with a different request"}), 422
+
+    try:
+        body, status = run(data)
+    except Exception:
+        idempotency.abandon(key)
+        raise
+
+    # Rejected requests are not remembered, so a corrected retry can reuse the key
+    if status < 400:
+        idempotency.complete(key, body, status)
+    else:
+        idempotency.abandon(key)
+    return jsonify(body), status
+
+
+def enqueue(action):
+    """Queue the request body as a job"""
+    return respond_idempotently(action, request.get_json(silent=True), lambda data: queue_action(action, data))
+
 
 @app.route("/linkedin", methods=["POST"])
 def linkedin():
-    data = request.json
-    post_to_linkedin(data["text"])
-    return jsonify({"status": "posted"})
+    return enqueue("linkedin")
 
 @app.route("/send_email", methods=["POST"])
 def send_email():
-    data = request.json
-    print("📧 Email sent to:", data["to"])
-    return jsonify({"status": "sent"})
+    return enqueue("send_email")
+
+@app.route("/batch", methods=["POST"])
+def batch():
+    return respond_idempotently("batch", request.get_json(silent=True), run_batch)
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def job_status(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "error": "Job not found"}), 404
+    return jsonify(job)
+
+@app.errorhandler(413)
+def request_too_large(error):
+    return jsonify({"status": "error", "error": f"Request body exceeds {MAX_CONTENT_LENGTH} bytes"}), 413
+
+
+def create_server(host="127.0.0.1", port=3333, production=False, threads=8,
+                  keepalive_timeout=30, connection_limit=100):
+    """
+    Build (but don't start) the HTTP server for the app.
+
+    production=True returns a waitress server with a pool of `threads` request
+    threads; idle keep-alive connections are closed after keepalive_timeout
+    seconds. Otherwise returns the threaded Werkzeug dev server.
+    """
+    if production:
+        from waitress import create_server as waitress_create_server
+
+        return waitress_create_server(
+            app, host=host, port=port, threads=threads,
+            channel_timeout=keepalive_timeout,
+            connection_limit=connection_limit,
+            max_request_body_size=MAX_CONTENT_LENGTH,
+            ident="mcp-server"
+        )
+
+    from werkzeug.serving import make_server
+    return make_server(host, port, app, threaded=True)
+
+
+def serve(host="127.0.0.1", port=3333, production=False, **server_options):
+    """Start the job workers and serve until interrupted"""
+    jobs.start()
+    server = create_server(host, port, production=production, **server_options)
+    print(f"MCP server ({'waitress' if production else 'dev'}) on http://{host}:{port}")
+    if production:
+        server.run()
+    else:
+        server.serve_forever()
 
 if __name__ == "__main__":
-    app.run(port=3333)
+    parser = argparse.ArgumentParser(description="MCP server for external actions")
+    parser.add_argument("--host", default=os.environ.get("MCP_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("MCP_PORT", 3333)))
+    parser.add_argument("--production", action="store_true", help="Serve with waitress instead of the dev server")
+    parser.add_argument("--threads", type=int, default=int(os.environ.get("MCP_THREADS", 8)))
+    parser.add_argument("--keepalive-timeout", type=int, default=30)
+    parser.add_argument("--connection-limit", type=int, default=100)
+    args = parser.parse_args()
 
+    serve(args.host, args.port, production=args.production, threads=args.threads,
+          keepalive_timeout=args.keepalive_timeout, connection_limit=args.connection_limit)
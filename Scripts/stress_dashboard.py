@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Stress test: many processes updating Dashboard.md at once
+
+Starts several writer processes in a scratch vault. Each calls
+update_dashboard a fixed number of times, the way scheduler jobs and
+skill calls do. Reader processes meanwhile keep re-reading Dashboard.md.
+At the end "Total tasks processed" must equal the number of calls exactly,
+no reader may have seen a truncated page, and the total a reader sees must
+never go backwards.
+
+    python Scripts/stress_dashboard.py --processes 8 --updates 100 --interval 0
+"""
+import argparse
+import multiprocessing
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(REPO_ROOT))
+
+TOTAL_LINE = re.compile(r'^- Total tasks processed: (\d+)$', re.MULTILINE)
+
+SEED_DASHBOARD = """# Dashboard
+
+Status: Active
+
+Last Update:
+- Stress test started
+
+## Summary
+- Total tasks processed: 0
+"""
+
+
+def writer(vault, worker_id, updates, interval):
+    os.chdir(vault)
+    from Skills.dashboard_updater import update_dashboard
+    from Skills.dashboard_writer import get_dashboard_writer
+
+    get_dashboard_writer().interval = interval
+    for i in range(updates):
+        update_dashboard(f"worker {worker_id} event {i}")
+    get_dashboard_writer().close()
+
+
+def reader(vault, stop, results):
+    path = Path(vault) / "Dashboard.md"
+    reads = torn = regressions = 0
+    last_total = 0
+    while not stop.is_set():
+        content = path.read_text()
+        reads += 1
+        match = TOTAL_LINE.search(content)
+        if match is None or not content.endswith("\n"):
+            torn += 1
+            continue
+        total = int(match.group(1))
+        if total < last_total:
+            regressions += 1
+        last_total = total
+    results.put((reads, torn, regressions))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress cross-process Dashboard.md updates")
+    parser.add_argument("--processes", type=int, default=8, help="writer processes")
+    parser.add_argument("--updates", type=int, default=100, help="update_dashboard calls per writer")
+    parser.add_argument("--readers", type=int, default=2, help="processes re-reading Dashboard.md")
+    parser.add_argument("--interval", type=float, default=0.0,
+                        help="writer flush interval; 0 writes the file on every call")
+    parser.add_argument("--keep", action="store_true", help="leave the scratch vault in place")
+    args = parser.parse_args()
+
+    vault = tempfile.mkdtemp(prefix="dashboard_stress_")
+    (Path(vault) / "Dashboard.md").write_text(SEED_DASHBOARD)
+
+    ctx = multiprocessing.get_context("spawn")
+    stop = ctx.Event()
+    results = ctx.Queue()
+    readers = [ctx.Process(target=reader, args=(vault, stop, results)) for _ in range(args.readers)]
+    writers = [ctx.Process(target=writer, args=(vault, i, args.updates, args.interval))
+               for i in range(args.processes)]
+
+    for process in readers:
+        process.start()
+    started = time.perf_counter()
+    for process in writers:
+        process.start()
+    for process in writers:
+        process.join()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    reads = torn = regressions = 0
+    for _ in readers:
+        r, t, g = results.get()
+        reads, torn, regressions = reads + r, torn + t, regressions + g
+    for process in readers:
+        process.join()
+
+    expected = args.processes * args.updates
+    match = TOTAL_LINE.search((Path(vault) / "Dashboard.md").read_text())
+    total = int(match.group(1)) if match else None
+    failed_writers = sum(1 for process in writers if process.exitcode != 0)
+
+    print(f"{args.processes} writers x {args.updates} updates in {elapsed:.2f}s "
+          f"({expected / elapsed:.0f} updates/s, flush interval {args.interval}s)")
+    print(f"Total tasks processed: {total} (expected {expected})")
+    print(f"Reader passes: {reads}, torn reads: {torn}, totals going backwards: {regressions}")
+
+    ok = total == expected and torn == 0 and regressions == 0 and failed_writers == 0
+    print("PASS" if ok else f"FAIL ({failed_writers} writer processes failed)" if failed_writers else "FAIL")
+    if args.keep:
+        print(f"Vault kept at {vault}")
+    else:
+        shutil.rmtree(vault, ignore_errors=True)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
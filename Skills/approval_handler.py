@@ -6,6 +6,8 @@ from pathlib import Path
 import json
 from datetime import datetime
 
+from Skills.task_lifecycle import track_stage, track_stage_done
+
 def create_approval_request(task_name, action_details):
     """Create an approval request for sensitive tasks"""
     approvals_path = Path("Approvals")
@@ -41,6 +43,7 @@ To approve, move this file to the 'Approved' section or mark as 'APPROVED' below
 """
 
     approval_path.write_text(approval_content)
+    track_stage(task_name, "Approvals", ref=approval_filename)
     return f"Approval request created: {approval_filename}"
 
 def check_approvals():
@@ -68,6 +71,7 @@ def approve_request(approval_file):
         # Move to a processed folder or rename to indicate approval
         approved_path = approval_path.parent / f"APPROVED_{approval_path.name}"
         approval_path.rename(approved_path)
+        track_stage_done(approval_file, "Approvals")
 
         return f"Request approved: {approval_file}"
 
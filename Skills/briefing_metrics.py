@@ -0,0 +1,259 @@
+"""
+Briefing Metrics History for AI Employee Vault
+Keeps the numbers behind each weekly briefing (revenue, completed tasks,
+bottlenecks, suggestions) in one SQLite row per week, so trends come from a
+query instead of re-reading every file in Briefings/.
+
+A row recorded before its week has ended is provisional: its WEEK_TOTALS
+are partial, so they are shown but not compared with full weeks, and they
+are left out of the baselines until the week is recorded again as final.
+
+Each metric is loaded as a WeeklySeries: typed arrays plus prefix sums of
+y, y², x, x² and xy. Rolling averages, least-squares slopes and z-scores
+over any window are then a handful of subtractions, however many years of
+weeks are stored.
+
+    store = BriefingMetricsStore()
+    store.record(week_start, {'revenue': 2400.0, 'tasks_completed': 12})
+    store.trends(week_start)['revenue']['slope']
+"""
+import math
+import sqlite3
+import threading
+from array import array
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+METRICS = (
+    'revenue',            # revenue booked in the week
+    'month_to_date',      # month-to-date revenue when the briefing ran
+    'tasks_completed',
+    'bottlenecks',        # tasks flagged as slow
+    'bottleneck_hours',   # hours those tasks ran over their expected time
+    'suggestions',
+)
+# Totals over the whole week; a row recorded before the week ended only has part of them
+WEEK_TOTALS = ('revenue', 'tasks_completed')
+# Weeks averaged for the rolling mean and the anomaly baseline
+ROLLING_WEEKS = 4
+# Weeks fitted for the slope
+TREND_WEEKS = 8
+# Earlier weeks needed before a trend or anomaly is reported
+MIN_HISTORY = 3
+# |z| at or above this marks a week as unusual
+ANOMALY_Z = 2.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS weekly_metrics (
+    week_start TEXT PRIMARY KEY,
+    revenue REAL,
+    month_to_date REAL,
+    tasks_completed REAL,
+    bottlenecks REAL,
+    bottleneck_hours REAL,
+    suggestions REAL,
+    provisional INTEGER NOT NULL DEFAULT 0,
+    recorded_at TEXT NOT NULL
+);
+"""
+
+
+class WeeklySeries:
+    """One metric's weekly values, with prefix sums for O(1) window statistics"""
+
+    def __init__(self, weeks, values):
+        """
+        Args:
+            weeks: week start dates, ascending; gaps are allowed
+            values: one value per week
+        """
+        self.weeks = list(weeks)
+        self.values = array('d', values)
+        origin = self.weeks[0] if self.weeks else None
+        # x is the week number counted from the first stored week, so gaps keep their spacing
+        self.x = array('d', ((week - origin).days / 7 for week in self.weeks))
+
+        self._sy = _prefix(self.values)
+        self._syy = _prefix(y * y for y in self.values)
+        self._sx = _prefix(self.x)
+        self._sxx = _prefix(x * x for x in self.x)
+        self._sxy = _prefix(x * y for x, y in zip(self.x, self.values))
+
+    def __len__(self):
+        return len(self.values)
+
+    def _window(self, end, weeks):
+        """Index bounds [lo, hi) of the `weeks` points ending at index end (inclusive)"""
+        hi = end + 1
+        return max(hi - weeks, 0), hi
+
+    def mean(self, end, weeks):
+        lo, hi = self._window(end, weeks)
+        if hi <= lo:
+            return None
+        return (self._sy[hi] - self._sy[lo]) / (hi - lo)
+
+    def std(self, end, weeks):
+        """Sample standard deviation of the window"""
+        lo, hi = self._window(end, weeks)
+        n = hi - lo
+        if n < 2:
+            return None
+        total = self._sy[hi] - self._sy[lo]
+        variance = (self._syy[hi] - self._syy[lo] - total * total / n) / (n - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def slope(self, end, weeks):
+        """Least-squares change per week over the window"""
+        lo, hi = self._window(end, weeks)
+        n = hi - lo
+        if n < 2:
+            return None
+        sx = self._sx[hi] - self._sx[lo]
+        sy = self._sy[hi] - self._sy[lo]
+        sxx = self._sxx[hi] - self._sxx[lo]
+        sxy = self._sxy[hi] - self._sxy[lo]
+        denominator = n * sxx - sx * sx
+        if denominator == 0:
+            return None
+        return (n * sxy - sx * sy) / denominator
+
+    def zscore(self, end, weeks):
+        """How far values[end] sits from the `weeks` values before it, in standard deviations"""
+        if end < 2:
+            return None
+        baseline_mean = self.mean(end - 1, weeks)
+        baseline_std = self.std(end - 1, weeks)
+        if not baseline_std:
+            return None
+        return (self.values[end] - baseline_mean) / baseline_std
+
+    def rolling_means(self, weeks=ROLLING_WEEKS):
+        """Rolling mean at every point, for charts and exports"""
+        return array('d', (self.mean(i, weeks) for i in range(len(self.values))))
+
+
+class BriefingMetricsStore:
+    def __init__(self, db_path="Data/briefing_metrics.db"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(weekly_metrics)")]
+        if 'provisional' not in columns:
+            self._conn.execute("ALTER TABLE weekly_metrics ADD COLUMN provisional INTEGER NOT NULL DEFAULT 0")
+            self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    def record(self, week_start, metrics, provisional=False):
+        """
+        Store a week's metrics; running the briefing again in the same week
+        replaces its row. Metrics left out keep their stored value.
+        provisional marks a row recorded before the week ended.
+        """
+        unknown = set(metrics) - set(METRICS)
+        if unknown:
+            raise Exception(f"Unknown briefing metrics: {', '.join(sorted(unknown))}")
+
+        week = _week_key(week_start)
+        columns = [name for name in METRICS if metrics.get(name) is not None] + ['provisional']
+        values = [float(metrics[name]) for name in columns[:-1]] + [int(provisional)]
+        updates = ", ".join(f"{name} = excluded.{name}" for name in columns + ['recorded_at'])
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT INTO weekly_metrics (week_start, {', '.join(columns + ['recorded_at'])}) "
+                f"VALUES (?, {', '.join('?' * (len(columns) + 1))}) "
+                f"ON CONFLICT (week_start) DO UPDATE SET {updates}",
+                [week] + values + [datetime.now().isoformat()])
+
+    def provisional_weeks(self, ended_by):
+        """Start dates of provisional weeks that ended before `ended_by`, oldest first"""
+        last_start = date.fromisoformat(_week_key(ended_by)) - timedelta(days=7)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT week_start FROM weekly_metrics WHERE provisional = 1 AND week_start <= ? "
+                "ORDER BY week_start", (last_start.isoformat(),)).fetchall()
+        return [date.fromisoformat(week) for week, in rows]
+
+    def series(self, metric, until=None, before=None):
+        """
+        WeeklySeries of a metric for the stored weeks up to `until` (inclusive)
+        or `before` (exclusive); partial week totals are left out
+        """
+        if metric not in METRICS:
+            raise Exception(f"Unknown briefing metric: {metric}")
+        query = f"SELECT week_start, {metric} FROM weekly_metrics WHERE {metric} IS NOT NULL"
+        if metric in WEEK_TOTALS:
+            query += " AND provisional = 0"
+        params = []
+        if until is not None:
+            query += " AND week_start <= ?"
+            params.append(_week_key(until))
+        if before is not None:
+            query += " AND week_start < ?"
+            params.append(_week_key(before))
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY week_start", params).fetchall()
+        return WeeklySeries([date.fromisoformat(week) for week, _ in rows], [value for _, value in rows])
+
+    def trends(self, week_start, rolling_weeks=ROLLING_WEEKS, trend_weeks=TREND_WEEKS):
+        """
+        {metric: trend} for the given week, compared with the weeks before it.
+        A trend holds value, rolling_avg (of earlier weeks), change_pct,
+        slope (per week), zscore, anomaly and provisional; metrics without
+        enough history are left out. A partial week total is not compared:
+        its change_pct and zscore are None and the slope covers earlier weeks.
+        """
+        week = date.fromisoformat(_week_key(week_start))
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(METRICS)}, provisional FROM weekly_metrics WHERE week_start = ?",
+                (week.isoformat(),)).fetchone()
+        if row is None:
+            return {}
+        current = dict(zip(METRICS, row))
+        provisional = bool(row[-1])
+
+        trends = {}
+        for metric in METRICS:
+            value = current[metric]
+            baseline = self.series(metric, before=week)
+            if value is None or len(baseline) < MIN_HISTORY:
+                continue
+            partial = provisional and metric in WEEK_TOTALS
+            series = WeeklySeries(baseline.weeks + [week], list(baseline.values) + [value])
+            end = len(series) - 1
+            rolling_avg = series.mean(end - 1, rolling_weeks)
+            zscore = None if partial else series.zscore(end, rolling_weeks)
+            trends[metric] = {
+                "value": value,
+                "rolling_avg": rolling_avg,
+                "change_pct": round((value - rolling_avg) / rolling_avg * 100, 1)
+                if rolling_avg and not partial else None,
+                "slope": series.slope(end - 1 if partial else end, trend_weeks),
+                "zscore": zscore,
+                "anomaly": zscore is not None and abs(zscore) >= ANOMALY_Z,
+                "provisional": partial,
+                "weeks": len(series) - 1 if partial else len(series),
+            }
+        return trends
+
+
+def _prefix(values):
+    sums = array('d', [0.0])
+    total = 0.0
+    for value in values:
+        total += value
+        sums.append(total)
+    return sums
+
+
+def _week_key(value):
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
@@ -0,0 +1,138 @@
+"""
+Briefing Section Gathering for AI Employee Vault
+Runs the data providers behind each briefing section concurrently, each
+with its own timeout. A provider that is too slow or fails is replaced by
+its last good value, marked stale with the time it was collected.
+
+Every provider runs on a daemon thread of its own, so one that hangs only
+ties up itself: later briefings start fresh threads and the process can
+still exit.
+
+Last good values are kept in Data/briefing_sections.json, written once per
+gather (and again if a timed-out provider finishes later).
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FuturesTimeout
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_TIMEOUT = 15
+
+
+class SectionResult:
+    def __init__(self, name, value, stale=False, as_of=None, error=None):
+        self.name = name
+        self.value = value
+        self.stale = stale
+        self.as_of = as_of        # when the value was collected (ISO string)
+        self.error = error        # why fresh data is missing, when stale
+
+    def stale_note(self):
+        if not self.stale:
+            return ""
+        when = f"data from {self.as_of[:16].replace('T', ' ')}" if self.as_of else "no earlier data"
+        return f"_Stale: {self.error}; {when}._\n\n"
+
+
+class SectionGatherer:
+    def __init__(self, state_path="Data/briefing_sections.json", timeouts=None, default_timeout=DEFAULT_TIMEOUT):
+        """
+        Args:
+            state_path: JSON file holding last good values
+            timeouts: {section: seconds} overriding default_timeout per section
+        """
+        self.state_path = Path(state_path)
+        self.timeouts = timeouts or {}
+        self.default_timeout = default_timeout
+        self._lock = threading.Lock()
+        self._state = self._load()
+
+    def _load(self):
+        if self.state_path.exists():
+            try:
+                state = json.loads(self.state_path.read_text())
+                return {"last_good": state.get("last_good", {})}
+            except (ValueError, OSError):
+                pass
+        return {"last_good": {}}
+
+    def _save(self):
+        # Caller holds the lock
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._state, default=str))
+        os.replace(tmp_path, self.state_path)
+
+    def _start(self, name, provider):
+        """Run provider on its own daemon thread; returns a Future for its value"""
+        future = Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(provider())
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name=f"briefing-{name}", daemon=True).start()
+        return future
+
+    def gather(self, providers, defaults=None):
+        """
+        Run providers ({section: callable}) concurrently; returns {section: SectionResult}.
+        A provider that times out keeps running and still refreshes the last
+        good value when it finishes, so the next briefing can use it.
+        defaults supplies a value for sections that have never produced one.
+        """
+        defaults = defaults or {}
+        started = time.monotonic()
+        # While gathering, finished providers only update memory; the file is written once at the end
+        gathering = {"open": True}
+        futures = {}
+        for name, provider in providers.items():
+            future = self._start(name, provider)
+            future.add_done_callback(self._on_done(name, gathering))
+            futures[name] = future
+
+        results = {}
+        for name, future in futures.items():
+            remaining = started + self.timeouts.get(name, self.default_timeout) - time.monotonic()
+            try:
+                value = future.result(timeout=max(remaining, 0))
+            except FuturesTimeout:
+                results[name] = self._fallback(name, "source timed out", defaults)
+            except Exception as e:
+                results[name] = self._fallback(name, f"source failed ({e})", defaults)
+            else:
+                results[name] = SectionResult(name, value, as_of=datetime.now().isoformat())
+
+        with self._lock:
+            gathering["open"] = False
+            self._save()
+        return results
+
+    def _on_done(self, name, gathering):
+        def remember(future):
+            if future.cancelled() or future.exception() is not None:
+                return
+            with self._lock:
+                self._state["last_good"][name] = {"value": future.result(), "as_of": datetime.now().isoformat()}
+                if not gathering["open"]:
+                    # A provider that timed out finished after the briefing went out
+                    self._save()
+        return remember
+
+    def _fallback(self, name, error, defaults):
+        with self._lock:
+            last = self._state["last_good"].get(name)
+        if last is not None:
+            return SectionResult(name, last["value"], True, last["as_of"], error)
+        return SectionResult(name, defaults.get(name), True, None, error)
+
+    def render(self, name, result, formatter):
+        """formatter(value) -> markdown, prefixed with a note when the data is stale"""
+        return result.stale_note() + formatter(result.value)
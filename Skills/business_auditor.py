@@ -7,11 +7,49 @@ from pathlib import Path
 import json
 import calendar
 
+from Skills.briefing_metrics import BriefingMetricsStore, ROLLING_WEEKS, TREND_WEEKS
+from Skills.briefing_sections import SectionGatherer
+from Skills.dashboard_writer import get_dashboard_writer
+from Skills.done_index import DoneIndex
+from Skills.task_lifecycle import format_duration, get_lifecycle_tracker
+from Skills.vault_metadata import get_vault_metadata
+
+# Seconds each section's data source gets before its last good value is used
+SECTION_TIMEOUTS = {
+    'revenue': 20,
+    'completed_tasks': 10,
+    'bottlenecks': 10,
+    'suggestions': 5,
+    'deadlines': 5,
+}
+# Projects due within this many days appear under Upcoming Deadlines
+DEADLINE_HORIZON_DAYS = 30
+# ...and within this many become a proactive suggestion
+DEADLINE_WARNING_DAYS = 14
+# Within this fraction of the average counts as "in line with" it
+STEADY_BAND = 0.1
+
 class BusinessAuditor:
-    def __init__(self):
+    def __init__(self, replica=None, done_index=None, lifecycle=None, section_timeouts=None, history=None,
+                 metadata=None, dashboard=None):
         self.vault_path = Path(".")
         self.revenue_targets = {}
         self.metrics = {}
+        # Local OdooAccountingReplica; revenue is read from it when present
+        self.replica = replica
+        # Index of Done/; created on first use when not given
+        self.done_index = done_index
+        # TaskLifecycleTracker for stage timings; the shared one when not given
+        self.lifecycle = lifecycle
+        # BriefingMetricsStore of past weeks' numbers; opened on first use when not given
+        self.history = history
+        # VaultMetadataCache for goals, projects and subscriptions; the shared one when not given
+        self.metadata = metadata
+        # DashboardWriter for Dashboard.md; the shared one when not given
+        self.dashboard = dashboard
+        # Runs the section sources concurrently and caches their last good values and markdown
+        self.sections = SectionGatherer(self.vault_path / "Data" / "briefing_sections.json",
+                                        dict(SECTION_TIMEOUTS, **(section_timeouts or {})))
 
     def generate_weekly_briefing(self):
         """Generate a weekly CEO briefing"""
@@ -23,12 +61,24 @@ class BusinessAuditor:
         week_str = start_of_week.strftime("%Y-%m-%d")
         end_str = end_of_week.strftime("%Y-%m-%d")
 
-        # Gather data for the briefing
-        revenue_data = self._get_revenue_data(start_of_week, end_of_week)
-        completed_tasks = self._get_completed_tasks(start_of_week, end_of_week)
-        bottlenecks = self._identify_bottlenecks(start_of_week, end_of_week)
-        suggestions = self._get_proactive_suggestions()
-        upcoming_deadlines = self._get_upcoming_deadlines()
+        # Gather data for the briefing; the sources run concurrently
+        results = self.sections.gather({
+            'revenue': lambda: self._get_revenue_data(start_of_week, end_of_week),
+            'completed_tasks': lambda: self._get_completed_tasks(start_of_week, end_of_week),
+            'bottlenecks': lambda: self._identify_bottlenecks(start_of_week, end_of_week),
+            'suggestions': self._get_proactive_suggestions,
+            'deadlines': self._get_upcoming_deadlines,
+        }, defaults={'completed_tasks': [], 'bottlenecks': [], 'suggestions': [], 'deadlines': []})
+
+        revenue_data = results['revenue'].value
+        completed_tasks = results['completed_tasks'].value
+        bottlenecks = results['bottlenecks'].value
+
+        # Store this week's numbers and compare them with earlier weeks
+        trends = self._record_history(start_of_week, results)
+        if revenue_data is not None:
+            revenue_data = dict(revenue_data, trend=self._revenue_trend(revenue_data, trends.get('revenue')))
+            results['revenue'].value = revenue_data
 
         # Create briefing content
         briefing_content = f"""# Monday Morning CEO Briefing
@@ -39,24 +89,22 @@ period: {week_str} to {end_str}
 ---
 
 ## Executive Summary
-{self._generate_executive_summary(revenue_data, completed_tasks)}
+{self._generate_executive_summary(revenue_data, completed_tasks, bottlenecks, trends)}
 
 ## Revenue
-- **This Week**: ${revenue_data['this_week']:,.2f}
-- **Month-to-Date**: ${revenue_data['month_to_date']:,.2f} ({revenue_data['percentage_of_target']}% of ${revenue_data['monthly_target']:,.2f} target)
-- **Trend**: {revenue_data['trend']}
+{self.sections.render('revenue', results['revenue'], self._format_revenue)}
 
 ## Completed Tasks
-{self._format_completed_tasks(completed_tasks)}
+{self.sections.render('completed_tasks', results['completed_tasks'], self._format_completed_tasks)}
 
 ## Bottlenecks
-{self._format_bottlenecks(bottlenecks)}
+{self.sections.render('bottlenecks', results['bottlenecks'], self._format_bottlenecks)}
 
 ## Proactive Suggestions
-{self._format_suggestions(suggestions)}
+{self.sections.render('suggestions', results['suggestions'], self._format_suggestions)}
 
 ## Upcoming Deadlines
-{self._format_deadlines(upcoming_deadlines)}
+{self.sections.render('deadlines', results['deadlines'], self._format_deadlines)}
 
 ---
 *Generated by AI Employee v0.1*
@@ -78,13 +126,21 @@ period: {week_str} to {end_str}
 
     def _get_revenue_data(self, start_date, end_date):
         """Get revenue data for the specified period"""
-        # This would typically connect to accounting system like Odoo
-        # For demo purposes, we'll use mock data
-        from random import randint
+        monthly_target = self.revenue_targets.get('monthly') or self._business_goals().monthly_target or 10000
+
+        if self.replica is not None:
+            # Local queries against the synced replica; no Odoo round-trips here
+            today = min(datetime.now(), end_date)
+            this_week = self.replica.revenue_between(start_date.date(), today.date())
+            month_to_date = self.replica.month_to_date(today.date())
+            demo = False
+        else:
+            # No accounting replica configured: fall back to demo numbers, which are never stored
+            from random import randint
 
-        this_week = randint(1500, 3000)
-        month_to_date = randint(4000, 8000)
-        monthly_target = 10000
+            this_week = randint(1500, 3000)
+            month_to_date = randint(4000, 8000)
+            demo = True
         percentage = round((month_to_date / monthly_target) * 100, 1)
 
         trend = "On track" if month_to_date >= (monthly_target * 0.5) else "Behind schedule"
@@ -94,91 +150,221 @@ period: {week_str} to {end_str}
             "month_to_date": month_to_date,
             "monthly_target": monthly_target,
             "percentage_of_target": percentage,
-            "trend": trend
+            "trend": trend,
+            "demo": demo
         }
 
     def _get_completed_tasks(self, start_date, end_date):
-        """Get completed tasks for the period"""
-        done_dir = self.vault_path / "Done"
-        if not done_dir.exists():
-            return []
-
-        # Find task files completed in the date range
-        completed_tasks = []
-        for task_file in done_dir.glob("*.md"):
-            # Check if the file was modified in the target week
-            # For simplicity, we'll just take the most recent ones
-            content = task_file.read_text()
-            completed_tasks.append({
-                "filename": task_file.name,
-                "content": content[:200] + "..." if len(content) > 200 else content
+        """Get tasks completed in the period, most recent first"""
+        # Only new or changed files in Done/ are read; the query touches just the target week
+        done_index = self._done_index()
+        done_index.refresh()
+        return done_index.completed_between(start_date, end_date)
+
+    def _done_index(self):
+        if self.done_index is None:
+            self.done_index = DoneIndex(self.vault_path / "Done", self.vault_path / "Data" / "done_index.db")
+        return self.done_index
+
+    def _identify_bottlenecks(self, start_date, end_date, limit=5):
+        """Tasks that spent longer in a stage than 90% of recent tasks did"""
+        tracker = self.lifecycle or get_lifecycle_tracker()
+        # Pick up moves made outside the skills before judging
+        tracker.sync_folders()
+
+        end = min(datetime.now(), datetime.combine(end_date.date(), datetime.max.time()))
+        days = (end.date() - start_date.date()).days + 1
+        bottlenecks = []
+        for item in tracker.flag_slow(percentile=0.9, days=days, now=end.timestamp())[:limit]:
+            task = item['task'].replace('_', ' ')
+            bottlenecks.append({
+                "task": f"{task} ({item['stage'].replace('_', ' ')}{', still open' if item['open'] else ''})",
+                "expected_duration": format_duration(item['expected_seconds']),
+                "actual_duration": format_duration(item['seconds']),
+                "delay": f"+{format_duration(item['seconds'] - item['expected_seconds'])}",
+                "seconds": item['seconds'],
+                "expected_seconds": item['expected_seconds']
             })
+        return bottlenecks
 
-        return completed_tasks[:10]  # Limit to 10 most recent
-
-    def _identify_bottlenecks(self, start_date, end_date):
-        """Identify bottlenecks in operations"""
-        # This would analyze task completion times, etc.
-        # For demo, return mock bottlenecks
-        return [
-            {
-                "task": "Client B proposal",
-                "expected_duration": "2 days",
-                "actual_duration": "5 days",
-                "delay": "+3 days"
-            },
-            {
-                "task": "Software deployment",
-                "expected_duration": "1 day",
-                "actual_duration": "3 days",
-                "delay": "+2 days"
-            }
-        ]
+    def _business_goals(self):
+        """Parsed Business_Goals.md; re-read only after the file changes"""
+        if self.metadata is None:
+            self.metadata = get_vault_metadata(self.vault_path)
+        return self.metadata.business_goals()
 
     def _get_proactive_suggestions(self):
-        """Generate proactive suggestions based on patterns"""
-        # Analyze recurring expenses, etc.
-        suggestions = [
-            {
+        """Generate proactive suggestions from the subscription audit rules and project deadlines"""
+        goals = self._business_goals()
+        suggestions = []
+
+        # One suggestion per subscription, however many rules it breaks
+        reasons = {}
+        for subscription, reason in goals.flagged_subscriptions():
+            reasons.setdefault(subscription, []).append(reason)
+        for subscription, flagged in reasons.items():
+            details = ". ".join(flagged) + "."
+            if subscription.monthly_cost is not None:
+                details += f" Cost: ${subscription.monthly_cost:,.0f}/month."
+            suggestions.append({
                 "category": "Cost Optimization",
-                "item": "Notion subscription",
-                "details": "No team activity in 45 days. Cost: $15/month.",
+                "item": f"{subscription.name} subscription",
+                "details": details,
                 "action": "[ACTION] Cancel subscription?",
                 "location": "/Pending_Approval"
-            },
-            {
-                "category": "Upcoming Deadlines",
-                "item": "Project Alpha final delivery",
-                "details": "Due Jan 15 (9 days)",
-                "action": "Prepare handover materials"
-            }
-        ]
+            })
+
+        for project in goals.upcoming_projects(days=DEADLINE_WARNING_DAYS):
+            days_left = project.days_left()
+            overdue = days_left < 0
+            suggestions.append({
+                "category": "Overdue Projects" if overdue else "Upcoming Deadlines",
+                "item": project.name,
+                "details": f"Due {project.due.strftime('%b %d').replace(' 0', ' ')} "
+                           f"({-days_left if overdue else days_left} days{' overdue' if overdue else ''})",
+                "action": "Agree a new delivery date with the client" if overdue else "Prepare handover materials"
+            })
         return suggestions
 
     def _get_upcoming_deadlines(self):
-        """Get upcoming deadlines"""
-        # Would normally read from project files
-        today = datetime.now()
+        """Get project deadlines from Business_Goals.md, overdue ones first"""
         return [
             {
-                "project": "Project Alpha",
-                "deadline": (today + timedelta(days=9)).strftime("%b %d"),
-                "days_left": 9
-            },
-            {
-                "project": "Quarterly tax prep",
-                "deadline": (today + timedelta(days=25)).strftime("%b %d"),
-                "days_left": 25
+                "project": project.name,
+                "deadline": project.due.strftime("%b %d"),
+                "days_left": project.days_left()
             }
+            for project in self._business_goals().upcoming_projects(days=DEADLINE_HORIZON_DAYS)
         ]
 
-    def _generate_executive_summary(self, revenue_data, completed_tasks):
-        """Generate executive summary text"""
+    def _record_history(self, week_start, results):
+        """
+        Save the week's fresh numbers to the history store; returns its trends for the week.
+        Until the week has ended its row is provisional, and the week before is
+        recorded again with its full totals.
+        """
+        metrics = {}
+        revenue = results['revenue']
+        if not revenue.stale and revenue.value is not None and not revenue.value.get('demo'):
+            metrics['revenue'] = revenue.value['this_week']
+            metrics['month_to_date'] = revenue.value['month_to_date']
+        if not results['completed_tasks'].stale:
+            metrics['tasks_completed'] = len(results['completed_tasks'].value)
+        if not results['bottlenecks'].stale:
+            bottlenecks = results['bottlenecks'].value
+            metrics['bottlenecks'] = len(bottlenecks)
+            metrics['bottleneck_hours'] = sum(
+                b['seconds'] - b['expected_seconds'] for b in bottlenecks if 'seconds' in b) / 3600
+        if not results['suggestions'].stale:
+            metrics['suggestions'] = len(results['suggestions'].value)
+
+        week = week_start.date()
+        provisional = datetime.now().date() < week + timedelta(days=7)
+        try:
+            if self.history is None:
+                self.history = BriefingMetricsStore(self.vault_path / "Data" / "briefing_metrics.db")
+            self._finalize_weeks(datetime.now().date())
+            if metrics:
+                self.history.record(week, metrics, provisional=provisional)
+            return self.history.trends(week)
+        except Exception as e:
+            print(f"Error updating briefing history: {e}")
+            return {}
+
+    def _finalize_weeks(self, today):
+        """Replace the partial totals of every provisional week that has ended with the full week's"""
+        for week in self.history.provisional_weeks(ended_by=today):
+            end = week + timedelta(days=6)
+            metrics = {}
+            try:
+                if self.replica is not None:
+                    metrics['revenue'] = self.replica.revenue_between(week, end)
+                metrics['tasks_completed'] = self._done_index().count_between(week, end)
+            except Exception as e:
+                # Left provisional (out of the baselines) and tried again on the next run
+                print(f"Error finalizing briefing history for {week}: {e}")
+                continue
+            self.history.record(week, metrics, provisional=False)
+
+    def _revenue_trend(self, revenue_data, trend):
+        """Trend line for the revenue section; the target pace until enough weeks are stored"""
+        if trend is None:
+            return revenue_data['trend']
+
+        parts = []
+        if trend['change_pct'] is not None:
+            direction = "Flat" if abs(trend['change_pct']) < STEADY_BAND * 100 else (
+                "Up" if trend['change_pct'] > 0 else "Down")
+            parts.append(f"{direction} {abs(trend['change_pct'])}% vs {ROLLING_WEEKS}-week average "
+                         f"(${trend['rolling_avg']:,.2f})")
+        if trend['slope'] is not None:
+            sign = "+" if trend['slope'] >= 0 else "-"
+            parts.append(f"{sign}${abs(trend['slope']):,.2f}/week over the last "
+                         f"{min(trend['weeks'], TREND_WEEKS)} weeks")
+        if trend['anomaly']:
+            parts.append(f"unusual week (z = {trend['zscore']:+.1f})")
+        if trend['provisional']:
+            parts.insert(0, f"{revenue_data['trend']} (week in progress)")
+        return "; ".join(parts) or revenue_data['trend']
+
+    def _generate_executive_summary(self, revenue_data, completed_tasks, bottlenecks=(), trends=None):
+        """Generate executive summary text from this week's numbers and the stored history"""
+        trends = trends or {}
         task_count = len(completed_tasks)
-        if revenue_data['month_to_date'] >= revenue_data['monthly_target'] * 0.7:
-            return f"Strong week with {task_count} tasks completed and revenue ahead of target. One bottleneck identified."
+
+        tasks_trend = trends.get('tasks_completed')
+        # A week still in progress is not compared with full weeks
+        tasks_vs_average = _compare(task_count, tasks_trend['rolling_avg']) \
+            if tasks_trend and not tasks_trend['provisional'] else None
+        if tasks_vs_average:
+            sentences = [f"{task_count} tasks completed, {tasks_vs_average} the "
+                         f"{ROLLING_WEEKS}-week average of {tasks_trend['rolling_avg']:.1f}."]
         else:
-            return f"Weekly review shows {task_count} tasks completed. Revenue behind target. Multiple bottlenecks identified."
+            sentences = [f"{task_count} tasks completed."]
+
+        revenue_trend = trends.get('revenue')
+        revenue_vs_average = None
+        if revenue_data is None:
+            sentences.append("Revenue data is unavailable this week.")
+        elif revenue_trend and revenue_trend['rolling_avg'] and not revenue_trend['provisional']:
+            revenue_vs_average = _compare(revenue_data['this_week'], revenue_trend['rolling_avg'])
+            sentence = f"Revenue is {revenue_vs_average} its {ROLLING_WEEKS}-week average"
+            if revenue_trend['anomaly']:
+                sentence += ", an unusual week worth a closer look"
+            sentences.append(sentence + ".")
+        else:
+            # Not enough history yet: compare month-to-date with the target pro rata
+            today = datetime.now()
+            days_in_month = calendar.monthrange(today.year, today.month)[1]
+            expected = revenue_data['monthly_target'] * today.day / days_in_month
+            sentences.append(f"Month-to-date revenue is {_compare(revenue_data['month_to_date'], expected)} "
+                             f"the pace needed for the monthly target.")
+
+        count = len(bottlenecks)
+        if count == 0:
+            sentences.append("No bottlenecks identified.")
+        else:
+            sentence = f"{count} bottleneck{'s' if count != 1 else ''} identified"
+            bottleneck_trend = trends.get('bottlenecks')
+            if bottleneck_trend and bottleneck_trend['anomaly'] and bottleneck_trend['zscore'] > 0:
+                sentence += ", more than usual"
+            sentences.append(sentence + ".")
+
+        if tasks_vs_average == "above" and revenue_vs_average == "above":
+            sentences.insert(0, "Strong week.")
+        return " ".join(sentences)
+
+    def _format_revenue(self, revenue_data):
+        """Format the revenue section for briefing"""
+        if revenue_data is None:
+            return "- Revenue data unavailable\n"
+
+        return "\n".join([
+            f"- **This Week**: ${revenue_data['this_week']:,.2f}",
+            f"- **Month-to-Date**: ${revenue_data['month_to_date']:,.2f} "
+            f"({revenue_data['percentage_of_target']}% of ${revenue_data['monthly_target']:,.2f} target)",
+            f"- **Trend**: {revenue_data['trend']}"
+        ])
 
     def _format_completed_tasks(self, tasks):
         """Format completed tasks for briefing"""
@@ -222,42 +408,26 @@ period: {week_str} to {end_str}
 
         formatted = []
         for deadline in deadlines:
-            formatted.append(f"- {deadline['project']}: {deadline['deadline']} ({deadline['days_left']} days)")
+            if deadline['days_left'] < 0:
+                formatted.append(f"- {deadline['project']}: {deadline['deadline']} "
+                                 f"({-deadline['days_left']} days overdue)")
+            else:
+                formatted.append(f"- {deadline['project']}: {deadline['deadline']} ({deadline['days_left']} days)")
         return "\n".join(formatted)
 
     def _update_dashboard_summary(self, briefing_content):
         """Update the dashboard with a summary"""
-        dashboard_path = self.vault_path / "Dashboard.md"
-
-        if dashboard_path.exists():
-            current_content = dashboard_path.read_text()
-        else:
-            current_content = "# Dashboard\n\nStatus: Active\n\n"
-
-        # Add recent activity summary
-        summary_section = f"## Recent Activity\n- [{datetime.now().strftime('%Y-%m-%d %H:%M')}] Weekly briefing generated\n"
-
-        # Find the Recent Activity section and update it, or add it if it doesn't exist
-        if "## Recent Activity" in current_content:
-            lines = current_content.split('\n')
-            new_lines = []
-            skip_block = False
-            for line in lines:
-                if line.startswith("## Recent Activity"):
-                    new_lines.append(line)
-                    new_lines.append(summary_section)
-                    skip_block = True
-                elif skip_block and line.startswith("##"):
-                    skip_block = False
-                    new_lines.append(line)
-                elif not skip_block:
-                    new_lines.append(line)
-            updated_content = '\n'.join(new_lines)
-        else:
-            # Add the section at the end
-            updated_content = current_content + "\n" + summary_section
-
-        dashboard_path.write_text(updated_content)
+        dashboard = self.dashboard or get_dashboard_writer()
+        dashboard.set_section(
+            "Recent Activity", f"- [{datetime.now().strftime('%Y-%m-%d %H:%M')}] Weekly briefing generated")
+
+def _compare(value, average):
+    """'above', 'below' or 'in line with' the average"""
+    if not average:
+        return None
+    if abs(value - average) <= abs(average) * STEADY_BAND:
+        return "in line with"
+    return "above" if value > average else "below"
 
 def schedule_weekly_audit():
     """Function to schedule the weekly audit using cron or Task Scheduler"""
@@ -266,8 +436,15 @@ def schedule_weekly_audit():
     cron_job = "0 7 * * 1 /usr/bin/python3 /path/to/AI_Employee_Vault/scripts/run_weekly_audit.py"
     return cron_job
 
-def run_weekly_audit():
+def run_weekly_audit(replica=None):
     """Execute the weekly audit"""
-    auditor = BusinessAuditor()
+    if replica is not None and replica.odoo is not None:
+        # Pull only what changed since the last run; if Odoo is down, report from the local copy
+        try:
+            replica.sync()
+        except Exception as e:
+            print(f"Odoo sync failed, using last synced data: {e}")
+
+    auditor = BusinessAuditor(replica=replica)
     briefing_path = auditor.generate_weekly_briefing()
     return briefing_path
\ No newline at end of file
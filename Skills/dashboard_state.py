@@ -0,0 +1,387 @@
+"""
+Dashboard State Store for AI Employee Vault
+Keeps what Dashboard.md shows in a small SQLite store: the status line,
+summary counters, a bounded ring of recent updates and free-form sections.
+Dashboard.md is rendered from that state, so an update is a single-row write
+plus a render of a page whose size does not grow with the vault's history.
+
+On first use the store imports the existing Dashboard.md. If the file is
+later edited by hand, the edit is imported again before the next change, so
+nothing typed into the dashboard is lost.
+
+Several processes can share the store. Changes and imports are serialised by
+a lock on Dashboard.md, and the file is replaced atomically, so readers never
+see a half-written page and no increment is lost.
+
+    state = get_dashboard_state()
+    state.add_update("Invoice_123 moved to Done")
+    state.increment("Total tasks processed")
+    state.write()
+"""
+import hashlib
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from Skills.file_lock import FileLock, atomic_write_text, file_signature
+
+# Recent updates kept, oldest dropped first
+MAX_UPDATES = 20
+DEFAULT_STATUS = "Active"
+SUMMARY_SECTION = "Summary"
+# Renders discarded because another writer changed the state meanwhile, before rendering under the lock
+WRITE_RETRIES = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS counters (
+    label TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0,
+    position INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS updates (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    text TEXT NOT NULL,
+    at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sections (
+    name TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    position INTEGER NOT NULL
+);
+"""
+
+_SUMMARY_ITEM = re.compile(r'^-\s+(.+?):\s*(.*)$')
+
+
+def parse_dashboard(text):
+    """{'status', 'updates', 'counters', 'sections'} from Dashboard.md content"""
+    parsed = {'status': None, 'updates': [], 'counters': [], 'sections': []}
+    section = None
+    in_updates = False
+    body = []
+
+    def close_section():
+        if section is not None and section != SUMMARY_SECTION:
+            parsed['sections'].append((section, '\n'.join(body).strip('\n')))
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith('## '):
+            close_section()
+            section = stripped[3:].strip()
+            body = []
+            in_updates = False
+            continue
+        if section is None:
+            if stripped.startswith('Status:'):
+                parsed['status'] = stripped[len('Status:'):].strip()
+            elif stripped == 'Last Update:':
+                in_updates = True
+            elif in_updates and stripped.startswith('- '):
+                parsed['updates'].append(stripped[2:].strip())
+            elif stripped and not stripped.startswith('# '):
+                in_updates = False
+        elif section == SUMMARY_SECTION:
+            match = _SUMMARY_ITEM.match(stripped)
+            if match:
+                value = match.group(2)
+                parsed['counters'].append((match.group(1), int(value) if value.lstrip('-').isdigit() else value))
+        else:
+            body.append(line)
+    close_section()
+    return parsed
+
+
+class DashboardChanges:
+    """
+    A batch of dashboard edits, merged as they arrive: increments to the same
+    counter add up, and the last status or section body wins. Updates are
+    kept in order, up to max_updates of the newest.
+    """
+
+    def __init__(self, max_updates=MAX_UPDATES):
+        self.max_updates = max_updates
+        self.status = None
+        self.updates = []       # (text, at)
+        self.counters = {}      # label -> ('add' | 'set', value)
+        self.sections = {}      # name -> body, or None to remove
+        self.events = 0
+
+    def empty(self):
+        return self.events == 0
+
+    def set_status(self, status):
+        self.status = status
+        self.events += 1
+        return self
+
+    def add_update(self, text, at=None):
+        self.updates.append((text, at or datetime.now().isoformat()))
+        if len(self.updates) > self.max_updates:
+            del self.updates[:-self.max_updates]
+        self.events += 1
+        return self
+
+    def increment(self, label, by=1):
+        mode, value = self.counters.get(label, ('add', 0))
+        self.counters[label] = (mode, value + by)
+        self.events += 1
+        return self
+
+    def set_counter(self, label, value):
+        self.counters[label] = ('set', value)
+        self.events += 1
+        return self
+
+    def set_section(self, name, body):
+        if name == SUMMARY_SECTION:
+            raise Exception("The Summary section is built from counters; use set_counter")
+        self.sections[name] = body.strip('\n')
+        self.events += 1
+        return self
+
+    def remove_section(self, name):
+        self.sections[name] = None
+        self.events += 1
+        return self
+
+    def extend(self, later):
+        """Merge a batch that came after this one"""
+        if later.status is not None:
+            self.status = later.status
+        for text, at in later.updates:
+            self.add_update(text, at)
+        for label, (mode, value) in later.counters.items():
+            if mode == 'set':
+                self.counters[label] = (mode, value)
+            else:
+                own_mode, own_value = self.counters.get(label, ('add', 0))
+                self.counters[label] = (own_mode, own_value + value)
+        self.sections.update(later.sections)
+        self.events += later.events - len(later.updates)
+        return self
+
+
+class DashboardState:
+    def __init__(self, db_path="Data/dashboard_state.db", dashboard_path="Dashboard.md", max_updates=MAX_UPDATES):
+        self.db_path = Path(db_path)
+        self.dashboard_path = Path(dashboard_path)
+        self.max_updates = max_updates
+        self._lock = threading.RLock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Other processes (scheduler jobs, skill calls, the audit) share the database
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self.sync_from_file()
+
+    def close(self):
+        self._conn.close()
+
+    # --- Reading ---------------------------------------------------------
+
+    def _meta(self, key, default=None):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    @property
+    def version(self):
+        """Bumped on every change to the state"""
+        with self._lock:
+            return int(self._meta('version', 0))
+
+    def snapshot(self):
+        with self._lock:
+            # Version first: if another process commits meanwhile, the snapshot looks stale, never newer
+            version = int(self._meta('version', 0))
+            return {
+                'status': self._meta('status', DEFAULT_STATUS),
+                'updates': [text for (text,) in self._conn.execute(
+                    "SELECT text FROM updates ORDER BY seq DESC LIMIT ?", (self.max_updates,))][::-1],
+                'counters': self._conn.execute("SELECT label, value FROM counters ORDER BY position").fetchall(),
+                'sections': self._conn.execute("SELECT name, body FROM sections ORDER BY position").fetchall(),
+                'version': version,
+            }
+
+    def counter(self, label):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM counters WHERE label = ?", (label,)).fetchone()
+        return row[0] if row else 0
+
+    def render(self, snapshot=None):
+        """Dashboard.md content for the current (or given) state"""
+        snapshot = snapshot or self.snapshot()
+        lines = ["# Dashboard", "", f"Status: {snapshot['status']}", ""]
+        if snapshot['updates']:
+            lines.append("Last Update:")
+            lines.extend(f"- {text}" for text in snapshot['updates'])
+            lines.append("")
+        if snapshot['counters']:
+            lines.append(f"## {SUMMARY_SECTION}")
+            lines.extend(f"- {label}: {value}" for label, value in snapshot['counters'])
+            lines.append("")
+        for name, body in snapshot['sections']:
+            lines.append(f"## {name}")
+            if body:
+                lines.append(body)
+            lines.append("")
+        return "\n".join(lines)
+
+    # --- Changing --------------------------------------------------------
+
+    def _changed(self):
+        self._conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('version', '1') "
+            "ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1")
+
+    def apply(self, changes):
+        """Apply a DashboardChanges batch in one transaction"""
+        if changes.empty():
+            return
+        # The file lock keeps another process from importing Dashboard.md halfway through
+        with FileLock(self.dashboard_path), self._lock:
+            self._sync_from_file()
+            with self._conn:
+                if changes.status is not None:
+                    self._set_meta('status', changes.status)
+
+                seq = None
+                for text, at in changes.updates:
+                    seq = self._conn.execute("INSERT INTO updates (text, at) VALUES (?, ?)", (text, at)).lastrowid
+                if seq is not None:
+                    self._conn.execute("DELETE FROM updates WHERE seq <= ?", (seq - self.max_updates,))
+
+                for label, (mode, value) in changes.counters.items():
+                    current = "value + excluded.value" if mode == 'add' else "excluded.value"
+                    self._conn.execute(
+                        "INSERT INTO counters (label, value, position) "
+                        "VALUES (?, ?, (SELECT COALESCE(MAX(position), 0) + 1 FROM counters)) "
+                        f"ON CONFLICT (label) DO UPDATE SET value = {current}", (label, value))
+
+                for name, body in changes.sections.items():
+                    if body is None:
+                        self._conn.execute("DELETE FROM sections WHERE name = ?", (name,))
+                    else:
+                        self._conn.execute(
+                            "INSERT INTO sections (name, body, position) "
+                            "VALUES (?, ?, (SELECT COALESCE(MAX(position), 0) + 1 FROM sections)) "
+                            "ON CONFLICT (name) DO UPDATE SET body = excluded.body", (name, body))
+                self._changed()
+
+    def set_status(self, status):
+        self.apply(DashboardChanges().set_status(status))
+
+    def add_update(self, text):
+        """Append to the recent updates; the oldest beyond max_updates is dropped"""
+        self.apply(DashboardChanges().add_update(text))
+
+    def increment(self, label, by=1):
+        self.apply(DashboardChanges().increment(label, by))
+
+    def set_counter(self, label, value):
+        self.apply(DashboardChanges().set_counter(label, value))
+
+    def set_section(self, name, body):
+        """Replace (or add, after the existing ones) a '## name' section"""
+        self.apply(DashboardChanges().set_section(name, body))
+
+    def remove_section(self, name):
+        self.apply(DashboardChanges().remove_section(name))
+
+    # --- Dashboard.md ----------------------------------------------------
+
+    def write(self, retries=WRITE_RETRIES):
+        """
+        Render the state to Dashboard.md. The page is rendered without the file
+        lock and written only if no other writer changed the state meanwhile;
+        after `retries` such conflicts it is rendered under the lock.
+        """
+        for attempt in range(retries + 1):
+            snapshot = self.snapshot()
+            with FileLock(self.dashboard_path), self._lock:
+                current = self.version
+                if (self._meta('file_version') == str(current)
+                        and self._meta('file_signature') == file_signature(self.dashboard_path)):
+                    # Another writer already put this version on disk
+                    return self.dashboard_path.read_text()
+                if current != snapshot['version']:
+                    if attempt < retries:
+                        continue
+                    snapshot = self.snapshot()
+                content = self.render(snapshot)
+                atomic_write_text(self.dashboard_path, content)
+                self._remember_file(content, snapshot['version'])
+                return content
+
+    def _remember_file(self, content, version):
+        # Caller holds the file lock
+        with self._conn:
+            self._set_meta('file_hash', _digest(content))
+            self._set_meta('file_signature', file_signature(self.dashboard_path))
+            self._set_meta('file_version', version)
+
+    def sync_from_file(self):
+        """Import Dashboard.md if it was created or edited outside this store; returns True if it was"""
+        with FileLock(self.dashboard_path), self._lock:
+            return self._sync_from_file()
+
+    def _sync_from_file(self):
+        # Caller holds the file lock
+        signature = file_signature(self.dashboard_path)
+        if signature is None or self._meta('file_signature') == signature:
+            return False
+
+        content = self.dashboard_path.read_text()
+        if self._meta('file_hash') == _digest(content):
+            self._remember_file(content, self._meta('file_version'))
+            return False
+
+        self._import(parse_dashboard(content))
+        self._remember_file(content, self.version)
+        return True
+
+    def _import(self, parsed):
+        with self._conn:
+            self._set_meta('status', parsed['status'] or DEFAULT_STATUS)
+            self._conn.execute("DELETE FROM updates")
+            self._conn.executemany(
+                "INSERT INTO updates (text, at) VALUES (?, ?)",
+                [(text, datetime.now().isoformat()) for text in parsed['updates'][-self.max_updates:]])
+            self._conn.execute("DELETE FROM counters")
+            self._conn.executemany(
+                "INSERT INTO counters (label, value, position) VALUES (?, ?, ?)",
+                [(label, value, i) for i, (label, value) in enumerate(parsed['counters'], 1)])
+            self._conn.execute("DELETE FROM sections")
+            self._conn.executemany(
+                "INSERT INTO sections (name, body, position) VALUES (?, ?, ?)",
+                [(name, body, i) for i, (name, body) in enumerate(parsed['sections'], 1)])
+            self._changed()
+
+
+def _digest(content):
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+_state = None
+_state_lock = threading.Lock()
+
+
+def get_dashboard_state():
+    """Shared DashboardState for the vault in the working directory"""
+    global _state
+    with _state_lock:
+        if _state is None:
+            _state = DashboardState()
+        return _state
@@ -0,0 +1,146 @@
+"""
+Coalescing Dashboard Writer for AI Employee Vault
+Collects dashboard edits in memory and applies them to the dashboard state
+and Dashboard.md at most once per interval, so a burst of task events costs
+one file rewrite (and one Obsidian re-render) instead of one per event.
+Every event still reaches the file: counter increments add up, updates keep
+their order, and the last status or section body wins.
+
+Pending edits are flushed when the interval passes, when flush() is called,
+and when the process exits.
+
+    writer = get_dashboard_writer()
+    writer.add_update("Invoice_123 moved to Done")
+    writer.increment("Total tasks processed")
+"""
+import atexit
+import os
+import threading
+
+from Skills.dashboard_state import DashboardChanges, get_dashboard_state
+
+# Seconds between Dashboard.md writes during a burst
+DEFAULT_INTERVAL = float(os.getenv("DASHBOARD_FLUSH_INTERVAL", "2.0"))
+
+
+class DashboardWriter:
+    def __init__(self, state=None, interval=DEFAULT_INTERVAL, flush_at_exit=True):
+        """
+        Args:
+            state: DashboardState to write through; the shared one when not given
+            interval: longest time an edit waits before it is written
+            flush_at_exit: write pending edits when the interpreter exits
+        """
+        self.state = state or get_dashboard_state()
+        self.interval = interval
+        self._lock = threading.Lock()
+        # Held while a batch is applied, so flushes happen one at a time and in order
+        self._flush_lock = threading.Lock()
+        self._pending = DashboardChanges(self.state.max_updates)
+        self._timer = None
+        self._closed = False
+        # Edits applied to the state but not yet rendered to Dashboard.md
+        self._unwritten = False
+        self.events = 0
+        self.writes = 0
+        if flush_at_exit:
+            atexit.register(self.close)
+
+    def set_status(self, status):
+        self._submit(lambda changes: changes.set_status(status))
+
+    def add_update(self, text):
+        self._submit(lambda changes: changes.add_update(text))
+
+    def increment(self, label, by=1):
+        self._submit(lambda changes: changes.increment(label, by))
+
+    def set_counter(self, label, value):
+        self._submit(lambda changes: changes.set_counter(label, value))
+
+    def set_section(self, name, body):
+        self._submit(lambda changes: changes.set_section(name, body))
+
+    def remove_section(self, name):
+        self._submit(lambda changes: changes.remove_section(name))
+
+    def pending(self):
+        """Edits waiting for the next write"""
+        with self._lock:
+            return self._pending.events
+
+    def _submit(self, edit):
+        with self._lock:
+            edit(self._pending)
+            self.events += 1
+            if self._closed or self.interval <= 0:
+                flush_now = True
+            else:
+                flush_now = False
+                # The first edit of a burst opens the window; later ones join it
+                self._arm()
+        if flush_now:
+            self.flush()
+
+    def _arm(self):
+        # Caller holds self._lock
+        if self._timer is None:
+            self._timer = threading.Timer(self.interval, self._timer_flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _timer_flush(self):
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Error writing dashboard, retrying in {self.interval}s: {e}")
+            with self._lock:
+                if not self._closed:
+                    self._arm()
+
+    def flush(self):
+        """Write pending edits now; returns the number of edits written"""
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                changes = self._pending
+                self._pending = DashboardChanges(self.state.max_updates)
+            if changes.empty() and not self._unwritten:
+                return 0
+
+            try:
+                self.state.apply(changes)
+            except Exception:
+                # Keep the edits, ahead of anything submitted meanwhile, for the next flush
+                with self._lock:
+                    self._pending = changes.extend(self._pending)
+                raise
+            self._unwritten = True
+            self.state.write()
+            self._unwritten = False
+            self.writes += 1
+            return changes.events
+
+    def close(self):
+        """Flush and write straight through from now on"""
+        with self._lock:
+            self._closed = True
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Error writing dashboard: {e}")
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_dashboard_writer():
+    """Shared DashboardWriter for the vault in the working directory"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = DashboardWriter()
+        return _writer
@@ -0,0 +1,178 @@
+"""
+Index of Completed Tasks for AI Employee Vault
+Keeps one SQLite row per file in Done/ (name, mtime, size, completion time,
+title and a 200-character preview). refresh() stats the folder and reads
+only files that are new or changed since the last refresh, so briefings can
+ask for a week's tasks without opening every file ever completed.
+
+    index = DoneIndex()
+    index.refresh()
+    index.completed_between(start_of_week, end_of_week)
+"""
+import os
+import sqlite3
+import threading
+from datetime import datetime, time as dt_time
+from pathlib import Path
+
+PREVIEW_CHARS = 200
+# Enough of the file for the title and the preview
+READ_BYTES = 4096
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS done_tasks (
+    name TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    ctime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    completed_at REAL NOT NULL,
+    title TEXT,
+    preview TEXT,
+    truncated INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_done_completed ON done_tasks (completed_at);
+"""
+
+
+def completed_time(stat):
+    """
+    When a file landed in its folder, as best a stat can tell: its mtime.
+    ctime would follow the rename too, but also any later chmod, touch or
+    backup, which would move the task into the wrong week.
+    """
+    return stat.st_mtime
+
+
+def parse_title(text, fallback):
+    """First markdown heading, else a frontmatter title, else the fallback"""
+    in_frontmatter = False
+    frontmatter_title = None
+    for i, line in enumerate(text.splitlines()):
+        stripped = line.strip()
+        if i == 0 and stripped == '---':
+            in_frontmatter = True
+            continue
+        if in_frontmatter:
+            if stripped == '---':
+                in_frontmatter = False
+            elif stripped.lower().startswith('title:'):
+                frontmatter_title = stripped[6:].strip().strip('"\'')
+            continue
+        if stripped.startswith('#'):
+            return stripped.lstrip('#').strip() or fallback
+    return frontmatter_title or fallback
+
+
+class DoneIndex:
+    def __init__(self, done_dir="Done", db_path="Data/done_index.db"):
+        self.done_dir = Path(done_dir)
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def refresh(self):
+        """Bring the index up to date with Done/; returns {'added', 'updated', 'removed'} counts"""
+        with self._lock:
+            known = {
+                name: ((mtime_ns, ctime_ns, size), completed_at)
+                for name, mtime_ns, ctime_ns, size, completed_at in self._conn.execute(
+                    "SELECT name, mtime_ns, ctime_ns, size, completed_at FROM done_tasks")
+            }
+
+        seen = set()
+        changed = []
+        added = 0
+        if self.done_dir.is_dir():
+            with os.scandir(self.done_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith('.md') or not entry.is_file():
+                        continue
+                    try:
+                        stat = entry.stat()
+                        signature = (stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size)
+                        if entry.name in known and known[entry.name][0] == signature:
+                            seen.add(entry.name)
+                            continue
+                        # An edited task keeps the completion time it was first indexed with
+                        completed_at = known[entry.name][1] if entry.name in known else completed_time(stat)
+                        changed.append(self._row(entry.path, entry.name, stat, completed_at))
+                    except FileNotFoundError:
+                        continue    # removed while scanning; its row is dropped below
+                    seen.add(entry.name)
+                    if entry.name not in known:
+                        added += 1
+
+        removed = [name for name in known if name not in seen]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO done_tasks (name, mtime_ns, ctime_ns, size, completed_at, title, preview, "
+                "truncated) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", changed)
+            self._conn.executemany("DELETE FROM done_tasks WHERE name = ?", [(name,) for name in removed])
+
+        return {'added': added, 'updated': len(changed) - added, 'removed': len(removed)}
+
+    def _row(self, path, name, stat, completed_at):
+        with open(path, 'rb') as f:
+            head = f.read(READ_BYTES)
+        text = head.decode('utf-8', errors='ignore')
+        title = parse_title(text, Path(name).stem.replace('_', ' '))
+        truncated = stat.st_size > READ_BYTES or len(text) > PREVIEW_CHARS
+        return (name, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size, completed_at,
+                title, text[:PREVIEW_CHARS], int(truncated))
+
+    def completed_between(self, start, end, limit=None):
+        """Tasks completed from start through end (dates cover whole days), newest first"""
+        start_ts, end_ts = _day_start(start), _day_end(end)
+        query = ("SELECT name, title, preview, truncated, completed_at, size FROM done_tasks "
+                 "WHERE completed_at BETWEEN ? AND ? ORDER BY completed_at DESC")
+        params = [start_ts, end_ts]
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [_task(row) for row in rows]
+
+    def count_between(self, start, end):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM done_tasks WHERE completed_at BETWEEN ? AND ?",
+                (_day_start(start), _day_end(end))).fetchone()
+        return row[0]
+
+    def recent(self, limit=10):
+        """Most recently completed tasks"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, title, preview, truncated, completed_at, size FROM done_tasks "
+                "ORDER BY completed_at DESC LIMIT ?", (limit,)).fetchall()
+        return [_task(row) for row in rows]
+
+
+def _task(row):
+    name, title, preview, truncated, completed_at, size = row
+    return {
+        "filename": name,
+        "title": title,
+        "content": preview + "..." if truncated else preview,
+        "completed_at": datetime.fromtimestamp(completed_at).isoformat(timespec='seconds'),
+        "size": size
+    }
+
+
+def _day_start(value):
+    if isinstance(value, datetime):
+        value = value.date()
+    return datetime.combine(value, dt_time.min).timestamp()
+
+
+def _day_end(value):
+    if isinstance(value, datetime):
+        value = value.date()
+    return datetime.combine(value, dt_time.max).timestamp()
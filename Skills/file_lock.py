@@ -0,0 +1,140 @@
+"""
+Cross-Process File Locking for AI Employee Vault
+The scheduler, agent skill calls and the weekly audit run as separate
+processes and can update the same vault file at once. FileLock is an
+exclusive advisory lock (fcntl on POSIX, msvcrt on Windows) on a sidecar
+".lock" file, and atomic_write_text replaces a file in one rename, so a
+reader such as Obsidian sees either the old content or the new, never a
+truncated file.
+
+    with FileLock("Dashboard.md"):
+        atomic_write_text("Dashboard.md", content)
+"""
+import os
+import threading
+import time
+from pathlib import Path
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+DEFAULT_LOCK_TIMEOUT = 30
+
+
+class FileLockTimeout(Exception):
+    pass
+
+
+class FileLock:
+    """Exclusive lock on `path` shared by every process and thread using it"""
+
+    def __init__(self, path, timeout=DEFAULT_LOCK_TIMEOUT, poll_interval=0.01):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._fd = None
+        # flock is per open file, so threads in one process still need their own lock
+        self._thread_lock = _thread_lock(self.lock_path)
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        if not self._thread_lock.acquire(timeout=self.timeout):
+            raise FileLockTimeout(f"Timed out waiting for lock on {self.path}")
+
+        try:
+            fd = os.open(str(self.lock_path), os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError:
+            self._thread_lock.release()
+            raise
+
+        delay = self.poll_interval
+        while True:
+            try:
+                _lock(fd)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    self._thread_lock.release()
+                    raise FileLockTimeout(f"Timed out waiting for lock on {self.path}")
+                time.sleep(delay)
+                delay = min(delay * 2, 0.1)
+        self._fd = fd
+
+    def release(self):
+        fd, self._fd = self._fd, None
+        if fd is None:
+            return
+        try:
+            _unlock(fd)
+        finally:
+            os.close(fd)
+            self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def atomic_write_text(path, content, encoding='utf-8'):
+    """Write content to a temp file beside path, fsync it, then rename it over path"""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, 'w', encoding=encoding, newline='') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+
+    for attempt in range(5):
+        try:
+            os.replace(tmp_path, path)
+            return
+        except PermissionError:
+            # Windows refuses to replace a file another program has open; it is usually brief
+            if attempt == 4:
+                os.unlink(tmp_path)
+                raise
+            time.sleep(0.05 * (attempt + 1))
+
+
+def file_signature(path):
+    """Changes whenever the file is replaced or modified; None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f"{stat.st_ino}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+if os.name == 'nt':
+    def _lock(fd):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+
+    def _unlock(fd):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+else:
+    def _lock(fd):
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock(fd):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+
+def _thread_lock(lock_path):
+    key = str(lock_path.resolve())
+    with _thread_locks_guard:
+        if key not in _thread_locks:
+            _thread_locks[key] = threading.Lock()
+        return _thread_locks[key]
@@ -0,0 +1,189 @@
+"""
+Live Folder Counts for AI Employee Vault
+Keeps, for each workflow folder (Inbox, Needs_Action, Plans, Approvals and
+Done), the items in it with their arrival times: a count and a min-heap of
+arrival times, so the size of a folder and the age of its oldest item are
+read without listing the folder. Approvals are split into pending requests
+and APPROVED_ ones.
+
+A folder's own mtime changes whenever a file is added, removed or renamed in
+it, so that is the change event: status() stats each folder and rescans only
+those whose mtime moved. The index is saved to Data/folder_index.json, so a
+fresh process does not rescan folders that have not changed either.
+
+    index = get_folder_index()
+    index.status()['Needs_Action']   # {'count': 5, 'oldest': 1767000000.0, 'age_seconds': 86400.0}
+"""
+import heapq
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from Skills.done_index import completed_time
+
+FOLDERS = ('Inbox', 'Needs_Action', 'Plans', 'Approvals', 'Done')
+APPROVED_PREFIX = 'APPROVED_'
+# Recorded instead of an mtime for a folder that does not exist
+MISSING = -1
+# Directory mtimes this recent may hide a change made in the same clock tick
+MTIME_SETTLE_SECONDS = 2.0
+
+
+class _Bucket:
+    """Items of one kind in a folder, with a lazily pruned min-heap of arrival times"""
+
+    def __init__(self, items=None):
+        self.items = dict(items or {})     # name -> arrival timestamp
+        self.heap = [(arrived, name) for name, arrived in self.items.items()]
+        heapq.heapify(self.heap)
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, name, arrived):
+        self.items[name] = arrived
+        heapq.heappush(self.heap, (arrived, name))
+
+    def remove(self, name):
+        self.items.pop(name, None)
+        # Stale heap entries are dropped when they reach the top; rebuild if they pile up
+        if len(self.heap) > 2 * len(self.items) + 64:
+            self.heap = [(arrived, name) for name, arrived in self.items.items()]
+            heapq.heapify(self.heap)
+
+    def oldest(self):
+        while self.heap and self.items.get(self.heap[0][1]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else None
+
+
+class FolderIndex:
+    def __init__(self, vault_path=".", folders=FOLDERS, state_path="Data/folder_index.json"):
+        self.vault_path = Path(vault_path)
+        self.folders = tuple(folders)
+        self.state_path = Path(state_path)
+        self._lock = threading.Lock()
+        self._dir_mtimes = {}   # folder -> mtime_ns when last scanned (MISSING if absent), None to force a rescan
+        self._buckets = {}      # (folder, kind) -> _Bucket
+        self.scans = 0
+        self._load()
+
+    @staticmethod
+    def kind(folder, name):
+        if folder == 'Approvals':
+            return 'approved' if name.startswith(APPROVED_PREFIX) else 'pending'
+        return 'items'
+
+    @staticmethod
+    def label(folder, kind):
+        return folder if kind == 'items' else f"{folder} ({kind})"
+
+    def _kinds(self, folder):
+        return ('pending', 'approved') if folder == 'Approvals' else ('items',)
+
+    def _bucket(self, folder, kind):
+        if (folder, kind) not in self._buckets:
+            self._buckets[(folder, kind)] = _Bucket()
+        return self._buckets[(folder, kind)]
+
+    def _load(self):
+        if not self.state_path.exists():
+            return
+        try:
+            state = json.loads(self.state_path.read_text())
+        except (ValueError, OSError):
+            return
+        for folder, saved in state.get('folders', {}).items():
+            if folder not in self.folders:
+                continue
+            self._dir_mtimes[folder] = saved.get('dir_mtime_ns')
+            for kind, items in saved.get('items', {}).items():
+                self._buckets[(folder, kind)] = _Bucket(items)
+
+    def _save(self):
+        # Caller holds the lock
+        state = {'folders': {
+            folder: {
+                'dir_mtime_ns': self._dir_mtimes.get(folder),
+                'items': {kind: self._bucket(folder, kind).items for kind in self._kinds(folder)},
+            }
+            for folder in self.folders
+        }}
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(state))
+        os.replace(tmp_path, self.state_path)
+
+    def refresh(self):
+        """Rescan the folders whose mtime changed; returns the folders rescanned"""
+        with self._lock:
+            rescanned = [folder for folder in self.folders if self._refresh_folder(folder)]
+            if rescanned:
+                self._save()
+        return rescanned
+
+    def _refresh_folder(self, folder):
+        path = self.vault_path / folder
+        try:
+            dir_mtime_ns = path.stat().st_mtime_ns
+        except OSError:
+            dir_mtime_ns = MISSING
+        if self._dir_mtimes.get(folder) == dir_mtime_ns:
+            return False
+
+        present = {}
+        if dir_mtime_ns != MISSING:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.') or not entry.is_file():
+                        continue
+                    present[entry.name] = entry
+
+        for kind in self._kinds(folder):
+            bucket = self._bucket(folder, kind)
+            for name in [name for name in bucket.items if name not in present or self.kind(folder, name) != kind]:
+                bucket.remove(name)
+        for name, entry in present.items():
+            bucket = self._bucket(folder, self.kind(folder, name))
+            if name not in bucket.items:
+                try:
+                    bucket.add(name, completed_time(entry.stat()))
+                except OSError:
+                    continue    # removed while scanning; the folder mtime will move again
+
+        settled = dir_mtime_ns == MISSING or time.time() - dir_mtime_ns / 1e9 > MTIME_SETTLE_SECONDS
+        self._dir_mtimes[folder] = dir_mtime_ns if settled else None
+        self.scans += 1
+        return True
+
+    def status(self, now=None):
+        """{label: {'count', 'oldest', 'age_seconds'}} per folder; Approvals split into pending and approved"""
+        self.refresh()
+        now = now or time.time()
+        status = {}
+        with self._lock:
+            for folder in self.folders:
+                for kind in self._kinds(folder):
+                    bucket = self._bucket(folder, kind)
+                    oldest = bucket.oldest()
+                    status[self.label(folder, kind)] = {
+                        'count': len(bucket),
+                        'oldest': oldest,
+                        'age_seconds': max(now - oldest, 0.0) if oldest is not None else None,
+                    }
+        return status
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_folder_index(vault_path="."):
+    """Shared FolderIndex for a vault"""
+    key = str(Path(vault_path).resolve())
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = FolderIndex(vault_path, state_path=Path(vault_path) / "Data" / "folder_index.json")
+        return _indexes[key]
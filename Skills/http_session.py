@@ -0,0 +1,95 @@
+"""
+Shared HTTP Session for AI Employee Vault
+One requests.Session for the social media clients: per-host keep-alive
+connection pools, a default timeout on every request and transport-level
+retries, instead of a fresh TCP + TLS handshake per call.
+
+    http = get_http_session()
+    http.post("https://graph.facebook.com/v18.0/me/feed", params=params)
+"""
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) seconds, used when a call does not pass its own timeout
+DEFAULT_TIMEOUT = (
+    float(os.environ.get("HTTP_CONNECT_TIMEOUT", 5)),
+    float(os.environ.get("HTTP_READ_TIMEOUT", 30)),
+)
+DEFAULT_POOL_CONNECTIONS = 10  # hosts with a cached pool
+DEFAULT_POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", 10))  # keep-alive connections kept per host
+DEFAULT_RETRIES = int(os.environ.get("HTTP_RETRIES", 3))
+
+# Statuses worth retrying. urllib3 only retries these for idempotent methods,
+# so a POST is resent only when the connection failed before it was sent.
+# 429 is left to the caller: RateLimitScheduler.observe learns the quota from it
+# and paces later calls, where a transport retry would just hit the limit again.
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+class TimeoutSession(requests.Session):
+    """requests.Session that applies a default timeout to every request"""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def build_session(timeout=DEFAULT_TIMEOUT, pool_connections=DEFAULT_POOL_CONNECTIONS,
+                  pool_maxsize=DEFAULT_POOL_MAXSIZE, retries=DEFAULT_RETRIES, backoff_factor=0.5):
+    """
+    Args:
+        timeout: default (connect, read) timeout in seconds, or a single number
+        pool_connections: number of hosts whose connection pools are kept
+        pool_maxsize: keep-alive connections kept per host (match the worker count)
+        retries: retries for connection errors and RETRY_STATUSES; 0 disables them
+        backoff_factor: base of the exponential sleep between retries
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        # A Retry-After can ask for an hour; sleeping that long would hold the calling thread
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+
+    session = TimeoutSession(timeout)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """The process-wide session, created with the defaults on first use"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = build_session()
+        return _session
+
+
+def configure_http_session(**options):
+    """Replace the process-wide session with one built from build_session(**options)"""
+    global _session
+    session = build_session(**options)
+    with _session_lock:
+        old, _session = _session, session
+    if old is not None:
+        old.close()
+    return session
@@ -0,0 +1,228 @@
+"""
+Asynchronous Instagram Publishing for AI Employee Vault
+Instagram posts go out in two phases: create a media container, then publish
+it once Instagram has finished processing the image or video. The publisher
+runs both phases on background workers, polling container status with
+exponential backoff, so many posts can be in flight and callers get a
+handle back straight away.
+
+    handle = social.post_to_instagram_async(image_url, caption)
+    ...
+    post_id = handle.result(timeout=300)
+"""
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from Skills.rate_limiter import RateLimited
+
+# Container status_code values from the Graph API
+CONTAINER_READY = 'FINISHED'
+CONTAINER_FAILED = ('ERROR', 'EXPIRED')
+# Graph error code for "media is not ready to be published"
+MEDIA_NOT_READY_CODE = 9007
+
+
+class PublishHandle(Future):
+    """Future for one Instagram post; resolves to the published media id"""
+
+    def __init__(self, caption):
+        super().__init__()
+        self.caption = caption
+        self.status = 'queued'      # queued, processing, publishing, published, failed
+        self.container_id = None
+        self.polls = 0
+        self.submitted_at = time.monotonic()
+
+    def __repr__(self):
+        return f"<PublishHandle {self.status} container={self.container_id}>"
+
+
+class _Job:
+    def __init__(self, handle, params, deadline, delay):
+        self.handle = handle
+        self.params = params
+        self.deadline = deadline
+        self.delay = delay
+
+
+class InstagramPublisher:
+    def __init__(self, social, user_id='me', workers=4, poll_initial=1.0, poll_max=30.0, max_wait=600):
+        """
+        Args:
+            social: SocialMediaIntegration with the Instagram token set
+            user_id: Instagram business account id ('me' for the token's own account)
+            workers: Graph calls made at the same time
+            poll_initial: first delay between status checks, doubled after each check
+            poll_max: longest delay between status checks
+            max_wait: seconds a post may take before its handle fails
+        """
+        self.social = social
+        self.user_id = user_id
+        self.poll_initial = poll_initial
+        self.poll_max = poll_max
+        self.max_wait = max_wait
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="instagram")
+        self._due = []  # heap of (run_at, seq, job)
+        self._seq = itertools.count()
+        self._lock = threading.Condition()
+        self._in_flight = 0
+        self._stopped = False
+        self._timer = threading.Thread(target=self._run_due, name="instagram-poller", daemon=True)
+        self._timer.start()
+
+    def submit(self, image_url=None, caption='', video_url=None, media_type=None):
+        """Queue a post and return its PublishHandle; pass image_url, or video_url for reels"""
+        if not image_url and not video_url:
+            raise Exception("Instagram posts need an image_url or a video_url")
+
+        params = {'caption': caption}
+        if video_url:
+            params['video_url'] = video_url
+            params['media_type'] = media_type or 'REELS'
+        else:
+            params['image_url'] = image_url
+            if media_type:
+                params['media_type'] = media_type
+
+        handle = PublishHandle(caption)
+        job = _Job(handle, params, time.monotonic() + self.max_wait, self.poll_initial)
+        with self._lock:
+            if self._stopped:
+                raise Exception("Instagram publisher is stopped")
+            self._in_flight += 1
+        handle.add_done_callback(self._finished)
+        self._schedule(job, 0)
+        return handle
+
+    def pending(self):
+        """Posts submitted but not yet published or failed"""
+        with self._lock:
+            return self._in_flight
+
+    def stop(self, wait=True):
+        """Stop polling; posts still in flight fail"""
+        with self._lock:
+            self._stopped = True
+            jobs = [job for _, _, job in self._due]
+            self._due.clear()
+            self._lock.notify()
+        for job in jobs:
+            self._fail(job, "Instagram publisher stopped")
+        self._executor.shutdown(wait=wait)
+
+    def _finished(self, handle):
+        with self._lock:
+            self._in_flight -= 1
+
+    def _schedule(self, job, delay):
+        with self._lock:
+            if self._stopped:
+                stopped = True
+            else:
+                stopped = False
+                heapq.heappush(self._due, (time.monotonic() + delay, next(self._seq), job))
+                self._lock.notify()
+        if stopped:
+            self._fail(job, "Instagram publisher stopped")
+
+    def _run_due(self):
+        with self._lock:
+            while not self._stopped:
+                if not self._due:
+                    self._lock.wait()
+                    continue
+                wait = self._due[0][0] - time.monotonic()
+                if wait > 0:
+                    self._lock.wait(wait)
+                    continue
+                _, _, job = heapq.heappop(self._due)
+                self._executor.submit(self._step, job)
+
+    def _step(self, job):
+        handle = job.handle
+        try:
+            if handle.container_id is None:
+                self._create_container(job)
+            else:
+                self._poll(job)
+        except RateLimited as e:
+            self._retry_later(job, e.retry_after)
+        except Exception as e:
+            self._fail(job, str(e))
+
+    def _create_container(self, job):
+        response = self.social._graph_post('media', f"{self.social.graph_url}/{self.user_id}/media",
+                                           dict(job.params, access_token=self._token()))
+        if response.status_code != 200:
+            raise Exception(f"Instagram upload failed: {response.text}")
+        job.handle.container_id = response.json().get('id')
+        job.handle.status = 'processing'
+        # Images are usually ready at once, so check straight away
+        self._schedule(job, 0)
+
+    def _poll(self, job):
+        handle = job.handle
+        handle.polls += 1
+        response = self.social._graph_get('media_status', f"{self.social.graph_url}/{handle.container_id}",
+                                          {'fields': 'status_code,status', 'access_token': self._token()})
+        if response.status_code != 200:
+            raise Exception(f"Instagram status check failed: {response.text}")
+
+        body = response.json()
+        status_code = body.get('status_code')
+        if status_code == CONTAINER_READY:
+            self._publish(job)
+        elif status_code in CONTAINER_FAILED:
+            raise Exception(f"Instagram container {status_code}: {body.get('status', '')}".rstrip(': '))
+        else:
+            self._retry_later(job)
+
+    def _publish(self, job):
+        handle = job.handle
+        handle.status = 'publishing'
+        response = self.social._graph_post('media_publish', f"{self.social.graph_url}/{self.user_id}/media_publish",
+                                           {'creation_id': handle.container_id, 'access_token': self._token()})
+        if response.status_code == 200:
+            handle.status = 'published'
+            handle.set_result(response.json().get('id'))
+            return
+
+        error = _graph_error(response)
+        if error.get('code') == MEDIA_NOT_READY_CODE:
+            # Reported FINISHED a moment too early; keep polling
+            handle.status = 'processing'
+            self._retry_later(job)
+            return
+        raise Exception(f"Instagram publish failed: {response.text}")
+
+    def _retry_later(self, job, delay=None):
+        if delay is None:
+            delay = job.delay
+            job.delay = min(job.delay * 2, self.poll_max)
+        if time.monotonic() + delay > job.deadline:
+            self._fail(job, f"Instagram container not ready after {self.max_wait}s")
+            return
+        self._schedule(job, delay)
+
+    def _fail(self, job, message):
+        handle = job.handle
+        if not handle.done():
+            handle.status = 'failed'
+            handle.set_exception(Exception(message))
+
+    def _token(self):
+        token = self.social.instagram_access_token
+        if not token:
+            raise Exception("Instagram access token not set")
+        return token
+
+
+def _graph_error(response):
+    try:
+        return response.json().get('error', {}) or {}
+    except ValueError:
+        return {}
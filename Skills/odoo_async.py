@@ -0,0 +1,286 @@
+"""
+Asynchronous Odoo Client for AI Employee Vault
+Talks to Odoo's /jsonrpc endpoint over asyncio streams, so many lookups can
+be in flight at once. A semaphore bounds the concurrency, and that bound is
+also the size of the keep-alive connection pool.
+
+    async with AsyncOdooClient(url, db, user, password, max_concurrency=8) as odoo:
+        partners, balance = await asyncio.gather(
+            odoo.get_partners_info(ids), odoo.get_account_balance(account_id))
+"""
+import asyncio
+import itertools
+import json
+import ssl
+from urllib.parse import urlsplit
+
+from Skills.odoo_integration import (
+    ACCOUNT_FIELDS, CHUNK_SIZE, PARTNER_FIELDS, build_invoice_vals, chunked
+)
+from Skills.odoo_transport import is_read_method
+
+
+class OdooRPCError(Exception):
+    """Odoo answered a JSON-RPC call with an error"""
+
+    def __init__(self, message, code=None, data=None):
+        super().__init__(message)
+        self.code = code
+        self.data = data or {}
+
+
+class _Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self):
+        self.writer.close()
+
+
+class AsyncOdooClient:
+    def __init__(self, url, db, username, password, max_concurrency=8, timeout=30):
+        parts = urlsplit(url)
+        self.url = url
+        self.db = db
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.uid = None
+
+        self._host = parts.hostname
+        self._ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self._port = parts.port or (443 if self._ssl else 80)
+        self._path = parts.path.rstrip("/") + "/jsonrpc"
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._idle = []
+        self._ids = itertools.count(1)
+        self._auth_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.authenticate()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Close pooled connections"""
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+    async def authenticate(self):
+        """Log in once and remember the uid"""
+        async with self._auth_lock:
+            if self.uid is None:
+                uid = await self.call("common", "authenticate", self.db, self.username, self.password, {})
+                if not uid:
+                    raise Exception("Authentication failed")
+                self.uid = uid
+        return self.uid
+
+    async def execute_kw(self, model, method, args, kwargs=None):
+        """Call a model method through the object service"""
+        if self.uid is None:
+            await self.authenticate()
+        return await self.call(
+            "object", "execute_kw",
+            self.db, self.uid, self.password, model, method, args, kwargs or {}
+        )
+
+    async def call(self, service, method, *args):
+        """One JSON-RPC call; waits for a concurrency slot first"""
+        payload = {
+            "jsonrpc": "2.0",
+            "method": "call",
+            "params": {"service": service, "method": method, "args": list(args)},
+            "id": next(self._ids),
+        }
+        async with self._semaphore:
+            body = await asyncio.wait_for(
+                self._post(json.dumps(payload).encode("utf-8"), is_read_method(method, args)), self.timeout)
+
+        response = json.loads(body)
+        if response.get("error"):
+            error = response["error"]
+            data = error.get("data") or {}
+            raise OdooRPCError(data.get("message") or error.get("message", "Odoo RPC error"),
+                               code=error.get("code"), data=data)
+        return response.get("result")
+
+    # The same operations as OdooIntegration
+
+    async def create_invoice(self, partner_id, invoice_lines, date=None):
+        """Create an invoice in Odoo"""
+        return await self.execute_kw('account.move', 'create', [build_invoice_vals(partner_id, invoice_lines, date)])
+
+    async def create_invoices(self, invoices):
+        """Create many invoices; chunks are sent concurrently"""
+        vals_list = [build_invoice_vals(inv['partner_id'], inv['invoice_lines'], inv.get('date')) for inv in invoices]
+        return await self._create_many('account.move', vals_list)
+
+    async def search_partners(self, domain):
+        """Search for partners/customers in Odoo"""
+        return await self.execute_kw('res.partner', 'search', [domain])
+
+    async def get_partner_info(self, partner_id):
+        """Get detailed information about a partner"""
+        partner_data = await self.execute_kw('res.partner', 'read', [partner_id], {'fields': PARTNER_FIELDS})
+        return partner_data[0] if partner_data else None
+
+    async def get_partners_info(self, partner_ids):
+        """Get detailed information for many partners, in the order given"""
+        return await self.read('res.partner', partner_ids, PARTNER_FIELDS)
+
+    async def search_read(self, model, domain, fields=None, limit=None, offset=0, order=None):
+        """Fused search + read"""
+        kwargs = {'offset': offset}
+        if fields:
+            kwargs['fields'] = fields
+        if limit:
+            kwargs['limit'] = limit
+        if order:
+            kwargs['order'] = order
+        return await self.execute_kw(model, 'search_read', [domain], kwargs)
+
+    async def read(self, model, ids, fields=None):
+        """Read a list of records; chunks are fetched concurrently, results follow the order of ids"""
+        ids = list(ids)
+        kwargs = {'fields': fields} if fields else {}
+        chunks = await asyncio.gather(*(
+            self.execute_kw(model, 'read', [chunk], kwargs) for chunk in chunked(ids, CHUNK_SIZE)
+        ))
+        records = {record['id']: record for chunk in chunks for record in chunk}
+        return [records[record_id] for record_id in ids if record_id in records]
+
+    async def create_expense(self, expense_vals):
+        """Create an expense record in Odoo"""
+        return await self.execute_kw('hr.expense', 'create', [expense_vals])
+
+    async def create_expenses(self, expense_vals_list):
+        """Create many expense records; returns their ids"""
+        return await self._create_many('hr.expense', list(expense_vals_list))
+
+    async def get_account_balance(self, account_id):
+        """Get balance for a specific account"""
+        account_data = await self.execute_kw('account.account', 'read', [account_id], {'fields': ACCOUNT_FIELDS})
+        return account_data[0] if account_data else None
+
+    async def get_account_balances(self, account_ids):
+        """Balances for several accounts, looked up concurrently"""
+        return await asyncio.gather(*(self.get_account_balance(account_id) for account_id in account_ids))
+
+    async def generate_report(self, report_name, data):
+        """Generate a report in Odoo"""
+        return await self.execute_kw('ir.actions.report', 'render', [report_name, data])
+
+    async def _create_many(self, model, vals_list):
+        created = await asyncio.gather(*(
+            self.execute_kw(model, 'create', [chunk]) for chunk in chunked(vals_list, CHUNK_SIZE)
+        ))
+        ids = []
+        for chunk_ids in created:
+            ids.extend(chunk_ids if isinstance(chunk_ids, list) else [chunk_ids])
+        return ids
+
+    # Minimal HTTP/1.1 keep-alive client
+
+    async def _post(self, body, read_only=False):
+        """
+        Send one request. A pooled connection the server had already closed is
+        retried once on a fresh one, but only if the request never went out or
+        only reads; a write may have been applied before the connection dropped.
+        """
+        connection, reused = await self._checkout()
+        sent = False
+        try:
+            await self._send(connection, body)
+            sent = True
+            status, headers, response_body = await self._receive(connection)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            connection.close()
+            if not reused or (sent and not read_only):
+                raise
+            connection = await self._connect()
+            try:
+                status, headers, response_body = await self._round_trip(connection, body)
+            except BaseException:
+                connection.close()
+                raise
+        except BaseException:
+            connection.close()
+            raise
+
+        if headers.get("connection", "").lower() == "close":
+            connection.close()
+        else:
+            self._idle.append(connection)
+
+        if status != 200:
+            raise OdooRPCError(f"HTTP {status} from {self.url}", code=status)
+        return response_body
+
+    async def _checkout(self):
+        """(connection, reused): an idle pooled connection if one is still open, else a new one"""
+        while self._idle:
+            connection = self._idle.pop()
+            if not connection.reader.at_eof():
+                return connection, True
+            connection.close()
+        return await self._connect(), False
+
+    async def _connect(self):
+        reader, writer = await asyncio.open_connection(self._host, self._port, ssl=self._ssl)
+        return _Connection(reader, writer)
+
+    async def _round_trip(self, connection, body):
+        await self._send(connection, body)
+        return await self._receive(connection)
+
+    async def _send(self, connection, body):
+        request = (
+            f"POST {self._path} HTTP/1.1\r\n"
+            f"Host: {self._host}:{self._port}\r\n"
+            "Content-Type: application/json\r\n"
+            "Accept: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: keep-alive\r\n"
+            "\r\n"
+        ).encode("latin-1") + body
+        connection.writer.write(request)
+        await connection.writer.drain()
+
+    async def _receive(self, connection):
+        reader = connection.reader
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by Odoo")
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            return status, headers, b"".join(chunks)
+
+        if "content-length" in headers:
+            return status, headers, await reader.readexactly(int(headers["content-length"]))
+
+        headers["connection"] = "close"
+        return status, headers, await reader.read()
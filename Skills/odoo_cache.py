@@ -0,0 +1,142 @@
+"""
+Read-through Cache for Odoo lookups
+Keeps recently read records per model with a TTL and an LRU size bound, and
+counts hits and misses so the hit rate can be checked.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+# Seconds a cached record stays fresh, per model. Balances move with every
+# posted entry, so they expire much sooner than partner details.
+MODEL_TTLS = {
+    'res.partner': 900,
+    'account.account': 60,
+}
+DEFAULT_TTL = 300
+DEFAULT_MAX_ENTRIES = 2000
+
+
+class TTLCache:
+    """LRU cache whose entries also expire after ttl seconds"""
+
+    def __init__(self, ttl, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+
+class OdooReadCache:
+    """One TTLCache per Odoo model"""
+
+    def __init__(self, model_ttls=None, max_entries=DEFAULT_MAX_ENTRIES, enabled=True):
+        self.model_ttls = dict(MODEL_TTLS, **(model_ttls or {}))
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._caches = {}
+        self._lock = threading.Lock()
+
+    def for_model(self, model):
+        with self._lock:
+            if model not in self._caches:
+                self._caches[model] = TTLCache(self.model_ttls.get(model, DEFAULT_TTL), self.max_entries)
+            return self._caches[model]
+
+    def get_or_load(self, model, key, loader, fresh=False):
+        """Return the cached record, or call loader() and cache its result"""
+        if not self.enabled:
+            return loader()
+
+        cache = self.for_model(model)
+        if not fresh:
+            value = cache.get(key)
+            if value is not None:
+                return value
+
+        value = loader()
+        if value is not None:
+            cache.set(key, value)
+        return value
+
+    def get_many_or_load(self, model, keys, loader, fresh=False):
+        """
+        Read-through for a list of keys: loader(missing_keys) must return a
+        dict of key -> record for the keys it could find. Results follow keys.
+        """
+        if not self.enabled:
+            found = loader(list(keys))
+            return [found[key] for key in keys if key in found]
+
+        cache = self.for_model(model)
+        found = {}
+        if not fresh:
+            for key in keys:
+                value = cache.get(key)
+                if value is not None:
+                    found[key] = value
+
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        if missing:
+            loaded = loader(missing)
+            for key, value in loaded.items():
+                cache.set(key, value)
+            found.update(loaded)
+
+        return [found[key] for key in keys if key in found]
+
+    def invalidate(self, model, keys=None):
+        """Drop some keys of a model, or the whole model when keys is None"""
+        cache = self.for_model(model)
+        if keys is None:
+            cache.clear()
+            return
+        for key in keys:
+            cache.invalidate(key)
+
+    def stats(self):
+        with self._lock:
+            caches = dict(self._caches)
+        return {model: cache.stats() for model, cache in caches.items()}
@@ -0,0 +1,205 @@
+"""
+In-process fake Odoo server
+Serves Odoo's /jsonrpc endpoint from in-memory records on an asyncio server,
+with an optional per-request latency, for exercising AsyncOdooClient in tests
+and benchmarks without a real Odoo instance.
+
+    server = FakeOdooServer(latency=0.02)
+    server.seed('res.partner', [{'name': 'Client A', 'email': 'a@example.com'}])
+    await server.start()
+    client = AsyncOdooClient(server.url, 'fake', 'admin', 'admin')
+"""
+import asyncio
+import json
+import operator
+from datetime import datetime
+
+OPERATORS = {
+    '=': operator.eq,
+    '!=': operator.ne,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    'in': lambda value, options: value in options,
+    'not in': lambda value, options: value not in options,
+    'ilike': lambda value, text: str(text).lower() in str(value or '').lower(),
+}
+
+
+def matches(record, domain):
+    """Evaluate an Odoo domain (prefix '&', '|', '!' with implicit AND) against a record"""
+    stack = []
+    for term in reversed(domain):
+        if term == '&':
+            stack.append(stack.pop() & stack.pop())
+        elif term == '|':
+            stack.append(stack.pop() | stack.pop())
+        elif term == '!':
+            stack.append(not stack.pop())
+        else:
+            field, op, value = term
+            stack.append(bool(OPERATORS[op](record.get(field), value)))
+    return all(stack)
+
+
+class FakeOdooServer:
+    def __init__(self, db='fake', username='admin', password='admin', uid=2, latency=0.0, host='127.0.0.1'):
+        self.db = db
+        self.username = username
+        self.password = password
+        self.uid = uid
+        self.latency = latency
+        self.host = host
+        self.port = None
+        self.records = {}       # model -> {id: record}
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._server = None
+        self._connections = {}  # writer -> handler task
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def seed(self, model, records):
+        """Add records to a model; returns their new ids"""
+        return [self._create(model, dict(record)) for record in records]
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            # Close idle keep-alive connections so their handlers see EOF and finish
+            handlers = list(self._connections.values())
+            for writer in list(self._connections):
+                writer.close()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    async def _handle_connection(self, reader, writer):
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                response = await self._dispatch(json.loads(body or b"{}"))
+                payload = json.dumps(response, default=str).encode("utf-8")
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: application/json\r\n"
+                    + f"Content-Length: {len(payload)}\r\n\r\n".encode("latin-1")
+                    + payload
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    async def _dispatch(self, request):
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            params = request.get("params", {})
+            result = self._call(params.get("service"), params.get("method"), params.get("args", []))
+            return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+        except Exception as e:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": {
+                "code": 200, "message": "Odoo Server Error",
+                "data": {"name": type(e).__name__, "message": str(e)}
+            }}
+        finally:
+            self.in_flight -= 1
+
+    def _call(self, service, method, args):
+        if service == "common" and method in ("authenticate", "login"):
+            db, login, password = args[:3]
+            return self.uid if (db, login, password) == (self.db, self.username, self.password) else False
+        if service == "common" and method == "version":
+            return {"server_version": "fake"}
+        if service == "object" and method == "execute_kw":
+            db, uid, password, model, model_method, model_args = args[:6]
+            kwargs = args[6] if len(args) > 6 else {}
+            if uid != self.uid or password != self.password:
+                raise PermissionError("Access Denied")
+            return self._execute(model, model_method, model_args, kwargs)
+        raise ValueError(f"Unsupported call {service}.{method}")
+
+    def _execute(self, model, method, args, kwargs):
+        table = self.records.setdefault(model, {})
+
+        if method == 'create':
+            vals = args[0]
+            if isinstance(vals, list):
+                return [self._create(model, dict(v)) for v in vals]
+            return self._create(model, dict(vals))
+
+        if method == 'read':
+            ids = args[0] if isinstance(args[0], list) else [args[0]]
+            return [self._project(table[i], kwargs.get('fields')) for i in ids if i in table]
+
+        if method in ('search', 'search_read', 'search_count'):
+            found = [r for r in table.values() if matches(r, args[0] if args else [])]
+            # "write_date asc, id asc": stable sorts applied from the last key to the first
+            for clause in reversed((kwargs.get('order') or '').split(',')):
+                if clause.strip():
+                    field, _, direction = clause.strip().partition(' ')
+                    found.sort(key=lambda r: (r.get(field) is None, r.get(field)),
+                               reverse=direction.strip().lower() == 'desc')
+            if method == 'search_count':
+                return len(found)
+            offset = kwargs.get('offset', 0)
+            limit = kwargs.get('limit')
+            found = found[offset:offset + limit if limit else None]
+            if method == 'search':
+                return [r['id'] for r in found]
+            return [self._project(r, kwargs.get('fields')) for r in found]
+
+        if method == 'write':
+            ids, vals = args
+            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            for i in ids:
+                table[i].update(vals, write_date=now)
+            return True
+
+        raise ValueError(f"Unsupported method {model}.{method}")
+
+    def _create(self, model, vals):
+        table = self.records.setdefault(model, {})
+        record_id = vals.get('id') or max(table, default=0) + 1
+        vals['id'] = record_id
+        vals.setdefault('write_date', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        table[record_id] = vals
+        return record_id
+
+    def _project(self, record, fields):
+        if not fields:
+            return dict(record)
+        return {'id': record['id'], **{f: record.get(f, False) for f in fields}}
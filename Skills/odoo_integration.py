@@ -4,90 +4,256 @@ Implements Gold Tier requirement for accounting system integration
 """
 import xmlrpc.client
 import json
+import threading
 from datetime import datetime
 from pathlib import Path
 
+from Skills.odoo_cache import OdooReadCache
+from Skills.odoo_transport import PooledTransport, make_server_proxy
+
+# Largest id/value list sent in a single read or create call
+CHUNK_SIZE = 500
+
+PARTNER_FIELDS = ['name', 'email', 'phone', 'street', 'city', 'country_id']
+ACCOUNT_FIELDS = ['name', 'current_balance']
+
+# Odoo's XML-RPC fault code for odoo.exceptions.AccessDenied (older versions only name it in faultString)
+ACCESS_DENIED_FAULT_CODE = 3
+
+
+def is_auth_failure(fault):
+    """True when Odoo rejected the uid/password rather than the call itself"""
+    return fault.faultCode == ACCESS_DENIED_FAULT_CODE or any(
+        marker in str(fault.faultString) for marker in ('AccessDenied', 'Access Denied')
+    )
+
+
+class OdooSession:
+    """
+    Connection state shared by every OdooIntegration for one (url, db, user):
+    the pooled transport, the endpoint proxies and the uid. Authentication is
+    deferred until the first call and repeated only after an auth failure.
+    """
+
+    def __init__(self, url, db, username, pool_size=8, timeout=30):
+        self.url = url
+        self.db = db
+        self.username = username
+        self.uid = None
+        self._lock = threading.Lock()
+
+        # One pooled keep-alive transport shared by both endpoints; safe to use from worker threads
+        self.transport = PooledTransport(pool_size=pool_size, timeout=timeout, use_https=url.startswith("https://"))
+        self.common = make_server_proxy(f'{url}/xmlrpc/2/common', transport=self.transport)
+        self.models = make_server_proxy(f'{url}/xmlrpc/2/object', transport=self.transport)
+
+    def get_uid(self, password):
+        """The cached uid, authenticating first if there is none yet"""
+        uid = self.uid
+        if uid is not None:
+            return uid
+        with self._lock:
+            if self.uid is None:
+                uid = self.common.authenticate(self.db, self.username, password, {})
+                if not uid:
+                    raise Exception("Authentication failed")
+                self.uid = uid
+            return self.uid
+
+    def invalidate(self, stale_uid):
+        """Forget the uid after Odoo rejected it, unless another caller already replaced it"""
+        with self._lock:
+            if self.uid == stale_uid:
+                self.uid = None
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_odoo_session(url, db, username, pool_size=8, timeout=30):
+    """The process-wide session for (url, db, username); created on first request, without any network call"""
+    key = (url.rstrip('/'), db, username)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _sessions[key] = OdooSession(key[0], db, username, pool_size, timeout)
+        return session
+
+
+def clear_odoo_sessions():
+    """Drop every cached session and close its pooled connections"""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.transport.close()
+
+
 class OdooIntegration:
-    def __init__(self, url, db, username, password):
+    def __init__(self, url, db, username, password, pool_size=8, timeout=30, cache=None):
+        """
+        No request is made here: instances for the same (url, db, username)
+        share one session from the process-wide registry, which logs in on
+        the first call. pool_size and timeout apply when that session is created.
+        """
         self.url = url
         self.db = db
         self.username = username
         self.password = password
 
-        # Authenticate and get uid
-        common = xmlrpc.client.ServerProxy(f'{self.url}/xmlrpc/2/common')
-        self.uid = common.authenticate(self.db, self.username, self.password, {})
+        # Read-through cache for partner and account lookups; cache.enabled = False bypasses it
+        self.cache = cache if cache is not None else OdooReadCache()
+
+        self.session = get_odoo_session(url, db, username, pool_size, timeout)
+        self.transport = self.session.transport
+        self.models = self.session.models
 
-        if not self.uid:
-            raise Exception("Authentication failed")
+    @property
+    def uid(self):
+        return self.session.get_uid(self.password)
 
-        self.models = xmlrpc.client.ServerProxy(f'{self.url}/xmlrpc/2/object')
+    def close(self):
+        """Close idle pooled connections to the Odoo server; new ones are opened as needed"""
+        self.transport.close()
+
+    def execute_kw(self, model, method, args, kwargs=None):
+        """Call a model method through the object endpoint, logging in again once if the uid was rejected"""
+        uid = self.uid
+        try:
+            return self.models.execute_kw(self.db, uid, self.password, model, method, args, kwargs or {})
+        except xmlrpc.client.Fault as e:
+            if not is_auth_failure(e):
+                raise
+            self.session.invalidate(uid)
+            return self.models.execute_kw(self.db, self.uid, self.password, model, method, args, kwargs or {})
 
     def create_invoice(self, partner_id, invoice_lines, date=None):
         """Create an invoice in Odoo"""
-        if date is None:
-            date = datetime.now().strftime('%Y-%m-%d')
-
-        invoice_vals = {
-            'partner_id': partner_id,
-            'move_type': 'out_invoice',
-            'invoice_date': date,
-            'invoice_line_ids': [(0, 0, line) for line in invoice_lines]
-        }
-
-        invoice_id = self.models.execute_kw(
-            self.db, self.uid, self.password,
-            'account.move', 'create',
-            [invoice_vals]
-        )
-
+        invoice_vals = build_invoice_vals(partner_id, invoice_lines, date)
+        invoice_id = self.execute_kw('account.move', 'create', [invoice_vals])
+        self._invalidate_after_invoices([partner_id])
         return invoice_id
 
+    def create_invoices(self, invoices):
+        """
+        Create many invoices with one create call per chunk
+
+        Args:
+            invoices: list of dicts with partner_id, invoice_lines and optional date
+        Returns:
+            list of new invoice ids, in the same order
+        """
+        invoices = list(invoices)
+        vals_list = [
+            build_invoice_vals(inv['partner_id'], inv['invoice_lines'], inv.get('date'))
+            for inv in invoices
+        ]
+        invoice_ids = self._create_many('account.move', vals_list)
+        self._invalidate_after_invoices([inv['partner_id'] for inv in invoices])
+        return invoice_ids
+
     def search_partners(self, domain):
         """Search for partners/customers in Odoo"""
-        partner_ids = self.models.execute_kw(
-            self.db, self.uid, self.password,
-            'res.partner', 'search',
-            [domain]
-        )
+        partner_ids = self.execute_kw('res.partner', 'search', [domain])
         return partner_ids
 
-    def get_partner_info(self, partner_id):
-        """Get detailed information about a partner"""
-        partner_data = self.models.execute_kw(
-            self.db, self.uid, self.password,
-            'res.partner', 'read',
-            [partner_id], {'fields': ['name', 'email', 'phone', 'street', 'city', 'country_id']}
-        )
-        return partner_data[0] if partner_data else None
+    def get_partner_info(self, partner_id, fresh=False):
+        """Get detailed information about a partner (fresh=True skips the cache)"""
+        def load():
+            partner_data = self.execute_kw('res.partner', 'read', [partner_id], {'fields': PARTNER_FIELDS})
+            return partner_data[0] if partner_data else None
+        return self.cache.get_or_load('res.partner', partner_id, load, fresh=fresh)
+
+    def get_partners_info(self, partner_ids, fresh=False):
+        """Get detailed information for many partners, in the order given; only uncached ids are read"""
+        def load(missing_ids):
+            return {record['id']: record for record in self.read('res.partner', missing_ids, PARTNER_FIELDS)}
+        return self.cache.get_many_or_load('res.partner', list(partner_ids), load, fresh=fresh)
+
+    def search_partners_info(self, domain, limit=None, order=None):
+        """Search partners and return their details in one round-trip"""
+        return self.search_read('res.partner', domain, PARTNER_FIELDS, limit=limit, order=order)
+
+    def search_read(self, model, domain, fields=None, limit=None, offset=0, order=None):
+        """Fused search + read: matching records with only the requested fields"""
+        kwargs = {'offset': offset}
+        if fields:
+            kwargs['fields'] = fields
+        if limit:
+            kwargs['limit'] = limit
+        if order:
+            kwargs['order'] = order
+        return self.execute_kw(model, 'search_read', [domain], kwargs)
+
+    def read(self, model, ids, fields=None):
+        """Read a list of records, chunking very long id lists; results follow the order of ids"""
+        ids = list(ids)
+        kwargs = {'fields': fields} if fields else {}
+        records = {}
+        for chunk in chunked(ids, CHUNK_SIZE):
+            for record in self.execute_kw(model, 'read', [chunk], kwargs):
+                records[record['id']] = record
+        return [records[record_id] for record_id in ids if record_id in records]
 
     def create_expense(self, expense_vals):
         """Create an expense record in Odoo"""
-        expense_id = self.models.execute_kw(
-            self.db, self.uid, self.password,
-            'hr.expense', 'create',
-            [expense_vals]
-        )
+        expense_id = self.execute_kw('hr.expense', 'create', [expense_vals])
+        self.cache.invalidate('account.account')
         return expense_id
 
-    def get_account_balance(self, account_id):
-        """Get balance for a specific account"""
-        account_data = self.models.execute_kw(
-            self.db, self.uid, self.password,
-            'account.account', 'read',
-            [account_id], {'fields': ['name', 'current_balance']}
-        )
-        return account_data[0] if account_data else None
+    def create_expenses(self, expense_vals_list):
+        """Create many expense records with one create call per chunk; returns their ids"""
+        expense_ids = self._create_many('hr.expense', list(expense_vals_list))
+        self.cache.invalidate('account.account')
+        return expense_ids
+
+    def get_account_balance(self, account_id, fresh=False):
+        """Get balance for a specific account (fresh=True always asks Odoo)"""
+        def load():
+            account_data = self.execute_kw('account.account', 'read', [account_id], {'fields': ACCOUNT_FIELDS})
+            return account_data[0] if account_data else None
+        return self.cache.get_or_load('account.account', account_id, load, fresh=fresh)
+
+    def cache_stats(self):
+        """Hit/miss counters for the read-through cache, per model"""
+        return self.cache.stats()
 
     def generate_report(self, report_name, data):
         """Generate a report in Odoo"""
-        report = self.models.execute_kw(
-            self.db, self.uid, self.password,
-            'ir.actions.report', 'render',
-            [report_name, data]
-        )
+        report = self.execute_kw('ir.actions.report', 'render', [report_name, data])
         return report
 
+    def _invalidate_after_invoices(self, partner_ids):
+        # New invoices change partner totals and move account balances
+        self.cache.invalidate('res.partner', set(partner_ids))
+        self.cache.invalidate('account.account')
+
+    def _create_many(self, model, vals_list):
+        # Odoo's create accepts a list of value dicts and returns the new ids in order
+        ids = []
+        for chunk in chunked(vals_list, CHUNK_SIZE):
+            created = self.execute_kw(model, 'create', [chunk])
+            ids.extend(created if isinstance(created, list) else [created])
+        return ids
+
+def build_invoice_vals(partner_id, invoice_lines, date=None):
+    """Values for a customer invoice (account.move) with its lines"""
+    if date is None:
+        date = datetime.now().strftime('%Y-%m-%d')
+
+    return {
+        'partner_id': partner_id,
+        'move_type': 'out_invoice',
+        'invoice_date': date,
+        'invoice_line_ids': [(0, 0, line) for line in invoice_lines]
+    }
+
+def chunked(items, size):
+    """Split a list into consecutive slices of at most size items"""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
 def create_odoo_mcp_server():
     """Create an MCP server for Odoo integration"""
     # This would typically be implemented as a separate MCP server
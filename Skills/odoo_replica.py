@@ -0,0 +1,203 @@
+"""
+Local Replica of Odoo Accounting Data for AI Employee Vault
+Pulls customer invoices (account.move) and payments (account.payment) that
+changed since the last sync into an indexed SQLite file, so revenue figures
+for briefings come from local queries instead of live Odoo calls.
+
+Each model keeps a (write_date, id) cursor; a sync asks Odoo only for
+records written after it and advances it batch by batch.
+"""
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+REVENUE_MOVE_TYPES = ('out_invoice', 'out_refund')
+
+# model -> (local table, fields to pull, base domain)
+SYNCED_MODELS = {
+    'account.move': (
+        'moves',
+        ['name', 'move_type', 'state', 'partner_id', 'invoice_date', 'amount_total_signed',
+         'amount_residual', 'payment_state', 'write_date'],
+        [('move_type', 'in', list(REVENUE_MOVE_TYPES))],
+    ),
+    'account.payment': (
+        'payments',
+        ['name', 'payment_type', 'state', 'partner_id', 'date', 'amount', 'write_date'],
+        [],
+    ),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS moves (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    move_type TEXT,
+    state TEXT,
+    partner_id INTEGER,
+    invoice_date TEXT,
+    amount_total_signed REAL,
+    amount_residual REAL,
+    payment_state TEXT,
+    write_date TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_moves_revenue ON moves (state, move_type, invoice_date);
+CREATE INDEX IF NOT EXISTS idx_moves_partner ON moves (partner_id);
+
+CREATE TABLE IF NOT EXISTS payments (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    payment_type TEXT,
+    state TEXT,
+    partner_id INTEGER,
+    date TEXT,
+    amount REAL,
+    write_date TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_payments_date ON payments (payment_type, state, date);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    model TEXT PRIMARY KEY,
+    cursor_write_date TEXT NOT NULL,
+    cursor_id INTEGER NOT NULL,
+    last_sync TEXT
+);
+"""
+
+EPOCH = '1970-01-01 00:00:00'
+
+
+def _many2one_id(value):
+    # Odoo returns many2one fields as [id, display_name], or False when empty
+    if isinstance(value, (list, tuple)):
+        return value[0] if value else None
+    return value or None
+
+
+def _date_str(value):
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.isoformat() if isinstance(value, date) else value
+
+
+class OdooAccountingReplica:
+    def __init__(self, odoo=None, db_path="Data/odoo_replica.db", batch_size=500):
+        """
+        Args:
+            odoo: an OdooIntegration (or anything with search_read); only needed for sync()
+            db_path: SQLite file holding the replica
+            batch_size: records fetched per search_read while syncing
+        """
+        self.odoo = odoo
+        self.db_path = Path(db_path)
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def sync(self):
+        """Pull records changed since the last sync; returns {model: records pulled}"""
+        if self.odoo is None:
+            raise Exception("No Odoo connection to sync from")
+        return {model: self._sync_model(model) for model in SYNCED_MODELS}
+
+    def _sync_model(self, model):
+        table, fields, base_domain = SYNCED_MODELS[model]
+        cursor_date, cursor_id = self._cursor(model)
+        pulled = 0
+
+        while True:
+            # Keyset pagination on (write_date, id), so records sharing a write_date are not skipped
+            domain = base_domain + [
+                '|', ('write_date', '>', cursor_date),
+                '&', ('write_date', '=', cursor_date), ('id', '>', cursor_id),
+            ]
+            records = self.odoo.search_read(model, domain, fields, limit=self.batch_size, order='write_date asc, id asc')
+            if not records:
+                break
+
+            rows = [self._row(model, record) for record in records]
+            last = records[-1]
+            cursor_date, cursor_id = str(last['write_date']), last['id']
+
+            with self._lock, self._conn:
+                if table == 'moves':
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO moves (id, name, move_type, state, partner_id, invoice_date, "
+                        "amount_total_signed, amount_residual, payment_state, write_date) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                else:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO payments (id, name, payment_type, state, partner_id, date, "
+                        "amount, write_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sync_state (model, cursor_write_date, cursor_id, last_sync) "
+                    "VALUES (?, ?, ?, ?)", (model, cursor_date, cursor_id, datetime.now().isoformat()))
+
+            pulled += len(records)
+            if len(records) < self.batch_size:
+                break
+
+        return pulled
+
+    def _row(self, model, r):
+        if model == 'account.move':
+            return (r['id'], r.get('name'), r.get('move_type'), r.get('state'), _many2one_id(r.get('partner_id')),
+                    _date_str(r.get('invoice_date')) or None, r.get('amount_total_signed') or 0.0,
+                    r.get('amount_residual') or 0.0, r.get('payment_state'), str(r.get('write_date')))
+        return (r['id'], r.get('name'), r.get('payment_type'), r.get('state'), _many2one_id(r.get('partner_id')),
+                _date_str(r.get('date')) or None, r.get('amount') or 0.0, str(r.get('write_date')))
+
+    def _cursor(self, model):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cursor_write_date, cursor_id FROM sync_state WHERE model = ?", (model,)).fetchone()
+        return (row['cursor_write_date'], row['cursor_id']) if row else (EPOCH, 0)
+
+    def last_sync(self):
+        """When each model was last synced"""
+        with self._lock:
+            rows = self._conn.execute("SELECT model, last_sync FROM sync_state").fetchall()
+        return {row['model']: row['last_sync'] for row in rows}
+
+    def revenue_between(self, start_date, end_date):
+        """Net invoiced revenue (posted invoices minus refunds) with invoice_date in [start, end]"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(SUM(amount_total_signed), 0) FROM moves "
+                "WHERE state = 'posted' AND move_type IN (?, ?) AND invoice_date BETWEEN ? AND ?",
+                (*REVENUE_MOVE_TYPES, _date_str(start_date), _date_str(end_date))).fetchone()
+        return float(row[0])
+
+    def payments_received_between(self, start_date, end_date):
+        """Cash received from customers with a payment date in [start, end]"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(SUM(amount), 0) FROM payments "
+                "WHERE payment_type = 'inbound' AND state NOT IN ('draft', 'cancel', 'canceled') "
+                "AND date BETWEEN ? AND ?",
+                (_date_str(start_date), _date_str(end_date))).fetchone()
+        return float(row[0])
+
+    def week_to_date(self, today=None):
+        """Revenue from Monday of this week up to today"""
+        today = _as_date(today)
+        return self.revenue_between(today - timedelta(days=today.weekday()), today)
+
+    def month_to_date(self, today=None):
+        """Revenue from the 1st of this month up to today"""
+        today = _as_date(today)
+        return self.revenue_between(today.replace(day=1), today)
+
+
+def _as_date(value):
+    if value is None:
+        return date.today()
+    return value.date() if isinstance(value, datetime) else value
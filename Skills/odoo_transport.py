@@ -0,0 +1,179 @@
+"""
+Pooled XML-RPC Transport for Odoo
+Keeps persistent HTTP/1.1 connections to the Odoo server and hands them out
+from a thread-safe pool, so one ServerProxy can be shared by worker threads
+without paying a TCP (and TLS) handshake per call.
+"""
+import http.client
+import queue
+import threading
+import xmlrpc.client
+
+# Errors that mean a pooled keep-alive connection went stale before we got a response
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    ConnectionAbortedError,
+    BrokenPipeError,
+)
+# Calls that can safely be sent twice. A stale connection that drops after the
+# request went out may still have run it, so only these are resent then.
+READ_METHODS = frozenset({
+    'version', 'login', 'authenticate',
+    'search', 'search_read', 'search_count', 'read', 'read_group',
+    'name_search', 'name_get', 'fields_get', 'check_access_rights',
+})
+
+
+class PoolTimeout(Exception):
+    """No pooled connection became free in time"""
+    pass
+
+
+class PooledTransport(xmlrpc.client.Transport):
+    def __init__(self, pool_size=8, timeout=30, pool_timeout=60, use_https=False,
+                 ssl_context=None, max_retries=1, use_datetime=False, use_builtin_types=False):
+        """
+        Args:
+            pool_size: maximum open connections per host (match the worker count)
+            timeout: socket timeout in seconds for connect and each response
+            pool_timeout: seconds to wait for a free connection before PoolTimeout
+            use_https: open HTTPS connections (use make_server_proxy to pick this from the URL)
+            max_retries: times to reconnect and resend after a stale connection; a call
+                that may have reached the server is only resent for READ_METHODS
+        """
+        super().__init__(use_datetime=use_datetime, use_builtin_types=use_builtin_types)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.pool_timeout = pool_timeout
+        self.use_https = use_https
+        self.ssl_context = ssl_context
+        self.max_retries = max_retries
+
+        self._pools = {}  # host -> (idle LifoQueue, BoundedSemaphore of open slots)
+        self._pools_lock = threading.Lock()
+
+    def request(self, host, handler, request_body, verbose=False):
+        for attempt in range(self.max_retries + 1):
+            connection = self._checkout(host)
+            # Only a kept-alive socket can have gone stale; errors on a fresh one are real
+            reused = connection.sock is not None
+            sent = False
+            try:
+                self._send(connection, host, handler, request_body, verbose)
+                sent = True
+                response = connection.getresponse()
+            except STALE_CONNECTION_ERRORS:
+                self._discard(host, connection)
+                if (attempt == self.max_retries or not reused
+                        or (sent and not is_read_call(request_body))):
+                    raise
+                continue
+            except BaseException:
+                self._discard(host, connection)
+                raise
+
+            try:
+                if response.status != 200:
+                    # Drain so the connection can be reused, then report like the stock transport
+                    response.read()
+                    raise xmlrpc.client.ProtocolError(
+                        host + handler, response.status, response.reason, dict(response.getheaders()))
+                self.verbose = verbose
+                result = self.parse_response(response)
+            except BaseException:
+                self._discard(host, connection)
+                raise
+
+            if response.will_close:
+                self._discard(host, connection)
+            else:
+                self._checkin(host, connection)
+            return result
+
+    def make_connection(self, host):
+        chost, _, _ = self.get_host_info(host)
+        if self.use_https:
+            return http.client.HTTPSConnection(chost, timeout=self.timeout, context=self.ssl_context)
+        return http.client.HTTPConnection(chost, timeout=self.timeout)
+
+    def _send(self, connection, host, handler, request_body, verbose):
+        # Same request as Transport.send_request, but on a connection we already hold.
+        # Extra headers are worked out per call rather than stored on self, to stay thread-safe.
+        _, extra_headers, _ = self.get_host_info(host)
+        headers = list(self._headers) + list(extra_headers or [])
+        if verbose:
+            connection.set_debuglevel(1)
+        connection.putrequest("POST", handler, skip_accept_encoding=True)
+        headers.append(("Accept-Encoding", "gzip"))
+        headers.append(("Content-Type", "text/xml"))
+        headers.append(("User-Agent", self.user_agent))
+        self.send_headers(connection, headers)
+        self.send_content(connection, request_body)
+
+    def close(self):
+        """Close every idle pooled connection"""
+        with self._pools_lock:
+            pools = list(self._pools.values())
+        for idle, _ in pools:
+            while True:
+                try:
+                    connection = idle.get_nowait()
+                except queue.Empty:
+                    break
+                connection.close()
+
+    def _pool(self, host):
+        with self._pools_lock:
+            if host not in self._pools:
+                self._pools[host] = (queue.LifoQueue(), threading.BoundedSemaphore(self.pool_size))
+            return self._pools[host]
+
+    def _checkout(self, host):
+        idle, slots = self._pool(host)
+        if not slots.acquire(timeout=self.pool_timeout):
+            raise PoolTimeout(f"No free connection to {host} after {self.pool_timeout}s")
+        try:
+            # Most recently used first: it is the least likely to have been closed by the server
+            return idle.get_nowait()
+        except queue.Empty:
+            try:
+                return self.make_connection(host)
+            except BaseException:
+                slots.release()
+                raise
+
+    def _checkin(self, host, connection):
+        idle, slots = self._pool(host)
+        idle.put(connection)
+        slots.release()
+
+    def _discard(self, host, connection):
+        _, slots = self._pool(host)
+        connection.close()
+        slots.release()
+
+
+def is_read_call(request_body):
+    """True when an XML-RPC request only reads, so resending it is harmless"""
+    try:
+        params, method = xmlrpc.client.loads(request_body)
+    except Exception:
+        return False
+    return is_read_method(method, params)
+
+
+def is_read_method(method, params):
+    """True when a service method called with params only reads"""
+    if method in ('execute', 'execute_kw'):
+        # (db, uid, password, model, method, ...)
+        method = params[4] if len(params) > 4 else None
+    return method in READ_METHODS
+
+
+def make_server_proxy(url, transport=None, **transport_options):
+    """ServerProxy for url backed by a PooledTransport (HTTPS picked from the URL)"""
+    if transport is None:
+        transport = PooledTransport(use_https=url.startswith("https://"), **transport_options)
+    return xmlrpc.client.ServerProxy(url, transport=transport)
@@ -8,6 +8,8 @@ from pathlib import Path
 import json
 from datetime import datetime
 
+from Skills.vault_metadata import get_vault_metadata
+
 class RalphWiggumLoop:
     def __init__(self, max_iterations=10):
         self.max_iterations = max_iterations
@@ -40,6 +42,7 @@ class RalphWiggumLoop:
                     "claude",
                     "--prompt",
                     f"Continue working on this task: {initial_prompt}. Current state: {state_file.read_text()}. Continue working until complete."
+                    + self._goals_context()
                 ], capture_output=True, text=True, timeout=300)  # 5 minute timeout
 
                 if result.returncode != 0:
@@ -71,6 +74,15 @@ class RalphWiggumLoop:
 
         return state_file
 
+    def _goals_context(self):
+        """Current targets and deadlines from Business_Goals.md for the prompt; re-parsed only when the file changes"""
+        try:
+            goals = get_vault_metadata().business_goals().summary()
+        except Exception as e:
+            print(f"Error reading business goals: {e}")
+            return ""
+        return f"\n\nBusiness goals:\n{goals}" if goals else ""
+
     def _check_task_completion(self):
         """
         Check if task is complete by looking for movement to Done/ folder
@@ -102,6 +114,7 @@ class RalphWiggumLoop:
                     "claude",
                     "--prompt",
                     f"Continue working on this task: {state_file.read_text()}. Check your output to see if you've printed the promise yet."
+                    + self._goals_context()
                 ], capture_output=True, text=True, timeout=300)
 
                 # Check if the promise was fulfilled in the output
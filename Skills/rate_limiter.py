@@ -0,0 +1,305 @@
+"""
+Rate-limit-aware Request Scheduler for AI Employee Vault
+Keeps a token bucket per (platform, endpoint) and hands out send slots ahead
+of time, so bursts are spaced out instead of running into 429s. Graph API
+endpoints share one bucket, as Meta counts them against one quota. Buckets start
+from DEFAULT_LIMITS and then follow what the APIs report:
+
+- Twitter/X: x-rate-limit-limit, x-rate-limit-remaining, x-rate-limit-reset
+- Meta Graph: x-app-usage and x-business-use-case-usage (percent of quota used)
+- any 429: Retry-After
+
+    limiter = get_rate_limiter()
+    limiter.acquire('twitter', 'tweets').result()   # blocks until the slot
+    response = http.post(...)
+    limiter.observe('twitter', 'tweets', response)
+"""
+import heapq
+import itertools
+import json
+import threading
+import time
+from concurrent.futures import Future
+
+from Skills.error_recovery import TransientError
+
+# (platform, endpoint) -> (requests, per seconds); endpoint None is the platform default
+DEFAULT_LIMITS = {
+    ('twitter', 'tweets'): (100, 900),        # POST /2/tweets, per user per 15 minutes
+    ('twitter', 'user_tweets'): (900, 900),   # GET /2/users/:id/tweets
+    ('twitter', None): (300, 900),
+    ('graph', None): (200, 3600),             # Graph API, per user per hour
+}
+FALLBACK_LIMIT = (60, 60)
+# Platforms whose quota is per user across all endpoints: endpoints without
+# a limit of their own draw from the one (platform, None) bucket
+SHARED_QUOTA_PLATFORMS = {'graph'}
+
+# Share of the reported remaining quota that may go out in a burst; the rest
+# is spread evenly until the window resets
+BURST_FRACTION = 0.2
+
+# Meta usage (percent) above which Graph calls are slowed down, and the pause
+# once it reaches 100 when Meta does not say how long access is blocked
+GRAPH_SLOWDOWN_USAGE = 75
+GRAPH_BLOCK_SECONDS = 300
+
+DEFAULT_MAX_WAIT = 60
+
+
+class RateLimited(TransientError):
+    """The next slot for an endpoint is further away than the caller will wait"""
+
+    def __init__(self, platform, endpoint, retry_after):
+        super().__init__(f"{platform}/{endpoint} rate limited, next slot in {retry_after:.0f}s")
+        self.platform = platform
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Token bucket whose tokens may go negative: each reservation past zero queues behind the previous one"""
+
+    def __init__(self, capacity, period):
+        self.capacity = capacity
+        self.period = period
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        # updated lies in the future while the bucket is blocked
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def reserve(self, now):
+        """Take a token; returns the seconds until it may be used"""
+        self._refill(now)
+        self.tokens -= 1
+        wait = max(0.0, self.updated - now)
+        if self.tokens < 0:
+            wait += -self.tokens / self.rate
+        return wait
+
+    def release(self):
+        """Give back a token that was reserved but will not be used"""
+        self.tokens += 1
+
+    def learn_window(self, limit, remaining, reset_in, now):
+        """Follow a fixed-window quota: `remaining` calls allowed in the next `reset_in` seconds"""
+        self._refill(now)
+        reset_in = max(reset_in, 1.0)
+        self.capacity = max(limit, 1)
+        if remaining <= 0:
+            self.block(reset_in, now)
+            self.rate = self.capacity * (1 - BURST_FRACTION) / self.period
+            return
+        # Burst at most a fifth of what is left and pace the rest, so the window is never overrun
+        self.tokens = min(self.tokens, remaining * BURST_FRACTION)
+        self.rate = max(remaining * (1 - BURST_FRACTION), 1) / reset_in
+
+    def learn_usage(self, usage_percent, now):
+        """Follow a percent-of-quota-used report (Meta); slows down past GRAPH_SLOWDOWN_USAGE"""
+        self._refill(now)
+        base_rate = self.capacity / self.period
+        headroom = max(0.0, 100 - usage_percent) / (100 - GRAPH_SLOWDOWN_USAGE)
+        self.rate = base_rate * min(1.0, max(headroom, 0.05))
+        self.tokens = min(self.tokens, self.capacity * max(0.0, 100 - usage_percent) / 100)
+
+    def block(self, seconds, now):
+        """No tokens until now + seconds"""
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+        self.updated = max(self.updated, now + seconds)
+
+
+class RateLimitScheduler:
+    def __init__(self, limits=None, max_wait=DEFAULT_MAX_WAIT, enabled=True):
+        """
+        Args:
+            limits: overrides for DEFAULT_LIMITS, {(platform, endpoint): (requests, per_seconds)}
+            max_wait: seconds wait() blocks at most before raising RateLimited
+            enabled: False hands out every slot immediately and ignores headers
+        """
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.max_wait = max_wait
+        self.enabled = enabled
+        self.throttled = 0    # slots that had to wait
+        self.rejected = 0     # 429 responses seen
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+        # Pending slots: heap of (ready_at, seq, future, waited)
+        self._pending = []
+        self._seq = itertools.count()
+        self._wakeup = threading.Condition(self._lock)
+        self._timer = None
+
+    def _bucket(self, platform, endpoint):
+        key = (platform, endpoint)
+        if platform in SHARED_QUOTA_PLATFORMS and key not in self.limits:
+            key = (platform, None)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            capacity, period = self.limits.get(key) or self.limits.get((platform, None)) or FALLBACK_LIMIT
+            bucket = self._buckets[key] = TokenBucket(capacity, period)
+        return bucket
+
+    def acquire(self, platform, endpoint, max_wait=None):
+        """
+        Reserve the next slot; returns a Future that resolves (to the seconds
+        waited) when the request may be sent. Raises RateLimited instead when
+        the slot is more than max_wait seconds away.
+
+        Futures are resolved without the scheduler lock held, so their done
+        callbacks may call back into the scheduler.
+        """
+        future = Future()
+        if not self.enabled:
+            future.set_result(0.0)
+            return future
+
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._bucket(platform, endpoint)
+            wait = bucket.reserve(now)
+            if max_wait is not None and wait > max_wait:
+                bucket.release()
+                raise RateLimited(platform, endpoint, wait)
+            ready = wait <= 0
+            if not ready:
+                self._schedule(future, now, wait)
+        if ready:
+            future.set_result(0.0)
+        return future
+
+    def _schedule(self, future, now, wait):
+        # Caller holds self._lock
+        self.throttled += 1
+        heapq.heappush(self._pending, (now + wait, next(self._seq), future, wait))
+        if self._timer is None:
+            self._timer = threading.Thread(target=self._release_due, name="rate-limiter", daemon=True)
+            self._timer.start()
+        self._wakeup.notify()
+
+    def wait(self, platform, endpoint, max_wait=None):
+        """Block until a slot is free; returns the seconds waited"""
+        max_wait = self.max_wait if max_wait is None else max_wait
+        return self.acquire(platform, endpoint, max_wait).result()
+
+    def _release_due(self):
+        while True:
+            due = []
+            with self._lock:
+                while not due:
+                    if not self._pending:
+                        self._wakeup.wait()
+                        continue
+                    now = time.monotonic()
+                    delay = self._pending[0][0] - now
+                    if delay > 0:
+                        self._wakeup.wait(delay)
+                        continue
+                    while self._pending and self._pending[0][0] <= now:
+                        due.append(heapq.heappop(self._pending))
+            # Resolve outside the lock: done callbacks run inline and may call acquire() or stats()
+            for _, _, future, waited in due:
+                future.set_result(waited)
+
+    def observe(self, platform, endpoint, response):
+        """Update the buckets from a response's status and rate-limit headers"""
+        if not self.enabled:
+            return
+
+        headers = response.headers
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._bucket(platform, endpoint)
+
+            if 'x-rate-limit-remaining' in headers:
+                try:
+                    limit = int(headers.get('x-rate-limit-limit', bucket.capacity))
+                    remaining = int(headers['x-rate-limit-remaining'])
+                    reset_in = float(headers.get('x-rate-limit-reset', 0)) - time.time()
+                except ValueError:
+                    pass
+                else:
+                    bucket.learn_window(limit, remaining, reset_in if reset_in > 0 else bucket.period, now)
+
+            usage, regain_minutes = _graph_usage(headers)
+            if usage is not None:
+                # App usage counts against every Graph endpoint of the platform
+                buckets = [b for (p, _), b in self._buckets.items() if p == platform]
+                for b in buckets:
+                    if usage >= 100:
+                        b.block(regain_minutes * 60 if regain_minutes else GRAPH_BLOCK_SECONDS, now)
+                    else:
+                        b.learn_usage(usage, now)
+
+            if response.status_code == 429:
+                self.rejected += 1
+                retry_after = _retry_after(headers)
+                if retry_after is not None:
+                    bucket.block(retry_after, now)
+                elif 'x-rate-limit-remaining' not in headers and usage is None:
+                    bucket.block(bucket.period / bucket.capacity, now)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "throttled": self.throttled,
+                "rejected": self.rejected,
+                "pending": len(self._pending),
+                "buckets": {
+                    f"{platform}/{endpoint}": {"tokens": round(b.tokens, 2), "per_second": round(b.rate, 4)}
+                    for (platform, endpoint), b in self._buckets.items()
+                }
+            }
+
+
+def _retry_after(headers):
+    value = headers.get('retry-after')
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+def _graph_usage(headers):
+    """Highest percent used across Meta's usage headers, and minutes until access is regained"""
+    usage = None
+    regain = 0
+    for name in ('x-app-usage', 'x-business-use-case-usage', 'x-ad-account-usage'):
+        raw = headers.get(name)
+        if not raw:
+            continue
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            continue
+        # x-business-use-case-usage maps business ids to lists of usage objects
+        reports = [data] if name != 'x-business-use-case-usage' else [
+            entry for entries in data.values() for entry in entries
+        ]
+        for report in reports:
+            for key in ('call_count', 'total_time', 'total_cputime', 'acc_id_util_pct'):
+                if isinstance(report.get(key), (int, float)):
+                    usage = max(usage or 0, report[key])
+            regain = max(regain, report.get('estimated_time_to_regain_access') or 0)
+    return usage, regain
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """The process-wide scheduler, shared by every social media client"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimitScheduler()
+        return _limiter
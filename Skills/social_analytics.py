@@ -0,0 +1,497 @@
+"""
+Social Media Analytics for AI Employee Vault
+Pulls post and insight metrics from Facebook, Instagram and Twitter/X into a
+local SQLite time series, one value per (platform, metric, day). Each sync
+only asks for what changed since the previous one (plus a short lookback,
+because recent days keep collecting likes and impressions).
+
+Summaries are read from an in-memory cache of prefix sums per metric, so a
+rolling N-day total is one subtraction. The cache is rebuilt after every
+sync; start() syncs and rebuilds on a schedule.
+
+    analytics = SocialAnalytics(facebook=social, page_id='123', twitter=twitter, twitter_user_id='42')
+    analytics.sync()
+    analytics.summary('twitter', days=7)
+"""
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from Skills.social_media_integration import send_rate_limited
+
+# Days pulled on the first sync, and days re-pulled on later ones
+INITIAL_DAYS = 90
+LOOKBACK_DAYS = 2
+# Graph insights accept at most about a month per request
+INSIGHTS_CHUNK_DAYS = 30
+DEFAULT_REFRESH_INTERVAL = 3600
+
+FACEBOOK_INSIGHTS = {
+    'page_impressions': 'impressions',
+    'page_impressions_unique': 'reach',
+    'page_post_engagements': 'engagements',
+}
+INSTAGRAM_INSIGHTS = {
+    'impressions': 'impressions',
+    'reach': 'reach',
+    'profile_views': 'profile_views',
+}
+# Daily metrics derived from the posts table, attributed to the day a post went out
+POST_METRICS = {
+    'posts': 'COUNT(*)',
+    'likes': 'SUM(likes)',
+    'comments': 'SUM(comments)',
+    'shares': 'SUM(shares)',
+    'post_impressions': 'SUM(impressions)',
+}
+# Metrics that are a level (latest value wins) rather than a daily count
+GAUGES = {'followers'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_metrics (
+    platform TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    day TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (platform, metric, day)
+);
+
+CREATE TABLE IF NOT EXISTS posts (
+    platform TEXT NOT NULL,
+    post_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    created_at TEXT,
+    text TEXT,
+    likes INTEGER DEFAULT 0,
+    comments INTEGER DEFAULT 0,
+    shares INTEGER DEFAULT 0,
+    impressions INTEGER DEFAULT 0,
+    PRIMARY KEY (platform, post_id)
+);
+CREATE INDEX IF NOT EXISTS idx_posts_day ON posts (platform, day);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    platform TEXT PRIMARY KEY,
+    synced_through TEXT NOT NULL,
+    last_sync TEXT
+);
+"""
+
+
+class MetricSeries:
+    """Daily values of one metric held as prefix sums, for O(1) window totals"""
+
+    def __init__(self, start, values):
+        """
+        Args:
+            start: date of values[0]
+            values: one value per consecutive day
+        """
+        self.start = start
+        self.prefix = [0.0]
+        for value in values:
+            self.prefix.append(self.prefix[-1] + value)
+        self.values = list(values)
+
+    @property
+    def end(self):
+        return self.start + timedelta(days=len(self.values) - 1)
+
+    def _index(self, day):
+        return (day - self.start).days
+
+    def window_sum(self, end, days):
+        """Total of the `days` days ending on `end` (inclusive)"""
+        hi = min(self._index(end), len(self.values) - 1) + 1
+        lo = max(self._index(end) - days + 1, 0)
+        if hi <= lo:
+            return 0.0
+        return self.prefix[hi] - self.prefix[lo]
+
+    def latest(self, end):
+        """Most recent value on or before `end`, for gauges such as followers"""
+        i = min(self._index(end), len(self.values) - 1)
+        return self.values[i] if i >= 0 else 0.0
+
+
+class SocialMetricsStore:
+    def __init__(self, db_path="Data/social_metrics.db"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def synced_through(self, platform):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT synced_through FROM sync_state WHERE platform = ?", (platform,)).fetchone()
+        return date.fromisoformat(row[0]) if row else None
+
+    def last_sync(self):
+        with self._lock:
+            return dict(self._conn.execute("SELECT platform, last_sync FROM sync_state").fetchall())
+
+    def save(self, platform, daily_rows, posts, synced_through):
+        """
+        Upsert (metric, day, value) rows and post records, recompute the
+        post-derived daily metrics for the days touched, and move the cursor.
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO daily_metrics (platform, metric, day, value) VALUES (?, ?, ?, ?)",
+                [(platform, metric, day, value) for metric, day, value in daily_rows])
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO posts (platform, post_id, day, created_at, text, likes, comments, shares, "
+                "impressions) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(platform, p['post_id'], p['day'], p['created_at'], p.get('text'), p.get('likes', 0),
+                  p.get('comments', 0), p.get('shares', 0), p.get('impressions', 0)) for p in posts])
+
+            days = sorted({p['day'] for p in posts})
+            if days:
+                for metric, aggregate in POST_METRICS.items():
+                    self._conn.execute(
+                        f"INSERT OR REPLACE INTO daily_metrics (platform, metric, day, value) "
+                        f"SELECT platform, ?, day, {aggregate} FROM posts "
+                        f"WHERE platform = ? AND day BETWEEN ? AND ? GROUP BY day",
+                        (metric, platform, days[0], days[-1]))
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (platform, synced_through, last_sync) VALUES (?, ?, ?)",
+                (platform, synced_through.isoformat(), datetime.now().isoformat()))
+
+    def load_series(self, today=None):
+        """{platform: {metric: MetricSeries}} covering each metric's first day through today"""
+        today = today or date.today()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT platform, metric, day, value FROM daily_metrics ORDER BY platform, metric, day").fetchall()
+
+        grouped = {}
+        for platform, metric, day, value in rows:
+            grouped.setdefault((platform, metric), []).append((date.fromisoformat(day), value))
+
+        series = {}
+        for (platform, metric), points in grouped.items():
+            start = points[0][0]
+            end = max(today, points[-1][0])
+            values = [0.0] * ((end - start).days + 1)
+            for day, value in points:
+                values[(day - start).days] = value
+            if metric in GAUGES:
+                # Carry the last known level over days without a reading
+                for i in range(1, len(values)):
+                    values[i] = values[i] or values[i - 1]
+            series.setdefault(platform, {})[metric] = MetricSeries(start, values)
+        return series
+
+    def top_posts(self, platform, start_day, end_day, limit=3):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT post_id, day, text, likes, comments, shares, impressions FROM posts "
+                "WHERE platform = ? AND day BETWEEN ? AND ? "
+                "ORDER BY likes + comments + shares DESC LIMIT ?",
+                (platform, start_day.isoformat(), end_day.isoformat(), limit)).fetchall()
+        return [
+            {'post_id': r[0], 'day': r[1], 'text': (r[2] or '')[:100], 'likes': r[3], 'comments': r[4],
+             'shares': r[5], 'impressions': r[6]}
+            for r in rows
+        ]
+
+
+class SocialAnalytics:
+    def __init__(self, store=None, facebook=None, page_id=None, instagram_user_id=None,
+                 twitter=None, twitter_user_id=None, refresh_interval=DEFAULT_REFRESH_INTERVAL):
+        """
+        Args:
+            store: SocialMetricsStore; defaults to Data/social_metrics.db
+            facebook: SocialMediaIntegration with tokens set (used for Facebook and Instagram)
+            page_id: Facebook page to collect; skipped when None
+            instagram_user_id: Instagram business account to collect; skipped when None
+            twitter: TwitterIntegration; skipped when None or without twitter_user_id
+            refresh_interval: seconds between scheduled syncs once start() is called
+        """
+        self.store = store or SocialMetricsStore()
+        self.facebook = facebook
+        self.page_id = page_id
+        self.instagram_user_id = instagram_user_id
+        self.twitter = twitter
+        self.twitter_user_id = twitter_user_id
+        self.refresh_interval = refresh_interval
+
+        self._series = None
+        self._series_day = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def platforms(self):
+        configured = []
+        if self.facebook is not None and self.page_id:
+            configured.append('facebook')
+        if self.facebook is not None and self.instagram_user_id:
+            configured.append('instagram')
+        if self.twitter is not None and self.twitter_user_id:
+            configured.append('twitter')
+        return configured
+
+    # Syncing
+
+    def sync(self, today=None):
+        """Pull new metrics for every configured platform; returns {platform: rows stored or error}"""
+        today = today or date.today()
+        results = {}
+        for platform in self.platforms():
+            since = self.store.synced_through(platform)
+            since = today - timedelta(days=INITIAL_DAYS) if since is None else since - timedelta(days=LOOKBACK_DAYS)
+            try:
+                daily_rows, posts = getattr(self, f'_collect_{platform}')(since, today)
+            except Exception as e:
+                # One platform being down should not stop the others from syncing
+                results[platform] = f"error: {e}"
+                continue
+            self.store.save(platform, daily_rows, posts, today)
+            results[platform] = len(daily_rows) + len(posts)
+        self.refresh(today)
+        return results
+
+    def refresh(self, today=None):
+        """Rebuild the in-memory prefix sums from the store"""
+        today = today or date.today()
+        series = self.store.load_series(today)
+        with self._lock:
+            self._series = series
+            self._series_day = today
+
+    def start(self, interval=None):
+        """Sync now and then every refresh_interval seconds on a background thread"""
+        if self._thread is not None:
+            return
+        interval = interval or self.refresh_interval
+        self._stop.clear()
+
+        def loop():
+            while True:
+                try:
+                    self.sync()
+                except Exception as e:
+                    print(f"Social analytics sync failed: {e}")
+                if self._stop.wait(interval):
+                    break
+
+        self._thread = threading.Thread(target=loop, name="social-analytics", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _collect_facebook(self, since, until):
+        social = self.facebook
+        token = social.facebook_access_token
+        daily = self._graph_insights(self.page_id, FACEBOOK_INSIGHTS, token, since, until)
+
+        posts = []
+        for post in self._graph_pages(f"{social.graph_url}/{self.page_id}/posts", {
+            'fields': 'id,message,created_time,shares,comments.summary(true).limit(0),'
+                      'reactions.summary(true).limit(0)',
+            'since': since.isoformat(),
+            'limit': 100,
+            'access_token': token,
+        }):
+            created = _parse_time(post['created_time'])
+            posts.append({
+                'post_id': post['id'],
+                'day': created.date().isoformat(),
+                'created_at': created.isoformat(),
+                'text': post.get('message'),
+                'likes': post.get('reactions', {}).get('summary', {}).get('total_count', 0),
+                'comments': post.get('comments', {}).get('summary', {}).get('total_count', 0),
+                'shares': post.get('shares', {}).get('count', 0),
+            })
+        return daily, posts
+
+    def _collect_instagram(self, since, until):
+        social = self.facebook
+        token = social.instagram_access_token
+        daily = self._graph_insights(self.instagram_user_id, INSTAGRAM_INSIGHTS, token, since, until)
+
+        account = self._graph_get(f"{social.graph_url}/{self.instagram_user_id}",
+                                  {'fields': 'followers_count', 'access_token': token})
+        if 'followers_count' in account:
+            daily.append(('followers', until.isoformat(), account['followers_count']))
+
+        posts = []
+        for media in self._graph_pages(f"{social.graph_url}/{self.instagram_user_id}/media", {
+            'fields': 'id,caption,timestamp,like_count,comments_count',
+            'since': since.isoformat(),
+            'limit': 100,
+            'access_token': token,
+        }):
+            created = _parse_time(media['timestamp'])
+            if created.date() < since:
+                # Media come newest first, so everything after this is older too
+                break
+            posts.append({
+                'post_id': media['id'],
+                'day': created.date().isoformat(),
+                'created_at': created.isoformat(),
+                'text': media.get('caption'),
+                'likes': media.get('like_count', 0),
+                'comments': media.get('comments_count', 0),
+            })
+        return daily, posts
+
+    def _collect_twitter(self, since, until):
+        twitter = self.twitter
+        url = f"{twitter.base_url}/users/{self.twitter_user_id}/tweets"
+        params = {
+            'start_time': f"{since.isoformat()}T00:00:00Z",
+            'max_results': 100,
+            'tweet.fields': 'created_at,public_metrics',
+        }
+        posts = []
+        while True:
+            response = send_rate_limited(twitter.http, twitter.rate_limiter, 'twitter', 'user_tweets', 'GET', url,
+                                         headers=twitter.authenticate_v2(), params=params)
+            if response.status_code != 200:
+                raise Exception(f"Get tweets failed: {response.text}")
+            body = response.json()
+            for tweet in body.get('data', []):
+                metrics = tweet.get('public_metrics', {})
+                created = _parse_time(tweet['created_at'])
+                posts.append({
+                    'post_id': tweet['id'],
+                    'day': created.date().isoformat(),
+                    'created_at': created.isoformat(),
+                    'text': tweet.get('text'),
+                    'likes': metrics.get('like_count', 0),
+                    'comments': metrics.get('reply_count', 0),
+                    'shares': metrics.get('retweet_count', 0) + metrics.get('quote_count', 0),
+                    'impressions': metrics.get('impression_count', 0),
+                })
+            next_token = body.get('meta', {}).get('next_token')
+            if not next_token:
+                return [], posts
+            params['pagination_token'] = next_token
+
+    def _graph_get(self, url, params):
+        social = self.facebook
+        response = send_rate_limited(social.http, social.rate_limiter, 'graph', 'insights', 'GET', url, params=params)
+        if response.status_code != 200:
+            raise Exception(f"Graph API request failed: {response.text}")
+        return response.json()
+
+    def _graph_pages(self, url, params):
+        """Follow Graph API paging.next links"""
+        body = self._graph_get(url, params)
+        while True:
+            yield from body.get('data', [])
+            next_url = body.get('paging', {}).get('next')
+            if not next_url:
+                return
+            body = self._graph_get(next_url, None)
+
+    def _graph_insights(self, object_id, metric_names, token, since, until):
+        rows = []
+        start = since
+        while start <= until:
+            end = min(start + timedelta(days=INSIGHTS_CHUNK_DAYS), until + timedelta(days=1))
+            body = self._graph_get(f"{self.facebook.graph_url}/{object_id}/insights", {
+                'metric': ','.join(metric_names),
+                'period': 'day',
+                'since': start.isoformat(),
+                'until': end.isoformat(),
+                'access_token': token,
+            })
+            for entry in body.get('data', []):
+                metric = metric_names.get(entry.get('name'))
+                if metric is None:
+                    continue
+                for point in entry.get('values', []):
+                    # end_time marks the end of the day the value belongs to
+                    day = (_parse_time(point['end_time']) - timedelta(days=1)).date()
+                    value = point.get('value')
+                    if isinstance(value, (int, float)):
+                        rows.append((metric, day.isoformat(), value))
+            start = end
+        return rows
+
+    # Summaries
+
+    def _metrics(self, platform, today):
+        with self._lock:
+            stale = self._series is None or self._series_day != today
+        if stale:
+            # First use, or the day rolled over: rebuild from the store without calling the APIs
+            self.refresh(today)
+        with self._lock:
+            return self._series.get(platform, {})
+
+    def totals(self, platform, days=7, today=None):
+        """{metric: total over the last `days` days}; gauges report their latest value"""
+        today = today or date.today()
+        return {
+            metric: (series.latest(today) if metric in GAUGES else series.window_sum(today, days))
+            for metric, series in self._metrics(platform, today).items()
+        }
+
+    def summary(self, platform, days=7, today=None):
+        """Summary in the same shape as the generate_<platform>_summary functions"""
+        today = today or date.today()
+        totals = self.totals(platform, days, today)
+        top_posts = self.store.top_posts(platform, today - timedelta(days=days - 1), today)
+        interactions = totals.get('likes', 0) + totals.get('comments', 0) + totals.get('shares', 0)
+
+        if platform == 'facebook':
+            engagements = totals.get('engagements') or interactions
+            return {
+                "period_days": days,
+                "engagement_rate": _rate(engagements, totals.get('impressions', 0)),
+                "reach": int(totals.get('reach', 0)),
+                "impressions": int(totals.get('impressions', 0)),
+                "top_posts": top_posts,
+                "comments_received": int(totals.get('comments', 0)),
+                "shares": int(totals.get('shares', 0))
+            }
+        if platform == 'instagram':
+            return {
+                "period_days": days,
+                "reach": int(totals.get('reach', 0)),
+                "impressions": int(totals.get('impressions', 0)),
+                "profile_views": int(totals.get('profile_views', 0)),
+                "followers": int(totals.get('followers', 0)),
+                "avg_engagement_rate": _rate(interactions, totals.get('reach', 0)),
+                "top_posts": top_posts
+            }
+        if platform == 'twitter':
+            impressions = totals.get('post_impressions', 0)
+            return {
+                "period_days": days,
+                "tweets_posted": int(totals.get('posts', 0)),
+                "likes_received": int(totals.get('likes', 0)),
+                "retweets": int(totals.get('shares', 0)),
+                "replies": int(totals.get('comments', 0)),
+                "impressions": int(impressions),
+                "engagement_rate": _rate(interactions, impressions)
+            }
+        raise Exception(f"Unknown platform: {platform}")
+
+
+def _rate(part, whole):
+    return f"{part / whole * 100:.1f}%" if whole else "0.0%"
+
+
+def _parse_time(value):
+    # Graph uses 2024-01-02T08:00:00+0000, Twitter 2024-01-02T08:00:00.000Z
+    value = value.replace('Z', '+00:00')
+    if len(value) > 5 and value[-5] in '+-' and value[-3] != ':':
+        value = value[:-2] + ':' + value[-2:]
+    parsed = datetime.fromisoformat(value)
+    return parsed.astimezone(timezone.utc) if parsed.tzinfo else parsed
@@ -2,15 +2,86 @@
 Social Media Integration for AI Employee Vault
 Implements Gold Tier requirement for Facebook and Instagram integration
 """
-import requests
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
+from Skills.http_session import get_http_session
+from Skills.instagram_publisher import InstagramPublisher
+from Skills.rate_limiter import get_rate_limiter
+
+GRAPH_API_URL = "https://graph.facebook.com/v18.0"
+TWITTER_API_URL = "https://api.twitter.com/2"
+
+PLATFORMS = ('facebook', 'instagram', 'twitter')
+
+
+def send_rate_limited(http, limiter, platform, endpoint, method, url, **kwargs):
+    """Wait for the endpoint's slot, send, and let the limiter learn from the response"""
+    limiter.wait(platform, endpoint)
+    response = http.request(method, url, **kwargs)
+    limiter.observe(platform, endpoint, response)
+    return response
+
+
+_log_lock = threading.Lock()
+
+_publish_executor = None
+_publish_executor_lock = threading.Lock()
+
+
+def get_publish_executor():
+    """Worker threads shared by every cross-platform publish"""
+    global _publish_executor
+    with _publish_executor_lock:
+        if _publish_executor is None:
+            _publish_executor = ThreadPoolExecutor(max_workers=len(PLATFORMS) * 2, thread_name_prefix="publish")
+        return _publish_executor
+
+
+def _timed(send):
+    # (post_id, error, seconds); errors are returned so one platform cannot fail the others
+    started = time.monotonic()
+    try:
+        return send(), None, time.monotonic() - started
+    except Exception as e:
+        return None, str(e), time.monotonic() - started
+
 class SocialMediaIntegration:
-    def __init__(self):
+    def __init__(self, session=None, graph_url=GRAPH_API_URL, rate_limiter=None, analytics=None):
+        """
+        Args:
+            session: requests.Session to send through; defaults to the shared pooled session
+            graph_url: Graph API base URL (point it at a mock server for tests and benchmarks)
+            rate_limiter: RateLimitScheduler; defaults to the shared one
+            analytics: SocialAnalytics backing the summaries; without it they return sample numbers
+        """
         self.facebook_access_token = None
         self.instagram_access_token = None
+        self.http = session or get_http_session()
+        self.graph_url = graph_url.rstrip('/')
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.twitter = None
+        self.analytics = analytics
+        self._instagram_publisher = None
+        self._instagram_publisher_lock = threading.Lock()
+
+    def _graph_post(self, endpoint, url, params):
+        return send_rate_limited(self.http, self.rate_limiter, 'graph', endpoint, 'POST', url, params=params)
+
+    def _graph_get(self, endpoint, url, params):
+        return send_rate_limited(self.http, self.rate_limiter, 'graph', endpoint, 'GET', url, params=params)
+
+    @property
+    def instagram_publisher(self):
+        """Background container publisher, started on first use"""
+        with self._instagram_publisher_lock:
+            if self._instagram_publisher is None:
+                self._instagram_publisher = InstagramPublisher(self)
+            return self._instagram_publisher
 
     def set_facebook_credentials(self, access_token):
         """Set Facebook access token"""
@@ -20,75 +91,158 @@ class SocialMediaIntegration:
         """Set Instagram access token"""
         self.instagram_access_token = access_token
 
+    def set_twitter_client(self, twitter):
+        """Attach a TwitterIntegration so publish() can include Twitter/X"""
+        self.twitter = twitter
+
     def post_to_facebook(self, message, page_id=None):
         """Post message to Facebook page or personal timeline"""
         if not self.facebook_access_token:
             raise Exception("Facebook access token not set")
 
-        url = f"https://graph.facebook.com/v18.0/me/feed"
-        if page_id:
-            url = f"https://graph.facebook.com/v18.0/{page_id}/feed"
-
-        params = {
-            'message': message,
-            'access_token': self.facebook_access_token
-        }
-
-        response = requests.post(url, params=params)
-
-        if response.status_code == 200:
-            post_id = response.json().get('id')
-            self.log_social_action('facebook_post', {'message': message, 'post_id': post_id}, 'success')
-            return post_id
-        else:
-            self.log_social_action('facebook_post', {'message': message}, 'failed', response.text)
-            raise Exception(f"Facebook post failed: {response.text}")
+        try:
+            post_id = self._send_facebook_post(message, page_id)
+        except Exception as e:
+            self.log_social_action('facebook_post', {'message': message}, 'failed', str(e))
+            raise
+        self.log_social_action('facebook_post', {'message': message, 'post_id': post_id}, 'success')
+        return post_id
 
     def post_to_instagram_basic(self, image_url, caption):
         """Post to Instagram using basic Graph API"""
         if not self.instagram_access_token:
             raise Exception("Instagram access token not set")
 
-        # First upload the image
-        url = "https://graph.facebook.com/v18.0/me/media"
+        try:
+            post_id = self._send_instagram_post(image_url, caption)
+        except Exception as e:
+            self.log_social_action('instagram_post', {'caption': caption}, 'failed', str(e))
+            raise
+        self.log_social_action('instagram_post', {'caption': caption, 'post_id': post_id}, 'success')
+        return post_id
+
+    def _send_facebook_post(self, message, page_id=None):
+        # Post without writing an audit entry; callers log the outcome
+        if not self.facebook_access_token:
+            raise Exception("Facebook access token not set")
+
+        url = f"{self.graph_url}/{page_id or 'me'}/feed"
         params = {
-            'image_url': image_url,
-            'caption': caption,
-            'access_token': self.instagram_access_token
+            'message': message,
+            'access_token': self.facebook_access_token
         }
 
-        response = requests.post(url, params=params)
+        response = self._graph_post('feed', url, params)
+        if response.status_code != 200:
+            raise Exception(f"Facebook post failed: {response.text}")
+        return response.json().get('id')
+
+    def post_to_instagram_async(self, image_url=None, caption='', video_url=None):
+        """
+        Queue an Instagram post and return a PublishHandle at once. The
+        container is created, polled until Instagram has processed it, and
+        published in the background; the outcome is logged when it finishes.
+        """
+        if not self.instagram_access_token:
+            raise Exception("Instagram access token not set")
 
-        if response.status_code == 200:
-            container_id = response.json().get('id')
+        handle = self.instagram_publisher.submit(image_url=image_url, caption=caption, video_url=video_url)
 
-            # Publish the container
-            publish_url = "https://graph.facebook.com/v18.0/me/media_publish"
-            publish_params = {
-                'creation_id': container_id,
-                'access_token': self.instagram_access_token
-            }
+        def log_outcome(done):
+            if done.exception() is None:
+                self.log_social_action('instagram_post', {'caption': caption, 'post_id': done.result()}, 'success')
+            else:
+                self.log_social_action('instagram_post', {'caption': caption}, 'failed', str(done.exception()))
 
-            publish_response = requests.post(publish_url, params=publish_params)
+        handle.add_done_callback(log_outcome)
+        return handle
 
-            if publish_response.status_code == 200:
-                post_id = publish_response.json().get('id')
-                self.log_social_action('instagram_post', {'caption': caption, 'post_id': post_id}, 'success')
-                return post_id
-            else:
-                self.log_social_action('instagram_post', {'caption': caption}, 'failed', publish_response.text)
-                raise Exception(f"Instagram publish failed: {publish_response.text}")
+    def _send_instagram_post(self, image_url, caption):
+        if not self.instagram_access_token:
+            raise Exception("Instagram access token not set")
+        if not image_url:
+            raise Exception("Instagram posts need an image_url")
+
+        # Create the container, wait until it is processed, then publish
+        return self.instagram_publisher.submit(image_url=image_url, caption=caption).result()
+
+    def publish_iter(self, message, platforms=PLATFORMS, image_url=None, page_id=None):
+        """
+        Post one announcement to several platforms at once and yield a result
+        per platform as each finishes. A failure on one platform does not hold
+        up the others; the whole fan-out is logged as one 'cross_post' entry.
+
+        Each result is {'platform', 'status': 'success' | 'failed', 'post_id', 'error', 'seconds'}.
+        Instagram uses the message as the caption of image_url.
+        """
+        senders = {
+            'facebook': lambda: self._send_facebook_post(message, page_id),
+            'instagram': lambda: self._send_instagram_post(image_url, message),
+            'twitter': lambda: self._send_tweet(message),
+        }
+        platforms = list(dict.fromkeys(platforms))
+        unknown = [platform for platform in platforms if platform not in senders]
+        if unknown:
+            raise Exception(f"Unknown platforms: {', '.join(unknown)}")
+
+        executor = get_publish_executor()
+        futures = {executor.submit(_timed, senders[platform]): platform for platform in platforms}
+        results = {}
+        try:
+            for future in as_completed(futures):
+                platform = futures[future]
+                post_id, error, seconds = future.result()
+                results[platform] = {
+                    'platform': platform,
+                    'status': 'failed' if error else 'success',
+                    'post_id': post_id,
+                    'error': error,
+                    'seconds': round(seconds, 3)
+                }
+                yield results[platform]
+        finally:
+            self._log_cross_post(message, platforms, results)
+
+    def publish(self, message, platforms=PLATFORMS, image_url=None, page_id=None):
+        """Post to several platforms concurrently; returns {platform: result} once all have finished"""
+        results = {result['platform']: result
+                   for result in self.publish_iter(message, platforms, image_url, page_id)}
+        return {platform: results[platform] for platform in dict.fromkeys(platforms)}
+
+    def _send_tweet(self, text):
+        if self.twitter is None:
+            raise Exception("Twitter client not set")
+        return self.twitter._send_tweet(text)
+
+    def _log_cross_post(self, message, platforms, results):
+        failed = [platform for platform, result in results.items() if result['status'] == 'failed']
+        # Platforms still missing here were abandoned by a caller that stopped iterating
+        missing = [platform for platform in platforms if platform not in results]
+        if not failed and not missing:
+            result = 'success'
+        elif len(failed) + len(missing) == len(platforms):
+            result = 'failed'
         else:
-            self.log_social_action('instagram_post', {'caption': caption}, 'failed', response.text)
-            raise Exception(f"Instagram upload failed: {response.text}")
+            result = 'partial_failure'
+        errors = [f"{platform}: {results[platform]['error']}" for platform in failed]
+        errors += [f"{platform}: not finished" for platform in missing]
+        self.log_social_action('cross_post', {
+            'message': message,
+            'platforms': platforms,
+            'results': results
+        }, result, '; '.join(errors) or None)
 
     def generate_facebook_summary(self, days=7):
         """Generate summary of Facebook activity"""
         if not self.facebook_access_token:
             raise Exception("Facebook access token not set")
 
-        # This would require additional permissions and endpoints
-        # For demo purposes, we'll return a sample summary
+        if self.analytics is not None:
+            summary = self.analytics.summary('facebook', days)
+            self.log_social_action('facebook_summary', {'days': days}, 'success')
+            return summary
+
+        # Without collected analytics, return a sample summary
         summary = {
             "period_days": days,
             "engagement_rate": "3.2%",
@@ -107,8 +261,12 @@ class SocialMediaIntegration:
         if not self.instagram_access_token:
             raise Exception("Instagram access token not set")
 
-        # This would require additional permissions and endpoints
-        # For demo purposes, we'll return a sample summary
+        if self.analytics is not None:
+            summary = self.analytics.summary('instagram', days)
+            self.log_social_action('instagram_summary', {'days': days}, 'success')
+            return summary
+
+        # Without collected analytics, return a sample summary
         summary = {
             "period_days": days,
             "reach": 892,
@@ -141,34 +299,40 @@ class SocialMediaIntegration:
         today = datetime.now().strftime("%Y-%m-%d")
         log_file = logs_dir / f"{today}.json"
 
-        # Read existing logs or create empty list
-        logs = []
-        if log_file.exists():
-            with open(log_file, 'r') as f:
-                import ast
-                try:
-                    logs = ast.literal_eval(f.read())  # Safely parse the list
-                except:
-                    logs = []
-
-        # Add new log entry
-        logs.append(log_entry)
-
-        # Write back to file
-        with open(log_file, 'w') as f:
-            f.write(str(logs))
+        # Background publishers log from worker threads; keep read-append-write atomic
+        with _log_lock:
+            # Read existing logs or create empty list
+            logs = []
+            if log_file.exists():
+                with open(log_file, 'r') as f:
+                    import ast
+                    try:
+                        logs = ast.literal_eval(f.read())  # Safely parse the list
+                    except:
+                        logs = []
+
+            # Add new log entry
+            logs.append(log_entry)
+
+            # Write back to file
+            with open(log_file, 'w') as f:
+                f.write(str(logs))
 
         return log_entry
 
 # Twitter/X Integration
 class TwitterIntegration:
-    def __init__(self, bearer_token=None, api_key=None, api_secret=None, access_token=None, access_token_secret=None):
+    def __init__(self, bearer_token=None, api_key=None, api_secret=None, access_token=None, access_token_secret=None,
+                 session=None, base_url=TWITTER_API_URL, rate_limiter=None, analytics=None):
         self.bearer_token = bearer_token
         self.api_key = api_key
         self.api_secret = api_secret
         self.access_token = access_token
         self.access_token_secret = access_token_secret
-        self.base_url = "https://api.twitter.com/2"
+        self.base_url = base_url.rstrip('/')
+        self.http = session or get_http_session()
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.analytics = analytics
 
     def authenticate_v2(self):
         """Authenticate using bearer token for v2 API"""
@@ -182,20 +346,28 @@ class TwitterIntegration:
         if not self.bearer_token:
             raise Exception("Twitter authentication credentials not set")
 
+        try:
+            tweet_id = self._send_tweet(text)
+        except Exception as e:
+            self.log_twitter_action('tweet_post', {'text': text}, 'failed', str(e))
+            raise
+        self.log_twitter_action('tweet_post', {'text': text, 'tweet_id': tweet_id}, 'success')
+        return tweet_id
+
+    def _send_tweet(self, text):
+        # Post without writing an audit entry; callers log the outcome
+        if not self.bearer_token:
+            raise Exception("Twitter authentication credentials not set")
+
         url = f"{self.base_url}/tweets"
         headers = self.authenticate_v2()
         payload = {"text": text}
 
-        response = requests.post(url, headers=headers, json=payload)
-
-        if response.status_code == 201:
-            tweet_data = response.json()
-            tweet_id = tweet_data.get("data", {}).get("id")
-            self.log_twitter_action('tweet_post', {'text': text, 'tweet_id': tweet_id}, 'success')
-            return tweet_id
-        else:
-            self.log_twitter_action('tweet_post', {'text': text}, 'failed', response.text)
+        response = send_rate_limited(self.http, self.rate_limiter, 'twitter', 'tweets', 'POST', url,
+                                     headers=headers, json=payload)
+        if response.status_code != 201:
             raise Exception(f"Tweet failed: {response.text}")
+        return response.json().get("data", {}).get("id")
 
     def get_tweets(self, user_id, max_results=10):
         """Get tweets from a specific user"""
@@ -206,7 +378,8 @@ class TwitterIntegration:
         headers = self.authenticate_v2()
         params = {"max_results": max_results}
 
-        response = requests.get(url, headers=headers, params=params)
+        response = send_rate_limited(self.http, self.rate_limiter, 'twitter', 'user_tweets', 'GET', url,
+                                     headers=headers, params=params)
 
         if response.status_code == 200:
             return response.json()
@@ -215,8 +388,12 @@ class TwitterIntegration:
 
     def generate_twitter_summary(self, days=7):
         """Generate summary of Twitter activity"""
-        # This would require additional API calls to get analytics
-        # For demo purposes, we'll return a sample summary
+        if self.analytics is not None:
+            summary = self.analytics.summary('twitter', days)
+            self.log_twitter_action('twitter_summary', {'days': days}, 'success')
+            return summary
+
+        # Without collected analytics, return a sample summary
         summary = {
             "period_days": days,
             "tweets_posted": 12,
@@ -249,21 +426,23 @@ class TwitterIntegration:
         today = datetime.now().strftime("%Y-%m-%d")
         log_file = logs_dir / f"{today}.json"
 
-        # Read existing logs or create empty list
-        logs = []
-        if log_file.exists():
-            with open(log_file, 'r') as f:
-                import ast
-                try:
-                    logs = ast.literal_eval(f.read())  # Safely parse the list
-                except:
-                    logs = []
-
-        # Add new log entry
-        logs.append(log_entry)
-
-        # Write back to file
-        with open(log_file, 'w') as f:
-            f.write(str(logs))
+        # Background publishers log from worker threads; keep read-append-write atomic
+        with _log_lock:
+            # Read existing logs or create empty list
+            logs = []
+            if log_file.exists():
+                with open(log_file, 'r') as f:
+                    import ast
+                    try:
+                        logs = ast.literal_eval(f.read())  # Safely parse the list
+                    except:
+                        logs = []
+
+            # Add new log entry
+            logs.append(log_entry)
+
+            # Write back to file
+            with open(log_file, 'w') as f:
+                f.write(str(logs))
 
         return log_entry
\ No newline at end of file
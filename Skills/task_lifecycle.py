@@ -0,0 +1,438 @@
+"""
+Task Lifecycle Tracking for AI Employee Vault
+Records when each task enters Inbox, Needs_Action, Plans, Approvals and
+Done, and how long it spent in each stage. Stage durations also feed
+per-stage, per-day quantile sketches, so "what is normal for this stage"
+over any window is a merge of a few fixed-size sketches rather than a scan
+of every task.
+
+Events come from the skills (process_task, create_plan, approval requests)
+and from sync_folders(), which picks up moves made by anything else. Each
+task row keeps the furthest stage it has reached, and sync_folders() only
+rescans the stage folders whose mtime changed since the last sync, so a
+sync costs the files that moved rather than the whole history.
+
+    tracker = get_lifecycle_tracker()
+    tracker.stage_stats('Approvals', days=30)      # {'count', 'p50', 'p90', ...}
+    tracker.flag_slow(percentile=0.9, days=7)      # tasks slower than the stage's p90
+"""
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from Skills.folder_index import MTIME_SETTLE_SECONDS
+
+STAGES = ('Inbox', 'Needs_Action', 'Plans', 'Approvals', 'Done')
+TERMINAL_STAGE = 'Done'
+
+# Quantiles come back within 2% of the true duration
+RELATIVE_ACCURACY = 0.02
+# Durations at or below this many seconds share one bucket
+MIN_DURATION = 1.0
+# Days of sketches kept in memory and on disk
+SKETCH_RETENTION_DAYS = 400
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task TEXT PRIMARY KEY,
+    stage TEXT,
+    entered_at REAL,
+    ref TEXT,
+    furthest INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_ref ON tasks (ref);
+
+CREATE TABLE IF NOT EXISTS transitions (
+    task TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    entered_at REAL NOT NULL,
+    left_at REAL NOT NULL,
+    seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transitions_left ON transitions (left_at);
+
+CREATE TABLE IF NOT EXISTS stage_sketches (
+    stage TEXT NOT NULL,
+    day TEXT NOT NULL,
+    sketch TEXT NOT NULL,
+    PRIMARY KEY (stage, day)
+);
+
+CREATE TABLE IF NOT EXISTS folder_scans (
+    stage TEXT PRIMARY KEY,
+    mtime_ns INTEGER
+);
+"""
+
+
+def task_key(filename):
+    """The task a vault file belongs to: 'Lead_Plan.md' and 'APPROVED_Lead.md' both map to 'Lead'"""
+    name = Path(str(filename)).name
+    if name.endswith('.md'):
+        name = name[:-3]
+    if name.startswith('APPROVED_'):
+        name = name[len('APPROVED_'):]
+    if name.endswith('_Plan'):
+        name = name[:-len('_Plan')]
+    return name.replace(' ', '_')
+
+
+class QuantileSketch:
+    """
+    Log-bucketed histogram (DDSketch): values v and w share a bucket only if
+    they are within RELATIVE_ACCURACY of each other, so any quantile is
+    answered within that relative error. Size grows with the log of the
+    value range, not with the number of values, and sketches merge by
+    adding bucket counts.
+    """
+
+    def __init__(self, relative_accuracy=RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value, count=1):
+        if value <= MIN_DURATION:
+            self.zero_count += count
+        else:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.count += count
+        self.total += value * count
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return MIN_DURATION
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                # Midpoint of the bucket (gamma^(k-1), gamma^k] in relative terms
+                return min(2 * self.gamma ** key / (self.gamma + 1), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def to_json(self):
+        return json.dumps({
+            'a': self.relative_accuracy, 'z': self.zero_count, 'n': self.count,
+            's': self.total, 'm': self.max, 'b': self.bins
+        })
+
+    @classmethod
+    def from_json(cls, text):
+        data = json.loads(text)
+        sketch = cls(data['a'])
+        sketch.zero_count = data['z']
+        sketch.count = data['n']
+        sketch.total = data['s']
+        sketch.max = data['m']
+        sketch.bins = {int(key): count for key, count in data['b'].items()}
+        return sketch
+
+
+class TaskLifecycleTracker:
+    def __init__(self, db_path="Data/task_lifecycle.db", vault_path="."):
+        self.db_path = Path(db_path)
+        self.vault_path = Path(vault_path)
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+        # (stage, day) -> QuantileSketch
+        cutoff = (date.today() - timedelta(days=SKETCH_RETENTION_DAYS)).isoformat()
+        self._sketches = {
+            (stage, date.fromisoformat(day)): QuantileSketch.from_json(sketch)
+            for stage, day, sketch in self._conn.execute(
+                "SELECT stage, day, sketch FROM stage_sketches WHERE day >= ?", (cutoff,))
+        }
+
+    def close(self):
+        self._conn.close()
+
+    def _migrate(self):
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(tasks)")]
+        if 'furthest' in columns:
+            return
+        # Databases from before the furthest column: work it out once from the history
+        with self._conn:
+            self._conn.execute("ALTER TABLE tasks ADD COLUMN furthest INTEGER")
+            reached = {}
+            for task, stage in self._conn.execute(
+                    "SELECT task, stage FROM tasks WHERE stage IS NOT NULL "
+                    "UNION SELECT DISTINCT task, stage FROM transitions"):
+                reached[task] = max(reached.get(task, -1), STAGES.index(stage))
+            self._conn.executemany("UPDATE tasks SET furthest = ? WHERE task = ?",
+                                   [(index, task) for task, index in reached.items()])
+
+    # Recording
+
+    def record(self, task, stage, at=None, ref=None):
+        """
+        The task entered `stage` at `at` (epoch seconds, default now). Closes
+        the stage it was in, adding that duration to the stage's sketch.
+        ref names the file standing for the task in this stage, e.g. an approval request.
+        """
+        if stage not in STAGES:
+            raise Exception(f"Unknown stage: {stage}")
+        at = time.time() if at is None else at
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT stage, entered_at, furthest FROM tasks WHERE task = ?", (task,)).fetchone()
+            if row is not None and row[0] == stage:
+                return
+            if row is not None and row[0] is not None:
+                self._close_stage(task, row[0], row[1], at)
+            furthest = max(row[2] if row is not None and row[2] is not None else -1, STAGES.index(stage))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tasks (task, stage, entered_at, ref, furthest) VALUES (?, ?, ?, ?, ?)",
+                (task, stage, at, ref, furthest))
+
+    def record_first(self, task, stage, at):
+        """Record `stage` only for a task with no history, e.g. its Inbox arrival found after the fact"""
+        with self._lock:
+            known = self._conn.execute("SELECT 1 FROM tasks WHERE task = ?", (task,)).fetchone()
+        if known is None:
+            self.record(task, stage, at)
+
+    def complete_stage(self, task, stage, at=None):
+        """The task left `stage` without entering another yet (e.g. an approval was granted)"""
+        at = time.time() if at is None else at
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT stage, entered_at FROM tasks WHERE task = ?", (task,)).fetchone()
+            if row is None or row[0] != stage:
+                return
+            self._close_stage(task, stage, row[1], at)
+            self._conn.execute("UPDATE tasks SET stage = NULL, entered_at = NULL WHERE task = ?", (task,))
+
+    def task_for_ref(self, ref):
+        with self._lock:
+            row = self._conn.execute("SELECT task FROM tasks WHERE ref = ?", (ref,)).fetchone()
+        return row[0] if row else None
+
+    def _close_stage(self, task, stage, entered_at, left_at):
+        # Caller holds the lock and the transaction
+        seconds = max(left_at - entered_at, 0.0)
+        self._conn.execute(
+            "INSERT INTO transitions (task, stage, entered_at, left_at, seconds) VALUES (?, ?, ?, ?, ?)",
+            (task, stage, entered_at, left_at, seconds))
+
+        day = date.fromtimestamp(left_at)
+        sketch = self._sketches.get((stage, day))
+        if sketch is None:
+            sketch = self._sketches[(stage, day)] = QuantileSketch()
+        sketch.add(seconds)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO stage_sketches (stage, day, sketch) VALUES (?, ?, ?)",
+            (stage, day.isoformat(), sketch.to_json()))
+
+    def sync_folders(self):
+        """
+        Record stage changes made outside the skills by looking at which
+        folder each task's files are in now; the furthest stage wins (a
+        task with a plan is in Plans even though it is still in Needs_Action).
+        Only folders whose mtime moved since the last sync are listed, and
+        approval requests no skill recorded are skipped.
+        Returns the number of stage changes recorded.
+        """
+        with self._lock:
+            scanned = dict(self._conn.execute("SELECT stage, mtime_ns FROM folder_scans"))
+
+        found = {}
+        folder_mtimes = {}
+        for stage in STAGES:
+            folder = self.vault_path / stage
+            try:
+                mtime_ns = folder.stat().st_mtime_ns
+            except OSError:
+                continue
+            if scanned.get(stage) == mtime_ns:
+                continue
+            # A change made in the same clock tick as the last one would not move the mtime
+            settled = time.time() - mtime_ns / 1e9 > MTIME_SETTLE_SECONDS
+            folder_mtimes[stage] = mtime_ns if settled else None
+
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if not entry.name.endswith('.md') or not entry.is_file():
+                        continue
+                    if stage == 'Approvals':
+                        if entry.name.startswith('APPROVED_'):
+                            continue
+                        task = self.task_for_ref(entry.name)
+                        if task is None:
+                            continue
+                    else:
+                        task = task_key(entry.name)
+                    try:
+                        mtime = entry.stat().st_mtime
+                    except FileNotFoundError:
+                        continue
+                    # Stages are scanned in order, so a later one replaces an earlier one
+                    found[task] = (stage, mtime)
+
+        # Furthest stage each task has reached; folder scans only ever move a task forward
+        reached = {}
+        tasks = list(found)
+        with self._lock:
+            for i in range(0, len(tasks), 500):
+                chunk = tasks[i:i + 500]
+                reached.update(self._conn.execute(
+                    f"SELECT task, furthest FROM tasks WHERE task IN ({', '.join('?' * len(chunk))})", chunk))
+
+        changed = 0
+        for task, (stage, mtime) in found.items():
+            if reached.get(task) is not None and STAGES.index(stage) <= reached[task]:
+                continue
+            # On first sighting the file's mtime is the best guess at when it arrived
+            self.record(task, stage, at=mtime if task not in reached else None)
+            changed += 1
+
+        if folder_mtimes:
+            with self._lock, self._conn:
+                self._conn.executemany("INSERT OR REPLACE INTO folder_scans (stage, mtime_ns) VALUES (?, ?)",
+                                       folder_mtimes.items())
+        return changed
+
+    # Statistics
+
+    def _window_sketch(self, stage, days, end=None):
+        end = end or date.today()
+        merged = QuantileSketch()
+        with self._lock:
+            for offset in range(days):
+                sketch = self._sketches.get((stage, end - timedelta(days=offset)))
+                if sketch is not None:
+                    merged.merge(sketch)
+        return merged
+
+    def stage_stats(self, stage, days=30, end=None):
+        """Duration statistics (seconds) for tasks that left `stage` in the last `days` days"""
+        sketch = self._window_sketch(stage, days, end)
+        return {
+            'stage': stage,
+            'count': sketch.count,
+            'mean': sketch.mean,
+            'p50': sketch.quantile(0.5),
+            'p90': sketch.quantile(0.9),
+            'p99': sketch.quantile(0.99),
+            'max': sketch.max if sketch.count else None
+        }
+
+    def threshold(self, stage, percentile=0.9, days=30, end=None):
+        return self._window_sketch(stage, days, end).quantile(percentile)
+
+    def flag_slow(self, percentile=0.9, days=7, baseline_days=30, now=None, min_samples=5):
+        """
+        Tasks whose time in a stage exceeded that stage's `percentile`
+        duration over the last `baseline_days`: stages left in the last
+        `days` days, plus stages still open now. Slowest overrun first.
+        """
+        now = time.time() if now is None else now
+        end = date.fromtimestamp(now)
+        thresholds = {}
+        medians = {}
+        for stage in STAGES:
+            sketch = self._window_sketch(stage, baseline_days, end)
+            if sketch.count >= min_samples:
+                thresholds[stage] = sketch.quantile(percentile)
+                medians[stage] = sketch.quantile(0.5)
+
+        since = now - days * 86400
+        with self._lock:
+            finished = self._conn.execute(
+                "SELECT task, stage, seconds FROM transitions WHERE left_at BETWEEN ? AND ?", (since, now)).fetchall()
+            open_now = self._conn.execute(
+                "SELECT task, stage, ? - entered_at FROM tasks WHERE stage IS NOT NULL AND stage != ?",
+                (now, TERMINAL_STAGE)).fetchall()
+
+        flagged = []
+        for rows, still_open in ((finished, False), (open_now, True)):
+            for task, stage, seconds in rows:
+                limit = thresholds.get(stage)
+                if limit is not None and seconds > limit:
+                    flagged.append({
+                        'task': task,
+                        'stage': stage,
+                        'seconds': seconds,
+                        'expected_seconds': medians[stage],
+                        'threshold_seconds': limit,
+                        'open': still_open
+                    })
+        flagged.sort(key=lambda item: item['seconds'] - item['expected_seconds'], reverse=True)
+        return flagged
+
+
+def format_duration(seconds):
+    """Human-readable duration: '45 min', '5 hours', '3 days'"""
+    seconds = abs(seconds)
+    if seconds < 3600:
+        return f"{max(round(seconds / 60), 1)} min"
+    if seconds < 86400:
+        hours = round(seconds / 3600)
+        return f"{hours} hour" if hours == 1 else f"{hours} hours"
+    days = round(seconds / 86400)
+    return f"{days} day" if days == 1 else f"{days} days"
+
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def get_lifecycle_tracker():
+    """The process-wide tracker, opened on first use"""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = TaskLifecycleTracker()
+        return _tracker
+
+
+def track_stage(task_file, stage, at=None, ref=None, first_only=False):
+    """Record a stage change from a skill; tracking problems never stop the skill itself"""
+    try:
+        tracker = get_lifecycle_tracker()
+        task = task_key(task_file)
+        if first_only:
+            tracker.record_first(task, stage, at)
+        else:
+            tracker.record(task, stage, at=at, ref=ref)
+    except Exception as e:
+        print(f"Lifecycle tracking failed for {task_file}: {e}")
+
+
+def track_stage_done(ref, stage):
+    """Close `stage` for the task behind `ref` (a file name) without entering another"""
+    try:
+        tracker = get_lifecycle_tracker()
+        tracker.complete_stage(tracker.task_for_ref(ref) or task_key(ref), stage)
+    except Exception as e:
+        print(f"Lifecycle tracking failed for {ref}: {e}")
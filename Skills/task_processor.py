@@ -5,6 +5,8 @@ Moves tasks from Inbox to Needs_Action and creates Plan files
 import os
 from pathlib import Path
 
+from Skills.task_lifecycle import track_stage
+
 def process_task(task_file):
     """Process a single task from Inbox"""
     inbox_path = Path("Inbox")
@@ -15,7 +17,10 @@ def process_task(task_file):
     task_dst = needs_action_path / task_file
 
     if task_src.exists():
+        # The Inbox arrival is only known from the file when nothing recorded it earlier
+        track_stage(task_file, "Inbox", at=task_src.stat().st_mtime, first_only=True)
         task_src.rename(task_dst)
+        track_stage(task_file, "Needs_Action")
         return f"Moved {task_file} to Needs_Action"
     return f"Task {task_file} not found in Inbox"
 
@@ -46,6 +51,7 @@ def create_plan(task_file):
 - External API access if required
 """
         plan_path.write_text(plan_content)
+        track_stage(task_file, "Plans")
         return f"Created plan: {plan_filename}"
 
     return f"Plan already exists or task not found: {task_file}"
\ No newline at end of file
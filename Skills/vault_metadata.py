@@ -0,0 +1,459 @@
+"""
+Vault Markdown Metadata for AI Employee Vault
+Parses frontmatter, headings, lists and tables out of vault markdown and
+turns Business_Goals.md into typed records: the revenue target, tracked
+metrics, active projects with due dates, subscriptions and the subscription
+audit rules.
+
+Parsed documents are cached per file. A stat (mtime and size) decides
+whether a file might have changed, and a content hash decides whether it
+really did, so touching a file does not cost a re-parse and editing one
+invalidates its entry on the next read. The briefing, the dashboard status
+and the Ralph loop prompts all read the goals through get_vault_metadata().
+
+    metadata = get_vault_metadata()
+    goals = metadata.business_goals()
+    goals.monthly_target, goals.upcoming_projects(days=14)
+"""
+import hashlib
+import re
+import threading
+from datetime import date, datetime
+from pathlib import Path
+
+GOALS_FILE = "Business_Goals.md"
+
+_BULLET = re.compile(r'^(\s*)(?:[-*+]|\d+[.)])\s+(.*)$')
+_MONEY = re.compile(r'\$\s*([\d,]+(?:\.\d+)?)\s*([kKmM])?')
+_NUMBER = re.compile(r'(\d+(?:\.\d+)?)')
+_ISO_DATE = re.compile(r'(\d{4}-\d{2}-\d{2})')
+_MONTH_DAY = re.compile(r'([A-Za-z]{3,9})\.?\s+(\d{1,2})(?:st|nd|rd|th)?(?:,?\s+(\d{4}))?')
+
+
+class ListItem:
+    def __init__(self, text, children=None):
+        self.text = text
+        self.children = children or []
+
+    def key_value(self):
+        """('Monthly goal', '$10,000') for 'Monthly goal: $10,000', else (None, text)"""
+        key, sep, value = self.text.partition(':')
+        if sep and key.strip() and value.strip():
+            return key.strip(), value.strip()
+        return None, self.text
+
+
+class Section:
+    def __init__(self, heading, level):
+        self.heading = heading
+        self.level = level
+        self.lines = []
+        self.lists = []     # top-level ListItems, with nested items as children
+        self.tables = []    # each a list of {column: cell} rows
+
+    def items(self):
+        """Every list item in the section, nested ones included"""
+        stack = list(reversed(self.lists))
+        while stack:
+            item = stack.pop()
+            yield item
+            stack.extend(reversed(item.children))
+
+
+class ParsedDocument:
+    def __init__(self, path, frontmatter, sections):
+        self.path = path
+        self.frontmatter = frontmatter
+        self.sections = sections
+
+    def section(self, heading):
+        """First section whose heading contains `heading` (case-insensitive)"""
+        wanted = heading.lower()
+        for section in self.sections:
+            if wanted in section.heading.lower():
+                return section
+        return None
+
+
+def parse_markdown(text, path=None):
+    """Split markdown into frontmatter and sections with their lists and tables"""
+    lines = text.splitlines()
+    frontmatter = {}
+    start = 0
+    if lines and lines[0].strip() == '---':
+        for i in range(1, len(lines)):
+            if lines[i].strip() == '---':
+                frontmatter = _parse_frontmatter(lines[1:i])
+                start = i + 1
+                break
+
+    sections = [Section('', 0)]
+    for line in lines[start:]:
+        stripped = line.strip()
+        if stripped.startswith('#'):
+            level = len(stripped) - len(stripped.lstrip('#'))
+            heading = stripped[level:].strip()
+            if heading and level <= 6:
+                sections.append(Section(heading, level))
+                continue
+        sections[-1].lines.append(line)
+
+    for section in sections:
+        section.lists = _parse_lists(section.lines)
+        section.tables = _parse_tables(section.lines)
+    return ParsedDocument(path, frontmatter, [s for s in sections if s.heading or s.lines])
+
+
+def _parse_frontmatter(lines):
+    values = {}
+    for line in lines:
+        key, sep, value = line.partition(':')
+        if sep and key.strip() and not line.startswith((' ', '\t')):
+            values[key.strip()] = value.strip().strip('"\'')
+    return values
+
+
+def _parse_lists(lines):
+    roots = []
+    stack = []  # (indent, ListItem)
+    for line in lines:
+        match = _BULLET.match(line)
+        if not match:
+            if line.strip() and not line.startswith((' ', '\t')):
+                # Unindented text ends the list
+                stack = []
+            continue
+        indent = len(match.group(1).expandtabs(4))
+        item = ListItem(match.group(2).strip())
+        while stack and stack[-1][0] >= indent:
+            stack.pop()
+        (stack[-1][1].children if stack else roots).append(item)
+        stack.append((indent, item))
+    return roots
+
+
+def _parse_tables(lines):
+    tables = []
+    i = 0
+    while i < len(lines) - 1:
+        if lines[i].strip().startswith('|') and re.match(r'^\s*\|?[\s:|-]+\|?\s*$', lines[i + 1]) \
+                and '-' in lines[i + 1]:
+            header = _cells(lines[i])
+            rows = []
+            i += 2
+            while i < len(lines) and lines[i].strip().startswith('|'):
+                cells = _cells(lines[i])
+                rows.append(dict(zip(header, cells + [''] * (len(header) - len(cells)))))
+                i += 1
+            tables.append(rows)
+        else:
+            i += 1
+    return tables
+
+
+def _cells(line):
+    return [cell.strip() for cell in line.strip().strip('|').split('|')]
+
+
+def parse_money(text):
+    """Dollar amount in text ('$10,000', '$2.5k'), or None"""
+    match = _MONEY.search(text or '')
+    if not match:
+        return None
+    value = float(match.group(1).replace(',', ''))
+    scale = {'k': 1e3, 'm': 1e6}.get((match.group(2) or '').lower(), 1)
+    return value * scale
+
+
+def parse_date(text, reference=None):
+    """
+    Date in text: ISO ('2026-03-01') or month and day ('Due Jan 15', 'Mar 3, 2026').
+    Without a year, the occurrence closest to `reference` is used.
+    """
+    if not text:
+        return None
+    match = _ISO_DATE.search(text)
+    if match:
+        try:
+            return date.fromisoformat(match.group(1))
+        except ValueError:
+            return None
+
+    for match in _MONTH_DAY.finditer(text):
+        try:
+            month = datetime.strptime(match.group(1)[:3].title(), '%b').month
+        except ValueError:
+            continue
+        day = int(match.group(2))
+        if match.group(3):
+            try:
+                return date(int(match.group(3)), month, day)
+            except ValueError:
+                return None
+        reference = reference or date.today()
+        candidates = []
+        for year in (reference.year - 1, reference.year, reference.year + 1):
+            try:
+                candidates.append(date(year, month, day))
+            except ValueError:
+                pass
+        if candidates:
+            return min(candidates, key=lambda d: abs((d - reference).days))
+    return None
+
+
+class Project:
+    def __init__(self, name, due=None, budget=None, notes=None):
+        self.name = name
+        self.due = due
+        self.budget = budget
+        self.notes = notes or []
+
+    def days_left(self, today=None):
+        if self.due is None:
+            return None
+        return (self.due - (today or date.today())).days
+
+
+class MetricTarget:
+    def __init__(self, name, target, alert_threshold):
+        self.name = name
+        self.target = target
+        self.alert_threshold = alert_threshold
+
+
+class Subscription:
+    def __init__(self, name, monthly_cost=None, previous_cost=None, last_activity=None, category=None):
+        self.name = name
+        self.monthly_cost = monthly_cost
+        self.previous_cost = previous_cost
+        self.last_activity = last_activity
+        self.category = category
+
+
+class AuditRule:
+    """One 'Flag for review if' line; kind is inactive_days, cost_increase_pct, duplicate or None"""
+
+    def __init__(self, text):
+        self.text = text
+        lowered = text.lower()
+        number = _NUMBER.search(text)
+        self.threshold = float(number.group(1)) if number else None
+        if ('login' in lowered or 'activity' in lowered or 'used' in lowered) and 'day' in lowered:
+            self.kind = 'inactive_days'
+        elif 'cost' in lowered and ('increase' in lowered or 'rise' in lowered) and '%' in text:
+            self.kind = 'cost_increase_pct'
+        elif 'duplicate' in lowered:
+            self.kind = 'duplicate'
+        else:
+            self.kind = None
+
+
+class BusinessGoals:
+    def __init__(self, monthly_target=None, current_mtd=None, metrics=None, projects=None,
+                 subscriptions=None, audit_rules=None, last_updated=None):
+        self.monthly_target = monthly_target
+        self.current_mtd = current_mtd
+        self.metrics = metrics or []
+        self.projects = projects or []
+        self.subscriptions = subscriptions or []
+        self.audit_rules = audit_rules or []
+        self.last_updated = last_updated
+
+    @classmethod
+    def from_document(cls, doc):
+        """
+        Build the goals from a parsed Business_Goals.md; sections that are
+        missing are left empty. Subscriptions are read from an optional table:
+
+            ### Subscriptions
+
+            | Service | Monthly Cost | Previous Cost | Last Activity | Category |
+            |---------|--------------|---------------|---------------|----------|
+            | Notion | $15 | $15 | 2025-12-22 | Docs |
+            | Adobe Creative Cloud | $60 | $55 | 2026-01-28 | Design |
+        """
+        last_updated = parse_date(doc.frontmatter.get('last_updated', ''))
+        goals = cls(last_updated=last_updated)
+
+        revenue = doc.section('Revenue Target')
+        if revenue:
+            for item in revenue.items():
+                key, value = item.key_value()
+                key = (key or '').lower()
+                if 'goal' in key or 'target' in key:
+                    goals.monthly_target = parse_money(value)
+                elif 'mtd' in key or 'month-to-date' in key:
+                    goals.current_mtd = parse_money(value)
+
+        metrics = doc.section('Metrics')
+        if metrics:
+            for table in metrics.tables:
+                for row in table:
+                    goals.metrics.append(MetricTarget(
+                        row.get('Metric', ''), row.get('Target', ''), row.get('Alert Threshold', '')))
+
+        projects = doc.section('Active Projects')
+        if projects:
+            for item in projects.lists:
+                project = Project(item.text)
+                for detail in item.children:
+                    lowered = detail.text.lower()
+                    if project.due is None and ('due' in lowered or 'deadline' in lowered):
+                        project.due = parse_date(detail.text, last_updated)
+                    elif project.budget is None and 'budget' in lowered:
+                        project.budget = parse_money(detail.text)
+                    else:
+                        project.notes.append(detail.text)
+                goals.projects.append(project)
+
+        subscriptions = doc.section('Subscriptions')
+        if subscriptions:
+            for table in subscriptions.tables:
+                for row in table:
+                    row = {key.lower(): value for key, value in row.items()}
+                    goals.subscriptions.append(Subscription(
+                        row.get('service') or row.get('subscription') or row.get('name', ''),
+                        parse_money(row.get('monthly cost') or row.get('cost', '')),
+                        parse_money(row.get('previous cost', '')),
+                        parse_date(row.get('last activity') or row.get('last login', ''), last_updated),
+                        row.get('category') or None))
+
+        rules = doc.section('Subscription Audit')
+        if rules:
+            goals.audit_rules = [AuditRule(item.text) for item in rules.items()]
+        return goals
+
+    def upcoming_projects(self, days=None, today=None, include_overdue=True):
+        """Projects with a due date, soonest first; limited to the next `days` days when given"""
+        today = today or date.today()
+        projects = []
+        for project in self.projects:
+            days_left = project.days_left(today)
+            if days_left is None or (days_left < 0 and not include_overdue):
+                continue
+            if days is not None and days_left > days:
+                continue
+            projects.append(project)
+        return sorted(projects, key=lambda p: p.due)
+
+    def summary(self, days=14, today=None):
+        """Markdown list of the revenue target and the projects due within `days` days (overdue included)"""
+        lines = []
+        if self.monthly_target is not None:
+            line = f"- Monthly revenue target: ${self.monthly_target:,.0f}"
+            if self.current_mtd is not None:
+                line += f" (month-to-date ${self.current_mtd:,.0f})"
+            lines.append(line)
+        for project in self.upcoming_projects(days=days, today=today):
+            days_left = project.days_left(today)
+            when = f"{-days_left} days overdue" if days_left < 0 else f"due in {days_left} days"
+            lines.append(f"- {project.name}: {when} ({project.due.strftime('%b %d')})")
+        return "\n".join(lines)
+
+    def flagged_subscriptions(self, today=None):
+        """[(Subscription, reason)] for subscriptions that break an audit rule"""
+        today = today or date.today()
+        flagged = []
+        for rule in self.audit_rules:
+            if rule.kind == 'inactive_days' and rule.threshold is not None:
+                for sub in self.subscriptions:
+                    if sub.last_activity and (today - sub.last_activity).days > rule.threshold:
+                        flagged.append((sub, f"No activity in {(today - sub.last_activity).days} days"))
+            elif rule.kind == 'cost_increase_pct' and rule.threshold is not None:
+                for sub in self.subscriptions:
+                    if sub.monthly_cost and sub.previous_cost:
+                        increase = (sub.monthly_cost - sub.previous_cost) / sub.previous_cost * 100
+                        if increase > rule.threshold:
+                            flagged.append((sub, f"Cost up {increase:.0f}% to ${sub.monthly_cost:,.2f}/month"))
+            elif rule.kind == 'duplicate':
+                by_category = {}
+                for sub in self.subscriptions:
+                    if sub.category:
+                        by_category.setdefault(sub.category.lower(), []).append(sub)
+                for subs in by_category.values():
+                    if len(subs) > 1:
+                        for sub in subs:
+                            others = ", ".join(other.name for other in subs if other is not sub)
+                            flagged.append((sub, f"Overlaps with {others} ({sub.category})"))
+        return flagged
+
+
+class VaultMetadataCache:
+    def __init__(self, vault_path="."):
+        self.vault_path = Path(vault_path)
+        self._lock = threading.Lock()
+        self._entries = {}  # relative path -> {'stat', 'hash', 'doc', 'derived'}
+        self.parses = 0
+
+    def document(self, relative_path):
+        """ParsedDocument for a vault file, or None when it does not exist"""
+        entry = self._entry(relative_path)
+        return entry['doc'] if entry else None
+
+    def business_goals(self):
+        """BusinessGoals from Business_Goals.md; empty when the file is missing"""
+        return self.derived(GOALS_FILE, BusinessGoals.from_document) or BusinessGoals()
+
+    def derived(self, relative_path, build):
+        """build(ParsedDocument), cached alongside the document until the file changes"""
+        entry = self._entry(relative_path)
+        if entry is None:
+            return None
+        with self._lock:
+            if build not in entry['derived']:
+                entry['derived'][build] = build(entry['doc'])
+            return entry['derived'][build]
+
+    def invalidate(self, relative_path=None):
+        with self._lock:
+            if relative_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(relative_path), None)
+
+    def _entry(self, relative_path):
+        key = str(relative_path)
+        path = self.vault_path / relative_path
+        try:
+            stat = path.stat()
+        except OSError:
+            self.invalidate(key)
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['stat'] == signature:
+                return entry
+
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['hash'] == digest:
+                # Touched but not edited: keep the parse
+                entry['stat'] = signature
+                return entry
+            entry = {
+                'stat': signature,
+                'hash': digest,
+                'doc': parse_markdown(data.decode('utf-8', errors='ignore'), key),
+                'derived': {},
+            }
+            self._entries[key] = entry
+            self.parses += 1
+            return entry
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_vault_metadata(vault_path="."):
+    """Shared VaultMetadataCache for a vault, so every skill reuses the same parses"""
+    key = str(Path(vault_path).resolve())
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = VaultMetadataCache(vault_path)
+        return _caches[key]